@@ -0,0 +1,237 @@
+"""This script runs a compile-time benchmark study of FFC on the form
+files in bench/ and demo/ (or on given form files). Each form file is
+compiled in-process for each combination of representation and
+optimization, recording the time spent in each compiler stage, the
+peak memory (Python 3.9 or later), the size of the generated code and
+the number of operations reported in the generated code.
+
+Results are written to a JSON file and may be compared against a
+baseline from an earlier run, reporting the cases that got slower,
+used more memory or generated more code than allowed by the given
+thresholds. The script exits with a nonzero status if any regressions
+are found.
+
+Example:
+
+  python bench_compile.py -o baseline.json
+  (change FFC)
+  python bench_compile.py -o results.json -b baseline.json
+"""
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function
+
+import os, sys, re, glob
+import json
+import shutil
+import tempfile
+import argparse
+import platform
+from time import time
+
+from ufl.algorithms import load_ufl_file
+
+from ffc import __version__ as FFC_VERSION
+from ffc.log import set_level, ERROR
+from ffc.parameters import default_parameters
+from ffc.compiler import compile_form, compile_elements
+from ffc.profiling import Profiler
+from ffc.fiatinterface import clear_element_cache
+from ffc.tabulationcache import clear_tabulation_cache
+from ffc.quadrature_schemes import clear_quadrature_cache
+from ffc.quadrature.symbolics import clear_symbolics_cache
+from ffc.tensor.referencetensorcache import clear_reference_tensor_cache
+
+# Directory of this script
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Default form files
+default_files = sorted(glob.glob(os.path.join(bench_dir, "*.ufl"))) + \
+                sorted(glob.glob(os.path.join(bench_dir, os.pardir, "demo", "*.ufl")))
+
+# Combinations of representation and optimization
+default_options = ["tensor", "tensor -O", "quadrature", "quadrature -O", "uflacs"]
+
+# Metrics compared against the baseline
+metrics = ["total_time", "peak_memory", "code_size", "num_operations"]
+
+# Patterns for operation counts in generated code
+op_patterns = [re.compile(r"Number of operations to compute geometry constants: (\d+)"),
+               re.compile(r"Number of operations to compute element tensor for following IP loop = (\d+)"),
+               re.compile(r"Number of operations \(multiply-add pairs\) for [\w ]+:\s+(\d+)")]
+
+def count_operations(code):
+    "Sum operation counts reported in comments of generated code."
+    return sum(int(n) for pattern in op_patterns for n in pattern.findall(code))
+
+def clear_caches():
+    "Clear in-memory caches, such that each repetition compiles from scratch."
+    clear_element_cache()
+    clear_tabulation_cache()
+    clear_quadrature_cache()
+    clear_symbolics_cache()
+    clear_reference_tensor_cache()
+
+def bench_case(filename, option, repetitions):
+    "Compile form file with given option, return dictionary of results."
+
+    parameters = default_parameters()
+    parameters["representation"] = option.split()[0]
+    parameters["optimize"] = "-O" in option.split()
+    parameters["split"] = True
+
+    # Do not reuse results from the disk caches
+    parameters["ir_cache_dir"] = ""
+    parameters["tabulation_cache_dir"] = ""
+    parameters["reference_tensor_cache_dir"] = ""
+
+    prefix = os.path.splitext(os.path.basename(filename))[0]
+    output_dir = tempfile.mkdtemp(prefix="ffc_bench_")
+    parameters["output_dir"] = output_dir
+
+    result = {"status": "ok"}
+    try:
+        best = None
+        for i in range(repetitions):
+            # Load forms again for each repetition to avoid caching in
+            # UFL, and clear the in-memory caches of FFC
+            ufd = load_ufl_file(filename)
+            clear_caches()
+            with Profiler(prefix) as profiler:
+                if ufd.forms:
+                    compile_form(ufd.forms, ufd.object_names, prefix, parameters)
+                else:
+                    compile_elements(ufd.elements, prefix, parameters)
+            if best is None or profiler.root.wall_time < best.root.wall_time:
+                best = profiler
+
+        # Extract timings and memory from profile
+        result["total_time"] = best.root.wall_time
+        result["peak_memory"] = best.root.peak_memory
+        result["stages"] = dict((node.name, node.wall_time) for node in best.root.children)
+
+        # Measure generated code
+        code = ""
+        for name in sorted(os.listdir(output_dir)):
+            with open(os.path.join(output_dir, name)) as f:
+                code += f.read()
+        result["code_size"] = len(code)
+        result["num_operations"] = count_operations(code)
+
+    except Exception as exception:
+        result = {"status": "failed", "error": str(exception)}
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    return result
+
+def run(filenames, options, repetitions):
+    "Run benchmarks, returning dictionary of results for each case."
+    results = {}
+    for filename in filenames:
+        for option in options:
+            key = "%s [%s]" % (os.path.basename(filename), option)
+            result = bench_case(filename, option, repetitions)
+            results[key] = result
+            if result["status"] == "ok":
+                print("%-50s %10.3f s %10d bytes %10d ops" % (key, result["total_time"],
+                                                              result["code_size"],
+                                                              result["num_operations"]))
+            else:
+                print("%-50s failed: %s" % (key, result["error"].split("\n")[0]))
+    return results
+
+def compare(results, baseline, thresholds, min_time):
+    """Compare results against baseline. Returns list of regressions
+    (key, metric, baseline value, new value)."""
+    regressions = []
+    for key in sorted(results):
+        new = results[key]
+        old = baseline.get(key)
+        if old is None or old["status"] != "ok":
+            continue
+        if new["status"] != "ok":
+            regressions.append((key, "status", old["status"], new["status"]))
+            continue
+        for metric in metrics:
+            a, b = old.get(metric), new.get(metric)
+            if a is None or b is None:
+                continue
+            if metric == "total_time" and b < min_time:
+                continue
+            if b > a*(1.0 + thresholds[metric]):
+                regressions.append((key, metric, a, b))
+    return regressions
+
+def main(argv):
+    "Main function."
+    parser = argparse.ArgumentParser(description="Compile-time benchmarks for FFC.")
+    parser.add_argument("files", nargs="*", default=default_files,
+                        help="form files (default: bench/*.ufl and demo/*.ufl)")
+    parser.add_argument("-r", "--options", action="append",
+                        help="representation and optimization, e.g. \"quadrature -O\" "
+                        "(may be repeated, default: %s)" % ", ".join(default_options))
+    parser.add_argument("-n", "--repetitions", type=int, default=1,
+                        help="number of repetitions, the fastest is reported (default: 1)")
+    parser.add_argument("-o", "--output", default="bench_compile.json",
+                        help="file to which results are written (default: bench_compile.json)")
+    parser.add_argument("-b", "--baseline", help="file with baseline results to compare against")
+    parser.add_argument("--time-threshold", type=float, default=0.2,
+                        help="allowed relative increase of compile time (default: 0.2)")
+    parser.add_argument("--memory-threshold", type=float, default=0.2,
+                        help="allowed relative increase of peak memory (default: 0.2)")
+    parser.add_argument("--size-threshold", type=float, default=0.05,
+                        help="allowed relative increase of code size and operation count "
+                        "(default: 0.05)")
+    parser.add_argument("--min-time", type=float, default=0.1,
+                        help="ignore compile times below this (in seconds, default: 0.1)")
+    args = parser.parse_args(argv)
+
+    # Only report errors from FFC
+    set_level(ERROR)
+
+    # Run benchmarks and write results
+    results = run(args.files, args.options or default_options, args.repetitions)
+    data = {"ffc_version": FFC_VERSION,
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "date": time(),
+            "results": results}
+    with open(args.output, "w") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    print("\nResults written to %s." % args.output)
+
+    # Compare against baseline
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        thresholds = {"total_time": args.time_threshold,
+                      "peak_memory": args.memory_threshold,
+                      "code_size": args.size_threshold,
+                      "num_operations": args.size_threshold}
+        regressions = compare(results, baseline, thresholds, args.min_time)
+        if regressions:
+            print("\nRegressions compared to %s:\n" % args.baseline)
+            for (key, metric, a, b) in regressions:
+                print("%-50s %-15s %12s -> %12s" % (key, metric, a, b))
+            return 1
+        print("\nNo regressions compared to %s." % args.baseline)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
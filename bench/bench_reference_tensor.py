@@ -0,0 +1,136 @@
+"""This script benchmarks the computation of reference tensors in the
+tensor representation for the Poisson and mass matrix forms of degree
+1-5 in bench/. The tables of basis functions passed to _compute_product
+during the computation of the intermediate representation are recorded
+and the product is then recomputed both with the current (vectorized)
+implementation and with the original implementation, looping in Python
+over quadrature points and internal indices. The results are checked
+to agree and the times and speedup are reported.
+
+Example:
+
+  python bench_reference_tensor.py
+  python bench_reference_tensor.py Poisson_3D_*.ufl
+"""
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function
+
+import os, sys, glob
+import argparse
+from time import time
+
+import numpy
+from ufl.algorithms import load_ufl_file
+
+from ffc.log import set_level, ERROR
+from ffc.parameters import default_parameters
+from ffc.analysis import analyze_forms
+from ffc.representation import compute_ir
+from ffc.tensor import monomialintegration
+from ffc.tensor.multiindex import build_indices
+from ffc.tensor.referencetensorcache import clear_reference_tensor_cache
+
+# Directory of this script
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Default form files
+default_files = [os.path.join(bench_dir, "%s_2D_%d.ufl" % (name, degree))
+                 for name in ("Poisson", "MassH1") for degree in range(1, 6)]
+
+def compute_product_loop(psis, weights):
+    "Original implementation of _compute_product, looping in Python."
+    (shape, indices) = monomialintegration._compute_shape(psis)
+    A0 = numpy.zeros(shape, dtype=numpy.float64)
+    bshape = monomialintegration._compute_internal_shape(psis)
+    bindices = build_indices([list(range(b)) for b in bshape]) or [[]]
+    for q in range(len(weights)):
+        for b in bindices:
+            B = weights[q]
+            for (Psi, index, bpart) in psis:
+                B = numpy.multiply.outer(B, Psi[tuple([q] + [b[i] for i in bpart])])
+            numpy.add(A0, B, A0)
+    (rearrangement, num_indices) = monomialintegration._compute_rearrangement(indices)
+    return numpy.transpose(A0, rearrangement)
+
+def record_products(filename):
+    "Compute IR for form file, returning arguments of each _compute_product."
+    parameters = default_parameters()
+    parameters["representation"] = "tensor"
+    parameters["reference_tensor_cache_dir"] = ""
+    clear_reference_tensor_cache()
+
+    recorded = []
+    compute_product = monomialintegration._compute_product
+    def recording_compute_product(psis, weights):
+        recorded.append((psis, weights))
+        return compute_product(psis, weights)
+
+    monomialintegration._compute_product = recording_compute_product
+    try:
+        ufd = load_ufl_file(filename)
+        analysis = analyze_forms(ufd.forms, parameters)
+        compute_ir(analysis, "Bench", parameters)
+    finally:
+        monomialintegration._compute_product = compute_product
+
+    return recorded
+
+def best_time(function, args, repetitions):
+    "Return result and fastest time of repeated calls."
+    best = None
+    for i in range(repetitions):
+        t = time()
+        result = function(*args)
+        t = time() - t
+        best = t if best is None else min(best, t)
+    return result, best
+
+def main(argv):
+    "Main function."
+    parser = argparse.ArgumentParser(description="Reference tensor benchmarks for FFC.")
+    parser.add_argument("files", nargs="*", default=default_files,
+                        help="form files (default: Poisson and MassH1 forms of degree 1-5)")
+    parser.add_argument("-n", "--repetitions", type=int, default=3,
+                        help="number of repetitions, the fastest is reported (default: 3)")
+    args = parser.parse_args(argv)
+
+    # Only report errors from FFC
+    set_level(ERROR)
+
+    print("%-25s %10s %12s %12s %10s" % ("form", "entries", "loop", "vectorized", "speedup"))
+    for filename in args.files:
+        loop_time = 0.0
+        vectorized_time = 0.0
+        num_entries = 0
+        for (psis, weights) in record_products(filename):
+            A0, t0 = best_time(compute_product_loop, (psis, weights), args.repetitions)
+            A1, t1 = best_time(monomialintegration._compute_product, (psis, weights),
+                               args.repetitions)
+            if not numpy.allclose(A0, A1):
+                print("Results differ for %s." % filename)
+                return 1
+            loop_time += t0
+            vectorized_time += t1
+            num_entries += A1.size
+        print("%-25s %10d %10.4f s %10.4f s %9.1fx" % (os.path.basename(filename), num_entries,
+                                                       loop_time, vectorized_time,
+                                                       loop_time / max(vectorized_time, 1e-9)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
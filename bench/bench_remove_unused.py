@@ -0,0 +1,172 @@
+"""This script benchmarks the removal of unused variables from
+generated code (remove_unused) on the code of the P5 elements in
+demo/. Each element is compiled with the current implementation and
+with the original implementation, searching each line for each
+declared variable. The calls to remove_unused are recorded and
+repeated to time remove_unused alone. The generated code is checked
+to be identical and the times and speedup are reported.
+
+Example:
+
+  python bench_remove_unused.py
+  python bench_remove_unused.py ../demo/P5tet.ufl
+"""
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function
+
+import os, sys
+import shutil
+import tempfile
+import argparse
+from time import time
+
+from ufl.algorithms import load_ufl_file
+
+from ffc.log import set_level, ERROR
+from ffc.parameters import default_parameters
+from ffc.compiler import compile_elements
+from ffc import cpp
+
+# Directory of this script
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Default form files
+default_files = [os.path.join(bench_dir, os.pardir, "demo", "P5tri.ufl"),
+                 os.path.join(bench_dir, os.pardir, "demo", "P5tet.ufl")]
+
+def remove_unused_original(code, used_set=set()):
+    "Original implementation of remove_unused, searching each line for each variable."
+    variables = {}
+    variable_names = []
+    lines = code.split("\n")
+    for (line_number, line) in enumerate(lines):
+        if line[:2] == "//" or line[:3] == "///":
+            continue
+        words = [word for word in line.split(" ") if not word == ""]
+        for type in [type for type in cpp.types if " ".join(type) in " ".join(words)]:
+            variable_type = words[0:len(type)]
+            variable_name = words[len(type)]
+            if variable_name in cpp.special_characters:
+                continue
+            if variable_type == type:
+                seps_present = [sep for sep in cpp.special_characters if sep in variable_name]
+                if seps_present:
+                    variable_name = [variable_name.split(sep)[0] for sep in seps_present]
+                    variable_name.sort()
+                    variable_name = variable_name[0]
+                variables[variable_name] = (line_number, [])
+                if not variable_name in variable_names:
+                    variable_names += [variable_name]
+        for variable_name in variables:
+            (declaration_line, used_lines) = variables[variable_name]
+            if cpp._variable_in_line(variable_name, line) and line_number > declaration_line:
+                variables[variable_name] = (declaration_line, used_lines + [line_number])
+    variable_names.reverse()
+    removed_lines = []
+    for variable_name in variable_names:
+        (declaration_line, used_lines) = variables[variable_name]
+        for line in removed_lines:
+            if line in used_lines:
+                used_lines.remove(line)
+        if not used_lines and not variable_name in used_set:
+            lines[declaration_line] = None
+            removed_lines += [declaration_line]
+    return "\n".join([line for line in lines if not line is None])
+
+def use_remove_unused(function):
+    "Use given implementation of remove_unused in all FFC modules."
+    current = cpp.remove_unused
+    for name, module in list(sys.modules.items()):
+        if name.startswith("ffc") and getattr(module, "remove_unused", None) is current:
+            module.remove_unused = function
+
+def compile_file(filename, function):
+    """Compile elements of form file using given implementation of
+    remove_unused, return compile time, code and arguments of each
+    call to remove_unused."""
+    parameters = default_parameters()
+    output_dir = tempfile.mkdtemp(prefix="ffc_bench_")
+    parameters["output_dir"] = output_dir
+    prefix = os.path.splitext(os.path.basename(filename))[0]
+
+    recorded = []
+    def recording_remove_unused(code, used_set=set()):
+        recorded.append((code, used_set))
+        return function(code, used_set)
+
+    original = cpp.remove_unused
+    use_remove_unused(recording_remove_unused)
+    try:
+        ufd = load_ufl_file(filename)
+        t = time()
+        compile_elements(ufd.elements, prefix, parameters)
+        t = time() - t
+        code = ""
+        for name in sorted(os.listdir(output_dir)):
+            with open(os.path.join(output_dir, name)) as f:
+                code += f.read()
+    finally:
+        use_remove_unused(original)
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    return t, code, recorded
+
+def time_calls(function, calls, repetitions):
+    "Return fastest time of calling function with each recorded arguments."
+    best = None
+    for i in range(repetitions):
+        t = time()
+        for (code, used_set) in calls:
+            function(code, used_set)
+        t = time() - t
+        best = t if best is None else min(best, t)
+    return best
+
+def main(argv):
+    "Main function."
+    parser = argparse.ArgumentParser(description="Benchmarks of removal of unused variables.")
+    parser.add_argument("files", nargs="*", default=default_files,
+                        help="form files (default: P5 elements in demo/)")
+    parser.add_argument("-n", "--repetitions", type=int, default=3,
+                        help="number of repetitions, the fastest is reported (default: 3)")
+    args = parser.parse_args(argv)
+
+    # Only report errors from FFC
+    set_level(ERROR)
+
+    print("%-15s %8s %10s %12s %12s %10s" % ("form", "calls", "lines", "original", "current", "speedup"))
+    for filename in args.files:
+        # Warm up caches of FFC (elements, tables) before timing
+        compile_file(filename, cpp.remove_unused)
+        t0, code0, calls = compile_file(filename, remove_unused_original)
+        t1, code1, calls = compile_file(filename, cpp.remove_unused)
+        if code0 != code1:
+            print("Generated code differs for %s." % filename)
+            return 1
+        num_lines = sum(code.count("\n") + 1 for (code, used_set) in calls)
+        r0 = time_calls(remove_unused_original, calls, args.repetitions)
+        r1 = time_calls(cpp.remove_unused, calls, args.repetitions)
+        name = os.path.basename(filename)
+        print("%-15s %8d %10d %10.3f s %10.3f s %9.1fx   (remove_unused)" % (name, len(calls), num_lines,
+                                                                           r0, r1, r0 / max(r1, 1e-9)))
+        print("%-15s %8s %10s %10.3f s %10.3f s %9.1fx   (compile_elements)" % ("", "", "",
+                                                                              t0, t1, t0 / max(t1, 1e-9)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,72 @@
+"""This script measures the cost of computing the JIT signature of a
+form, as done for each call to jit(), for a small and a large form.
+
+Timings are reported both for a fresh form (where UFL must compute
+the form signature) and for a form which has been seen before."""
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function
+from time import time
+
+from ufl.algorithms import load_ufl_file
+
+from ffc.jitobject import JITObject
+from ffc.jitcompiler import _check_parameters
+
+# Test cases and number of repetitions
+test_cases = ["Poisson_2D_1.ufl", "HyperElasticity.ufl"]
+num_repetitions = 100
+
+def load_forms(filename):
+    "Load (fresh) forms from file."
+    return load_ufl_file(filename).forms
+
+def bench_signature(filename):
+    "Return average cold and warm signature timings for forms in file."
+    parameters = _check_parameters(None, None)
+
+    # Cold: new form objects, nothing cached by UFL
+    cold = 0.0
+    timings = {"form": 0.0, "parameters": 0.0}
+    for i in range(num_repetitions):
+        for form in load_forms(filename):
+            jit_object = JITObject(form, parameters)
+            t = time()
+            jit_object.signature()
+            cold += time() - t
+            for key in timings:
+                timings[key] += jit_object.signature_timings[key]
+
+    # Warm: same form objects, new JITObject for each call as in jit()
+    warm = 0.0
+    forms = load_forms(filename)
+    for i in range(num_repetitions):
+        for form in forms:
+            t = time()
+            JITObject(form, parameters).signature()
+            warm += time() - t
+
+    n = num_repetitions*len(forms)
+    return cold / n, warm / n, timings["form"] / n, timings["parameters"] / n
+
+if __name__ == "__main__":
+    print("Average signature cost per jit() call (microseconds)\n")
+    print("%-24s %10s %10s %10s %10s" % ("form file", "cold", "warm", "form", "parameters"))
+    for filename in test_cases:
+        cold, warm, form, parameters = bench_signature(filename)
+        print("%-24s %10.1f %10.1f %10.1f %10.1f" % (filename, 1e6*cold, 1e6*warm,
+                                                     1e6*form, 1e6*parameters))
@@ -0,0 +1,124 @@
+"""This script measures the startup time of FFC: the time to import
+ffc in a fresh Python process and the time to run ffc --version. Each
+command is run a number of times and the median time is reported,
+together with the modules slow to import (FIAT, Instant, NumPy, SymPy
+and the representations) that were imported by import ffc.
+
+Results are written to a JSON file and may be compared against a
+baseline from an earlier run. The script exits with a nonzero status
+if the startup time increased more than allowed by the threshold.
+
+Example:
+
+  python bench_startup.py -o baseline.json
+  (change FFC)
+  python bench_startup.py -o results.json -b baseline.json
+"""
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function
+
+import os, sys
+import json
+import argparse
+import platform
+import subprocess
+from time import time
+
+# Directory of this script
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Modules which should not be imported by import ffc
+heavy_modules = ["FIAT", "instant", "numpy", "sympy", "ffc.compiler",
+                 "ffc.tensor", "ffc.quadrature", "ffc.uflacsrepr"]
+
+def commands():
+    "Return dictionary of commands to time."
+    ffc_script = os.path.join(bench_dir, os.pardir, "scripts", "ffc")
+    return {"python": [sys.executable, "-c", "pass"],
+            "import ufl": [sys.executable, "-c", "import ufl"],
+            "import ffc": [sys.executable, "-c", "import ffc"],
+            "ffc --version": [sys.executable, ffc_script, "--version"]}
+
+def time_command(command, repetitions):
+    "Run command repeatedly, returning the median time."
+    times = []
+    with open(os.devnull, "w") as devnull:
+        for i in range(repetitions):
+            t = time()
+            subprocess.check_call(command, stdout=devnull)
+            times.append(time() - t)
+    times.sort()
+    return times[len(times) // 2]
+
+def imported_heavy_modules():
+    "Return list of slow modules imported by import ffc."
+    code = "import sys, ffc; print(' '.join(sorted(sys.modules)))"
+    output = subprocess.check_output([sys.executable, "-c", code])
+    modules = output.decode().split()
+    return [m for m in heavy_modules if m in modules]
+
+def main(argv):
+    "Main function."
+    parser = argparse.ArgumentParser(description="Startup benchmarks for FFC.")
+    parser.add_argument("-n", "--repetitions", type=int, default=10,
+                        help="number of repetitions, the median is reported (default: 10)")
+    parser.add_argument("-o", "--output", default="bench_startup.json",
+                        help="file to which results are written (default: bench_startup.json)")
+    parser.add_argument("-b", "--baseline", help="file with baseline results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed relative increase of startup time (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    # Time commands
+    results = {}
+    for key, command in sorted(commands().items()):
+        results[key] = time_command(command, args.repetitions)
+        print("%-20s %10.3f s" % (key, results[key]))
+
+    # Check for slow modules imported by import ffc
+    modules = imported_heavy_modules()
+    if modules:
+        print("\nimport ffc imports: %s" % ", ".join(modules))
+
+    # Write results
+    data = {"python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "date": time(),
+            "results": results,
+            "imported_modules": modules}
+    with open(args.output, "w") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    print("\nResults written to %s." % args.output)
+
+    # Compare against baseline
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = [(key, baseline[key], results[key]) for key in sorted(results)
+                       if key in baseline and results[key] > baseline[key]*(1.0 + args.threshold)]
+        if regressions:
+            print("\nRegressions compared to %s:\n" % args.baseline)
+            for (key, a, b) in regressions:
+                print("%-20s %10.3f s -> %10.3f s" % (key, a, b))
+            return 1
+        print("\nNo regressions compared to %s." % args.baseline)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,138 @@
+"""This script benchmarks the memoization of reduce_vartype of the
+symbolic expressions used to optimise quadrature representation
+(-O), on the expressions of the unit tests in test/unit/symbolics.
+Each test case expands, reduces and optimises expressions taken from
+real forms (elasticity, Poisson, DG elastodynamics, ...). The test
+cases are run with and without memoization, recording the time spent.
+The tests check their results, so a failing test in either case is
+reported. The times and speedup are reported.
+
+Example:
+
+  python bench_symbolics.py
+  python bench_symbolics.py TestElasWeighted2 TestReduceGIP
+"""
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import print_function
+
+import os, sys
+import argparse
+import unittest
+from time import time
+
+from ffc.log import set_level, ERROR
+from ffc.quadrature.symbolics import symbolics_cache_scope, symbolics_cache_info
+from ffc.quadrature.sumobj import Sum
+from ffc.quadrature.product import Product
+from ffc.quadrature.fraction import Fraction
+
+# Directory of this script
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Test cases of test/unit/symbolics reducing expressions
+sys.path.insert(0, os.path.join(bench_dir, os.pardir, "test", "unit"))
+from symbolics.testreducevartype import TestReduceVarType
+from symbolics.testreduceoperations import TestReduceOperations
+from symbolics.testdgelastodyn import TestDGElastoDyn
+from symbolics.testreducegip import TestReduceGIP
+from symbolics.testpoisson import TestPoisson
+from symbolics.testelasticity2d import TestElasticity2D
+from symbolics.testelasticityterm import TestElasticityTerm
+from symbolics.testelasweighted import TestElasWeighted
+from symbolics.testelasweighted2 import TestElasWeighted2
+from symbolics.testrealexamples import TestRealExamples
+
+default_cases = [TestReduceVarType, TestReduceOperations, TestDGElastoDyn,
+                 TestReduceGIP, TestPoisson, TestElasticity2D,
+                 TestElasticityTerm, TestElasWeighted, TestElasWeighted2,
+                 TestRealExamples]
+
+# Classes with memoized reduce_vartype
+memoized_classes = (Sum, Product, Fraction)
+memoized_methods = dict((cls, cls.__dict__["reduce_vartype"]) for cls in memoized_classes)
+
+def set_memoization(enabled):
+    "Switch memoization of reduce_vartype on or off."
+    for cls, method in memoized_methods.items():
+        cls.reduce_vartype = method if enabled else method.__wrapped__
+
+def run_case(case):
+    """Run test case, return time spent, whether the test passed and
+    number of memoized reductions."""
+    # Expressions are cached for the duration of the scope, as for
+    # compile_form
+    test = case(case.__name__.replace("Test", "test", 1))
+    result = unittest.TestResult()
+    with symbolics_cache_scope():
+        t = time()
+        test.run(result)
+        t = time() - t
+        num_reductions = symbolics_cache_info()["reduce_vartype"]
+    return t, result.wasSuccessful(), num_reductions
+
+def best_time(case, memoize, repetitions):
+    "Return fastest time, whether the test passed and number of memoized reductions."
+    set_memoization(memoize)
+    try:
+        best = None
+        passed = True
+        for i in range(repetitions):
+            t, ok, num_reductions = run_case(case)
+            best = t if best is None else min(best, t)
+            passed = passed and ok
+    finally:
+        set_memoization(True)
+    return best, passed, num_reductions
+
+def main(argv):
+    "Main function."
+    parser = argparse.ArgumentParser(description="Benchmarks of memoization of symbolic expressions.")
+    parser.add_argument("cases", nargs="*",
+                        help="test cases (default: all cases reducing expressions)")
+    parser.add_argument("-n", "--repetitions", type=int, default=5,
+                        help="number of repetitions, the fastest is reported (default: 5)")
+    args = parser.parse_args(argv)
+
+    cases = dict((case.__name__, case) for case in default_cases)
+    for name in args.cases:
+        if name not in cases:
+            print("Unknown test case %s, choose from %s." % (name, ", ".join(sorted(cases))))
+            return 1
+    selected = [cases[name] for name in args.cases] or default_cases
+
+    # Only report errors from FFC
+    set_level(ERROR)
+
+    total0 = total1 = 0.0
+    print("%-25s %10s %12s %12s %10s" % ("test case", "memoized", "plain", "memoized", "speedup"))
+    for case in selected:
+        t0, ok0, n = best_time(case, False, args.repetitions)
+        t1, ok1, n = best_time(case, True, args.repetitions)
+        if not (ok0 and ok1):
+            print("Test case %s fails." % case.__name__)
+            return 1
+        total0 += t0
+        total1 += t1
+        print("%-25s %10d %10.4f s %10.4f s %9.2fx" % (case.__name__, n,
+                                                       t0, t1, t0 / max(t1, 1e-9)))
+    print("%-25s %10s %10.4f s %10.4f s %9.2fx" % ("total", "", total0, total1,
+                                                   total0 / max(total1, 1e-9)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -9,46 +9,109 @@ The interface consists of the following functions:
   compile_form       - Compilation of forms
   compile_element    - Compilation of finite elements
   jit                - Just-In-Time compilation of forms and elements
+  jit_forms          - Just-In-Time compilation of forms into a single module
   default_parameters - Default parameter values for FFC
-"""
 
-__version__ = "1.7.0dev"
+The functions are imported on first use, such that import ffc does not
+import FIAT, Instant and the representations.
+"""
 
-# Import compiler functions
-from ffc.compiler import compile_form, compile_element, compile_coordinate_element
+import sys
+import types
 
-# Import JIT compiler
-from ffc.jitcompiler import jit
+__version__ = "1.7.0dev"
 
 # Import default parameters
 from .parameters import default_parameters
 
-# Import plotting
-from .plot import *
+# Modules from which the interface is imported on first use
+_lazy_attributes = {"compile_form": "ffc.compiler",
+                    "compile_element": "ffc.compiler",
+                    "compile_coordinate_element": "ffc.compiler",
+                    "jit": "ffc.jitcompiler",
+                    "jit_forms": "ffc.jitcompiler",
+                    "plot": "ffc.plot",
+                    "compute_tensor_representation": "ffc.extras",
+                    "create_actual_fiat_element": "ffc.fiatinterface"}
+
+# Names imported by from ffc import *
+__all__ = sorted(list(_lazy_attributes) +
+                 ["default_parameters", "supported_elements",
+                  "supported_elements_for_plotting"])
+
+def _supported_elements():
+    """Return lists of supported elements and elements that can be
+    plotted (empty if FIAT is not available)."""
+    try:
+
+        # Import list of supported elements from FIAT
+        from FIAT import supported_elements
+        supported_elements = list(supported_elements.keys())
+        supported_elements.sort()
+
+        # Append elements that we can plot
+        from .plot import element_colors
+        supported_elements_for_plotting = list(set(supported_elements).union(set(element_colors.keys())))
+        supported_elements_for_plotting.sort()
+
+        # Remove elements from list that we don't support or don't trust
+        supported_elements.remove("Argyris")
+        supported_elements.remove("Hermite")
+        supported_elements.remove("Morley")
+
+    except:
+
+        supported_elements = []
+        supported_elements_for_plotting = []
+
+    return supported_elements, supported_elements_for_plotting
 
-# Import useful extra functionality
-from .extras import *
-from .fiatinterface import create_actual_fiat_element
+def __getattr__(name):
+    "Import interface functions and lists of supported elements on first use."
+    if name in _lazy_attributes:
+        module = __import__(_lazy_attributes[name], fromlist=[name])
+        value = getattr(module, name)
+    elif name in ("supported_elements", "supported_elements_for_plotting"):
+        elements = _supported_elements()
+        globals()["supported_elements"] = elements[0]
+        globals()["supported_elements_for_plotting"] = elements[1]
+        value = globals()[name]
+    else:
+        raise AttributeError("module 'ffc' has no attribute '%s'" % name)
+    globals()[name] = value
+    return value
 
-# List of supported elements
-try:
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes) |
+                  set(["supported_elements", "supported_elements_for_plotting"]))
 
-    # Import list of supported elements from FIAT
-    from FIAT import supported_elements
-    supported_elements = list(supported_elements.keys())
-    supported_elements.sort()
+class _Module(types.ModuleType):
+    """The ffc module, importing the interface on first use (Python
+    3.7 calls __getattr__ above itself) and keeping the function plot
+    if ffc.plot is imported."""
 
-    # Append elements that we can plot
-    from .plot import element_colors
-    supported_elements_for_plotting = list(set(supported_elements).union(set(element_colors.keys())))
-    supported_elements_for_plotting.sort()
+    def __getattr__(self, name):
+        value = __getattr__(name)
+        types.ModuleType.__setattr__(self, name, value)
+        return value
 
-    # Remove elements from list that we don't support or don't trust
-    supported_elements.remove("Argyris")
-    supported_elements.remove("Hermite")
-    supported_elements.remove("Morley")
+    def __dir__(self):
+        return __dir__()
 
-except:
+    def __setattr__(self, name, value):
+        # Importing the submodule ffc.plot binds the name plot to the
+        # module, bind it to the function plot instead
+        if name == "plot" and isinstance(value, types.ModuleType):
+            value = value.plot
+        types.ModuleType.__setattr__(self, name, value)
 
-    supported_elements = []
-    supported_elements_for_plotting = []
+# The class of a module can be changed from Python 3.5, before that the
+# module is replaced by a copy (keeping the original, since the globals
+# of a deleted module are cleared)
+if sys.version_info >= (3, 5):
+    sys.modules[__name__].__class__ = _Module
+else:
+    _module = _Module(__name__, __doc__)
+    _module.__dict__.update(globals())
+    _module._original_module = sys.modules[__name__]
+    sys.modules[__name__] = _module
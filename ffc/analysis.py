@@ -40,9 +40,6 @@ from ufl.algorithms.analysis import extract_sub_elements
 # FFC modules
 from ffc.log import log, info, begin, end, warning, debug, error, ffc_assert, warning_blue
 from ffc.utils import all_equal
-from ffc.quadratureelement import default_quadrature_degree
-from ffc.utils import all_equal
-from ffc.tensor import estimate_cost
 
 def analyze_forms(forms, parameters):
     """
@@ -318,7 +315,9 @@ def _auto_select_representation(integral, elements, function_replace_map):
     if len([e for e in sub_elements if e.family() == "Quadrature"]):
         return "quadrature"
 
-    # Estimate cost of tensor representation
+    # Estimate cost of tensor representation (the tensor module is
+    # imported here since it is slow to import)
+    from ffc.tensor import estimate_cost
     tensor_cost = estimate_cost(integral, function_replace_map)
     debug("Estimated cost of tensor representation: " + str(tensor_cost))
 
@@ -348,6 +347,7 @@ def _auto_select_quadrature_degree(integrand, representation, elements, element_
         return quadrature_degrees[0]
 
     # Otherwise estimate total degree of integrand
+    from ffc.quadratureelement import default_quadrature_degree
     q = estimate_total_polynomial_degree(integrand, default_quadrature_degree, element_replace_map)
     debug("Selecting quadrature degree based on total polynomial degree of integrand: " + str(q))
 
@@ -8,11 +8,12 @@ __all__ = ['build_ufc_module']
 
 import instant
 import os, sys, re, glob
+import multiprocessing
 
 from distutils import sysconfig
 
 def build_ufc_module(h_files, source_directory="", system_headers=None, \
-                     **kwargs):
+                     num_processes=1, **kwargs):
     """Build a python extension module from ufc compliant source code.
 
     The compiled module will be imported and returned by the function.
@@ -24,6 +25,9 @@ def build_ufc_module(h_files, source_directory="", system_headers=None, \
        The directory where the source files reside.
     @param system_headers:
        Extra headers that will be #included in the generated wrapper file.
+    @param num_processes:
+       Number of compiler processes run in parallel by make when there
+       are several source files (one per CPU if 0).
 
     Any additional keyword arguments are passed on to instant.build_module.
     """
@@ -64,13 +68,28 @@ del tmp, get_swigversion
 %}
 """
 
-    # Call instant and return module
-    return instant.build_module(wrap_headers            = h_files,
-                                source_directory        = source_directory,
-                                additional_declarations = declarations,
-                                system_headers          = system_headers,
-                                cmake_packages          = ["UFC"],
-                                **kwargs)
+    # Let make, run by Instant, compile the sources in parallel with
+    # the compiler flags of Instant, unless the user has set the number
+    # of jobs
+    sources = kwargs.get("sources") or []
+    makeflags = os.environ.get("MAKEFLAGS")
+    if num_processes != 1 and len(sources) > 1 and not "-j" in (makeflags or ""):
+        num_processes = num_processes or multiprocessing.cpu_count()
+        os.environ["MAKEFLAGS"] = ("%s -j%d" % (makeflags or "", num_processes)).strip()
+    try:
+        # Call instant and return module
+        return instant.build_module(wrap_headers            = h_files,
+                                    source_directory        = source_directory,
+                                    additional_declarations = declarations,
+                                    system_headers          = system_headers,
+                                    cmake_packages          = ["UFC"],
+                                    **kwargs)
+    finally:
+        # Restore environment
+        if makeflags is None:
+            os.environ.pop("MAKEFLAGS", None)
+        else:
+            os.environ["MAKEFLAGS"] = makeflags
 
 def extract_declarations(h_files):
     "Extract information for shared_ptr"
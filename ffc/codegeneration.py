@@ -41,6 +41,7 @@ from ffc.evaluatedof import evaluate_dof_and_dofs, affine_weights
 from ffc.interpolatevertexvalues import interpolate_vertex_values
 
 from ffc.representation import pick_representation, ufc_integral_types
+from ffc.profiling import profiled
 
 # Errors issued for non-implemented functions
 def _not_implemented(function_name, return_null=False):
@@ -95,6 +96,7 @@ def generate_code(ir, parameters):
     return code_elements, code_dofmaps, code_coordinate_mappings, code_integrals, code_forms
 
 
+@profiled(lambda ir, parameters: ir and ir["classname"])
 def _generate_element_code(ir, parameters):
     "Generate code for finite element from intermediate representation."
 
@@ -158,6 +160,7 @@ def _generate_element_code(ir, parameters):
     return code
 
 
+@profiled(lambda ir, parameters: ir and ir["classname"])
 def _generate_dofmap_code(ir, parameters):
     "Generate code for dofmap from intermediate representation."
 
@@ -251,6 +254,7 @@ def _generate_coordinate_mapping_code(ir, parameters):
     return code
 
 
+@profiled(lambda ir, parameters: ir and ir["classname"])
 def _generate_integral_code(ir, parameters):
     "Generate code for integrals from intermediate representation."
 
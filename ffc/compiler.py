@@ -73,9 +73,10 @@ Compiler stage 5: Code formatting
   to the UFC format, generating as output one or more .h/.cpp files
   conforming to the UFC format.
 
-The main interface is defined by the following two functions:
+The main interface is defined by the following functions:
 
   compile_form
+  compile_elements
   compile_element
 
 The compiler stages are implemented by the following functions:
@@ -111,7 +112,8 @@ The compiler stages are implemented by the following functions:
 # Modified by Garth N. Wells, 2009.
 # Modified by Martin Alnaes, 2013-2015
 
-__all__ = ["compile_form", "compile_element", "compile_coordinate_element"]
+__all__ = ["compile_form", "compile_elements", "compile_element",
+           "compile_coordinate_element"]
 
 # Python modules
 from time import time
@@ -128,15 +130,16 @@ from ffc.optimization import optimize_ir
 from ffc.codegeneration import generate_code
 from ffc.formatting import format_code, write_code
 from ffc.wrappers import generate_wrapper_code
+from ffc.ircache import compute_ir_signature, load_ir, store_ir
+from ffc.cpp import set_float_formatting
+from ffc.profiling import Profiler, profile_section, active_profiler
+from ffc.quadrature.symbolics import symbolics_cache_scope
 
-def compile_form(forms, object_names=None, prefix="Form", parameters=None):
+def compile_form(forms, object_names=None, prefix="Form", parameters=None,
+                 filenames=None):
     """This function generates UFC code for a given UFL form or list
-    of UFL forms."""
-
-    info("Compiling form %s\n" % prefix)
-
-    # Reset timing
-    cpu_time_0 = time()
+    of UFL forms. The names of the written implementation files are
+    appended to the list filenames, if given."""
 
     # Check input arguments
     forms = _check_forms(forms)
@@ -149,20 +152,64 @@ def compile_form(forms, object_names=None, prefix="Form", parameters=None):
         object_names = {}
     parameters = _check_parameters(parameters)
 
-    # Stage 1: analysis
-    cpu_time = time()
-    analysis = analyze_forms(forms, parameters)
-    _print_timing(1, time() - cpu_time)
+    # Profile compilation if requested (and not already profiling)
+    profile_file = parameters.get("profile_file")
+    if profile_file and active_profiler() is None:
+        with Profiler(prefix) as profiler:
+            code = compile_form(forms, object_names, prefix, parameters,
+                                filenames)
+        _dump_profile(profiler, profile_file)
+        return code
 
-    # Stage 2: intermediate representation
-    cpu_time = time()
-    ir = compute_ir(analysis, prefix, parameters, object_names=object_names)
-    _print_timing(2, time() - cpu_time)
+    # Symbolic expressions are cached for the duration of the compilation
+    with symbolics_cache_scope():
+        return _compile_form(forms, object_names, prefix, parameters,
+                             filenames)
 
-    # Stage 3: optimization
-    cpu_time = time()
-    oir = optimize_ir(ir, parameters)
-    _print_timing(3, time() - cpu_time)
+def _compile_form(forms, object_names, prefix, parameters, filenames):
+    "Generate code for checked forms (see compile_form)."
+
+    info("Compiling form %s\n" % prefix)
+
+    # Reset timing
+    cpu_time_0 = time()
+
+    # Look for a cached intermediate representation
+    analysis = None
+    oir = None
+    wrapper_code = None
+    ir_cache_dir = parameters.get("ir_cache_dir")
+    if ir_cache_dir:
+        ir_signature = compute_ir_signature(forms, prefix, object_names, parameters)
+        cached = load_ir(ir_signature, ir_cache_dir)
+        if cached is not None:
+            # The wrappers are cached with the IR since they are
+            # generated from the analysis
+            oir, wrapper_code = cached
+
+    if oir is None:
+        # Stage 1: analysis
+        cpu_time = time()
+        with profile_section("stage 1: analysis"):
+            analysis = analyze_forms(forms, parameters)
+        _print_timing(1, time() - cpu_time)
+
+        # Stage 2: intermediate representation
+        cpu_time = time()
+        with profile_section("stage 2: intermediate representation"):
+            ir = compute_ir(analysis, prefix, parameters, object_names=object_names)
+        _print_timing(2, time() - cpu_time)
+
+        # Stage 3: optimization
+        cpu_time = time()
+        with profile_section("stage 3: optimization"):
+            oir = optimize_ir(ir, parameters)
+        _print_timing(3, time() - cpu_time)
+    else:
+        info("Reusing intermediate representation from cache, skipping stages 1-3.")
+
+        # Normally set when computing the intermediate representation
+        set_float_formatting(int(parameters["precision"]))
 
     # Return IR (PyOP2 mode) or code string (otherwise)
     if parameters["pyop2-ir"]:
@@ -174,33 +221,125 @@ def compile_form(forms, object_names=None, prefix="Form", parameters=None):
 
         cpu_time = time()
         #FIXME: need a cleaner interface
-        pyop2_ir = [generate_pyop2_ir(ir, prefix, parameters) for ir in oir[3]]
+        with profile_section("stage 4: code generation"):
+            pyop2_ir = [generate_pyop2_ir(ir, prefix, parameters) for ir in oir[3]]
         _print_timing(4, time() - cpu_time)
 
+        # Store intermediate representation for later compilations
+        if ir_cache_dir and analysis is not None:
+            store_ir(ir_signature, (oir, None), ir_cache_dir)
+
         info_green("FFC finished in %g seconds.", time() - cpu_time_0)
         return pyop2_ir
 
     else:
         # Stage 4: code generation
         cpu_time = time()
-        code = generate_code(oir, prefix, parameters)
+        with profile_section("stage 4: code generation"):
+            code = generate_code(oir, parameters)
         _print_timing(4, time() - cpu_time)
 
-        # Stage 4.1: generate wrappers
-        cpu_time = time()
-        wrapper_code = generate_wrapper_code(analysis, prefix, object_names, parameters)
-        _print_timing(4.1, time() - cpu_time)
+        # Stage 4.1: generate wrappers (unless taken from the cache)
+        if analysis is not None:
+            cpu_time = time()
+            with profile_section("stage 4.1: wrappers"):
+                wrapper_code = generate_wrapper_code(analysis, prefix, object_names, parameters)
+            _print_timing(4.1, time() - cpu_time)
+
+            # Store intermediate representation for later compilations
+            if ir_cache_dir:
+                store_ir(ir_signature, (oir, wrapper_code), ir_cache_dir)
 
         # Stage 5: format code
         cpu_time = time()
-        code_h, code_c = format_code(code, wrapper_code, prefix, parameters)
-        write_code(code_h, code_c, prefix, parameters) # FIXME: Don't write to file in this function (issue #72)
+        with profile_section("stage 5: formatting"):
+            code_h, code_c = format_code(code, wrapper_code, prefix, parameters)
+            written = write_code(code_h, code_c, prefix, parameters) # FIXME: Don't write to file in this function (issue #72)
+            if filenames is not None:
+                filenames.extend(written)
         _print_timing(5, time() - cpu_time)
 
         info_green("FFC finished in %g seconds.", time() - cpu_time_0)
 
         return code
 
+def compile_elements(elements, prefix="Element", parameters=None,
+                     filenames=None):
+    """This function generates UFC code for a given UFL element or
+    list of UFL elements (finite elements and dofmaps only). The names
+    of the written implementation files are appended to the list
+    filenames, if given."""
+
+    # Check input arguments
+    elements = _check_elements(elements)
+    if not elements:
+        return
+    parameters = _check_parameters(parameters)
+
+    # Profile compilation if requested (and not already profiling)
+    profile_file = parameters.get("profile_file")
+    if profile_file and active_profiler() is None:
+        with Profiler(prefix) as profiler:
+            code = compile_elements(elements, prefix, parameters, filenames)
+        _dump_profile(profiler, profile_file)
+        return code
+
+    # Symbolic expressions are cached for the duration of the compilation
+    with symbolics_cache_scope():
+        return _compile_elements(elements, prefix, parameters, filenames)
+
+def _compile_elements(elements, prefix, parameters, filenames):
+    "Generate code for checked elements (see compile_elements)."
+
+    info("Compiling element %s\n" % prefix)
+
+    # Reset timing
+    cpu_time_0 = time()
+
+    # Stage 1: analysis
+    cpu_time = time()
+    with profile_section("stage 1: analysis"):
+        analysis = analyze_elements(elements, parameters)
+    _print_timing(1, time() - cpu_time)
+
+    # Stage 2: intermediate representation
+    cpu_time = time()
+    with profile_section("stage 2: intermediate representation"):
+        ir = compute_ir(analysis, prefix, parameters)
+    _print_timing(2, time() - cpu_time)
+
+    # Stage 3: optimization
+    cpu_time = time()
+    with profile_section("stage 3: optimization"):
+        oir = optimize_ir(ir, parameters)
+    _print_timing(3, time() - cpu_time)
+
+    # Stage 4: code generation
+    cpu_time = time()
+    with profile_section("stage 4: code generation"):
+        code = generate_code(oir, parameters)
+    _print_timing(4, time() - cpu_time)
+
+    # Stage 4.1: generate wrappers
+    cpu_time = time()
+    with profile_section("stage 4.1: wrappers"):
+        object_names = {}
+        wrapper_code = generate_wrapper_code(analysis, prefix, object_names, parameters)
+    _print_timing(4.1, time() - cpu_time)
+
+    # Stage 5: format code
+    cpu_time = time()
+    with profile_section("stage 5: formatting"):
+        code_h, code_c = format_code(code, wrapper_code, prefix, parameters)
+        written = write_code(code_h, code_c, prefix, parameters) # FIXME: Don't write to file in this function (issue #72)
+        if filenames is not None:
+            filenames.extend(written)
+    _print_timing(5, time() - cpu_time)
+
+    info_green("FFC finished in %g seconds.", time() - cpu_time_0)
+
+    return code
+
 def compile_element(ufl_element, cdim):
     """Generates C code for point evaluations.
 
@@ -561,6 +700,11 @@ def _check_parameters(parameters):
 
     return parameters
 
+def _dump_profile(profiler, filename):
+    "Write profile to file in JSON format."
+    profiler.dump(filename)
+    info("Wrote profile to file %s." % filename)
+
 def _print_timing(stage, timing):
     "Print timing results."
     info("Compiler stage %s finished in %g seconds.\n" % (str(stage), timing))
@@ -833,6 +833,13 @@ types = [["double"],
 # Special characters and delimiters
 special_characters = ["+", "-", "*", "/", "=", ".", " ", ";", "(", ")", "\\", "{", "}", "[","]", "!"]
 
+# Delimiters of variable names in lines of code (see _variable_in_line)
+_delimiters = re.compile("[%s]" % re.escape("".join(special_characters + [","])))
+
+# Characters in variable names which are not matched literally by
+# _variable_in_line or which are delimiters
+_irregular_name = re.compile(r"[,^$?|]")
+
 def remove_unused(code, used_set=set()):
     """
     Remove unused variables from a given C++ code. This is useful when
@@ -850,6 +857,10 @@ def remove_unused(code, used_set=set()):
     # List of variable names (so we can search them in order)
     variable_names = []
 
+    # Variable names which are not a single word between delimiters
+    # (searched for by _variable_in_line)
+    irregular_names = []
+
     lines = code.split("\n")
     for (line_number, line) in enumerate(lines):
         # Exclude commented lines.
@@ -858,9 +869,10 @@ def remove_unused(code, used_set=set()):
 
         # Split words
         words = [word for word in line.split(" ") if not word == ""]
+        joined_words = " ".join(words)
 
         # Remember line where variable is declared
-        for type in [type for type in types if " ".join(type) in " ".join(words)]: # Fewer matches than line below.
+        for type in [type for type in types if " ".join(type) in joined_words]: # Fewer matches than line below.
         # for type in [type for type in types if len(words) > len(type)]:
             variable_type = words[0:len(type)]
             variable_name = words[len(type)]
@@ -883,32 +895,37 @@ def remove_unused(code, used_set=set()):
                     variable_name.sort()
                     variable_name = variable_name[0]
 
-                variables[variable_name] = (line_number, [])
-                if not variable_name in variable_names:
-                    variable_names += [variable_name]
-
-        # Mark line for used variables
-        for variable_name in variables:
+                if not variable_name in variables:
+                    variable_names.append(variable_name)
+                    if _irregular_name.search(variable_name) or not variable_name:
+                        irregular_names.append(variable_name)
+                variables[variable_name] = (line_number, set())
+
+        # Mark line for used variables, i.e., words between delimiters
+        # (the first and last part of the line are not between delimiters)
+        for variable_name in _delimiters.split(line)[1:-1]:
+            if variable_name in variables and not variable_name in irregular_names:
+                (declaration_line, used_lines) = variables[variable_name]
+                if line_number > declaration_line:
+                    used_lines.add(line_number)
+        for variable_name in irregular_names:
             (declaration_line, used_lines) = variables[variable_name]
-            if _variable_in_line(variable_name, line) and line_number > declaration_line:
-                variables[variable_name] = (declaration_line, used_lines + [line_number])
+            if line_number > declaration_line and _variable_in_line(variable_name, line):
+                used_lines.add(line_number)
 
     # Reverse the order of the variable names to catch variables used
     # only by variables that are removed
     variable_names.reverse()
 
     # Remove declarations that are not used
-    removed_lines = []
+    removed_lines = set()
     for variable_name in variable_names:
         (declaration_line, used_lines) = variables[variable_name]
-        for line in removed_lines:
-            if line in used_lines:
-                used_lines.remove(line)
-        if not used_lines and not variable_name in used_set:
+        if used_lines <= removed_lines and not variable_name in used_set:
             debug("Removing unused variable: %s" % variable_name)
             lines[declaration_line] = None # KBO: Need to completely remove line for evaluate_basis* to work
             # lines[declaration_line] = "// " + lines[declaration_line]
-            removed_lines += [declaration_line]
+            removed_lines.add(declaration_line)
     return "\n".join([line for line in lines if not line is None])
 
 def _variable_in_line(variable_name, line):
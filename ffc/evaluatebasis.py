@@ -39,9 +39,11 @@ import numpy
 # FFC modules
 from ffc.log import error
 from ffc.cpp import remove_unused, indent, format
+from ffc.profiling import profiled
 from ffc.quadrature.symbolics import create_float, create_float, create_symbol,\
                                      create_product, create_sum, create_fraction, CONST
 
+@profiled("evaluate_basis_all")
 def _evaluate_basis_all(data):
     """Like evaluate_basis, but return the values of all basis functions (dofs)."""
 
@@ -120,6 +122,7 @@ def _evaluate_basis_all(data):
     return "\n".join(code)
 
 # From FIAT_NEW.polynomial_set.tabulate()
+@profiled("evaluate_basis")
 def _evaluate_basis(data):
     """Generate run time code to evaluate an element basisfunction at an
     arbitrary point. The value(s) of the basisfunction is/are
@@ -33,7 +33,9 @@ import numpy
 from ffc.log import error, ffc_assert
 from ffc.evaluatebasis import _compute_basisvalues, _tabulate_coefficients
 from ffc.cpp import remove_unused, indent, format
+from ffc.profiling import profiled
 
+@profiled("evaluate_basis_derivatives_all")
 def _evaluate_basis_derivatives_all(data):
     """Like evaluate_basis, but return the values of all basis
     functions (dofs)."""
@@ -148,6 +150,7 @@ def _evaluate_basis_derivatives_all(data):
     # Generate bode (no need to remove unused).
     return "\n".join(code)
 
+@profiled("evaluate_basis_derivatives")
 def _evaluate_basis_derivatives(data):
     """Evaluate the derivatives of an element basisfunction at a point. The values are
     computed as in FIAT as the matrix product of the coefficients (computed at compile time),
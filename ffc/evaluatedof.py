@@ -50,6 +50,7 @@ FIAT (functional.pt_dict) in the intermediate representation stage.
 
 from ffc.cpp import format, remove_unused
 from ffc.utils import pick_first
+from ffc.profiling import profiled
 from ufl.permutation import build_component_numbering
 
 __all__ = ["evaluate_dof_and_dofs", "affine_weights"]
@@ -84,6 +85,7 @@ f_loop =    format["generate loop"]
 
 map_onto_physical = format["map onto physical"]
 
+@profiled("evaluate_dof_and_dofs")
 def evaluate_dof_and_dofs(ir):
     "Generate code for evaluate_dof and evaluate_dof."
 
@@ -49,12 +49,12 @@ def compute_tensor_representation(form):
 
     # Stage 1: analysis
     cpu_time = time()
-    analysis = analyze_forms([form], {}, parameters)
+    analysis = analyze_forms([form], parameters)
     _print_timing(1, time() - cpu_time)
 
     # Stage 2: intermediate representation
     cpu_time = time()
-    ir = compute_ir(analysis, parameters)
+    ir = compute_ir(analysis, "foo", parameters)
     _print_timing(2, time() - cpu_time)
 
     # Stage 3: optimization
@@ -64,7 +64,7 @@ def compute_tensor_representation(form):
 
     # Stage 4: code generation
     cpu_time = time()
-    code = generate_code(oir, "foo", parameters)
+    code = generate_code(oir, parameters)
     _print_timing(4, time() - cpu_time)
 
     # Extract representations
@@ -24,7 +24,6 @@
 # Python modules
 from numpy import array, asarray, polymul, zeros, ones
 import six
-import weakref
 
 # UFL and FIAT modules
 import ufl
@@ -36,6 +35,7 @@ from FIAT.trace import DiscontinuousLagrangeTrace
 
 # FFC modules
 from ffc.log import debug, error, ffc_assert
+from ffc.utils import LRUCache
 from ffc.quadratureelement import QuadratureElement as FFCQuadratureElement
 
 
@@ -72,9 +72,10 @@ supported_families = ("Brezzi-Douglas-Marini",
                       "InteriorElement",
                       "Regge")
 
-# Cache for computed elements
+# Cache for computed elements, keyed by the repr of the UFL element such
+# that equivalent elements created by different forms share the entry
 
-_cache = weakref.WeakKeyDictionary()
+_cache = LRUCache(maxsize=512)
 
 # Quadrilateral OuterProductCell
 _quad_opc = ufl.OuterProductCell(ufl.Cell("interval"), ufl.Cell("interval"))
@@ -96,12 +97,12 @@ def reference_cell_vertices(cellname):
 
 def create_element(ufl_element):
 
-    # Create element signature for caching (just use UFL element)
-    element_signature = ufl_element
+    # Create element signature for caching
+    element_signature = repr(ufl_element)
 
     # Check cache
-    element = _cache.get(element_signature, None)
-    if element:
+    element = _cache.get(element_signature)
+    if element is not None:
         debug("Reusing element from cache")
         return element
 
@@ -123,6 +124,14 @@ def create_element(ufl_element):
 
     return element
 
+def element_cache_info():
+    "Return dictionary of statistics of the cache of created elements."
+    return _cache.info()
+
+def clear_element_cache():
+    "Remove all elements from the cache of created elements."
+    _cache.clear()
+
 def _create_fiat_element(ufl_element):
     "Create FIAT element corresponding to given finite element."
 
@@ -39,51 +39,61 @@ from ffc.parameters import compilation_relevant_parameters
 
 
 def format_code(code, wrapper_code, prefix, parameters):
-    "Format given code in UFC format. Returns two strings with header and source file contents."
+    """Format given code in UFC format. Returns two strings with header
+    and source file contents. If the parameter split_classes is set
+    (together with split), the source file contents are instead
+    returned as a list of strings, one for each class, which may be
+    compiled separately."""
 
     begin("Compiler stage 5: Formatting code")
 
     # Extract code
     code_elements, code_dofmaps, code_coordinate_mappings, code_integrals, code_forms = code
 
-    # Header and implementation code
+    # Header and implementation code (one for each class)
     code_h = ""
-    code_c = ""
+    codes_c = []
 
     # Generate code for comment on top of file
     code_h += _generate_comment(parameters) + "\n"
-    code_c += _generate_comment(parameters) + "\n"
 
     # Generate code for header
     code_h += format["header_h"] % {"prefix_upper": prefix.upper()}
     code_h += _generate_additional_includes(code_integrals)  + "\n"
-    code_c += format["header_c"] % {"prefix": prefix}
 
     # Generate code for elements
     for code_element in code_elements:
         code_h += _format_h("finite_element", code_element, parameters)
-        code_c += _format_c("finite_element", code_element, parameters)
+        codes_c.append(_format_c("finite_element", code_element, parameters))
 
     # Generate code for dofmaps
     for code_dofmap in code_dofmaps:
         code_h += _format_h("dofmap", code_dofmap, parameters)
-        code_c += _format_c("dofmap", code_dofmap, parameters)
+        codes_c.append(_format_c("dofmap", code_dofmap, parameters))
 
     # Generate code for coordinate_mappings
     code_coordinate_mappings = [] # FIXME: This disables output of generated coordinate_mapping class, until implemented properly
     for code_coordinate_mapping in code_coordinate_mappings:
         code_h += _format_h("coordinate_mapping", code_coordinate_mapping, parameters)
-        code_c += _format_c("coordinate_mapping", code_coordinate_mapping, parameters)
+        codes_c.append(_format_c("coordinate_mapping", code_coordinate_mapping, parameters))
 
     # Generate code for integrals
     for code_integral in code_integrals:
         code_h += _format_h(code_integral["class_type"], code_integral, parameters)
-        code_c += _format_c(code_integral["class_type"], code_integral, parameters)
+        codes_c.append(_format_c(code_integral["class_type"], code_integral, parameters))
 
     # Generate code for form
     for code_form in code_forms:
         code_h += _format_h("form", code_form, parameters)
-        code_c += _format_c("form", code_form, parameters)
+        codes_c.append(_format_c("form", code_form, parameters))
+
+    # Generate code for comment and header of implementation file(s)
+    header_c = _generate_comment(parameters) + "\n"
+    header_c += format["header_c"] % {"prefix": prefix}
+    if parameters["split"] and parameters.get("split_classes"):
+        code_c = [header_c + c for c in codes_c]
+    else:
+        code_c = header_c + "".join(codes_c)
 
     # Add wrappers
     if wrapper_code:
@@ -97,12 +107,17 @@ def format_code(code, wrapper_code, prefix, parameters):
     return code_h, code_c
 
 def write_code(code_h, code_c, prefix, parameters):
-    # Write file(s)
-    if parameters["split"]:
-        _write_file(code_h, prefix, ".h", parameters)
-        _write_file(code_c, prefix, ".cpp", parameters)
+    """Write file(s). Returns the list of names of the written
+    implementation files (empty unless split)."""
+    _write_file(code_h, prefix, ".h", parameters)
+    if not parameters["split"]:
+        return []
+    elif isinstance(code_c, list):
+        # One file for each class
+        return [_write_file(c, prefix, "_%d.cpp" % i, parameters)
+                for (i, c) in enumerate(code_c)]
     else:
-        _write_file(code_h, prefix, ".h", parameters)
+        return [_write_file(code_c, prefix, ".cpp", parameters)]
 
 def _format_h(class_type, code, parameters):
     "Format header code for given class type."
@@ -124,6 +139,7 @@ def _write_file(output, prefix, postfix, parameters):
     with open(filename, "w") as hfile:
         hfile.write(output)
     info("Output written to " + filename + ".")
+    return filename
 
 def _generate_comment(parameters):
     "Generate code for comment on top of file."
@@ -23,6 +23,7 @@
 # Last changed: 2015-03-25
 
 from ffc.cpp import format, remove_unused
+from ffc.profiling import profiled
 
 # Extract code manipulation formats
 inner =     format["inner product"]
@@ -38,6 +39,7 @@ invdetJ = format["inverse"](format["det(J)"](None))
 f_dof_values =    format["argument dof values"]
 f_vertex_values = format["argument vertex values"]
 
+@profiled("interpolate_vertex_values")
 def interpolate_vertex_values(ir):
     "Generate code for interpolate_vertex_values."
 
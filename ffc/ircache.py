@@ -0,0 +1,331 @@
+"""This module provides a persistent on-disk cache of (optimized)
+intermediate representations, allowing compiler stages 1-3 to be
+skipped for forms that have been processed before, possibly by another
+process or on another machine sharing the cache directory.
+
+Cache entries are addressed by a signature computed from the form
+signatures, the prefix, the object names and the compilation relevant
+parameters. The IR is serialized without pickle: a small set of tagged
+types (plain Python data, NumPy arrays, UFL cells and elements, the
+symbolic expressions of the quadrature representation and the
+reference and geometry tensors of the tensor representation) is mapped
+onto types understood natively by marshal, and the result is
+compressed. UFL cells and elements are stored by their constructor
+arguments and recreated through their constructors. IRs containing any
+other objects are not cached.
+"""
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+# Python modules
+import os
+import sys
+import zlib
+import marshal
+import tempfile
+import importlib
+import types
+from hashlib import sha1
+
+import numpy
+import six
+
+# UFL modules
+import ufl
+import ufl.classes
+
+# FFC modules
+from ffc import __version__ as FFC_VERSION
+from ffc.log import debug, info
+from ffc.jitobject import _parameters_signature
+
+__all__ = ["compute_ir_signature", "load_ir", "store_ir", "IRCacheError"]
+
+# Version of the cache format, bump when the encoding or the IR changes
+IR_CACHE_VERSION = 3
+
+# Types which are stored as they are
+_scalar_types = (type(None), bool, float, complex, bytes) + \
+                six.integer_types + six.string_types
+
+# Classes of the tensor representation, stored by their attributes
+_tensor_classes = {
+    "ffc.tensor.referencetensor": ("ReferenceTensor",),
+    "ffc.tensor.geometrytensor": ("GeometryTensor",),
+    "ffc.tensor.multiindex": ("MultiIndex",),
+    "ffc.tensor.monomialtransformation": ("TransformedMonomial",
+                                          "MonomialIndex",
+                                          "MonomialDeterminant",
+                                          "MonomialCoefficient",
+                                          "MonomialTransform",
+                                          "MonomialArgument"),
+}
+
+# Classes of UFL cells and elements, stored by their constructor
+# arguments (see _ufl_arguments)
+_ufl_classes = ("Cell", "TensorProductCell", "FiniteElement",
+                "VectorElement", "TensorElement", "MixedElement",
+                "EnrichedElement", "NodalEnrichedElement",
+                "RestrictedElement", "HDivElement", "HCurlElement",
+                "BrokenElement", "TensorProductElement")
+
+class IRCacheError(Exception):
+    "Raised when an IR cannot be serialized or deserialized."
+    pass
+
+def compute_ir_signature(forms, prefix, object_names, parameters):
+    "Return unique string for forms + prefix + object names + parameters."
+
+    # Object names are keyed by id, translate to persistent names
+    names = []
+    for form in forms:
+        names.append(str(object_names.get(id(form))))
+        names += [str(object_names.get(id(c))) for c in form.coefficients()]
+
+    signatures = [form.signature() for form in forms]
+    signatures += [prefix,
+                   ",".join(names),
+                   _parameters_signature(parameters),
+                   str(FFC_VERSION),
+                   str(ufl.__version__),
+                   str(IR_CACHE_VERSION),
+                   "%d.%d" % sys.version_info[:2]]
+    string = ";".join(signatures)
+
+    return sha1(string.encode('utf-8')).hexdigest()
+
+def load_ir(signature, cache_dir):
+    "Load IR with given signature from cache, return None if not found."
+    filename = _ir_filename(signature, cache_dir)
+    if not os.path.isfile(filename):
+        debug("No cached IR found for signature %s." % signature)
+        return None
+    try:
+        with open(filename, "rb") as f:
+            data = marshal.loads(zlib.decompress(f.read()))
+        return _decode(data)
+    except (IRCacheError, ValueError, EOFError, TypeError, zlib.error) as e:
+        info("Ignoring unreadable cached IR %s (%s)." % (filename, str(e)))
+        return None
+
+def store_ir(signature, ir, cache_dir):
+    "Store IR with given signature in cache. Return True if stored."
+    try:
+        data = zlib.compress(marshal.dumps(_encode(ir)))
+    except (IRCacheError, ValueError) as e:
+        info("Not caching intermediate representation, unable to serialize it (%s)." % str(e))
+        return False
+
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+
+    # Write to a temporary file and rename, such that concurrent
+    # readers never see a partially written entry
+    fd, tmpname = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.rename(tmpname, _ir_filename(signature, cache_dir))
+    finally:
+        # Remove temporary file if not renamed
+        if os.path.exists(tmpname):
+            os.remove(tmpname)
+    debug("Stored IR in cache (%d bytes)." % len(data))
+
+    return True
+
+def _ir_filename(signature, cache_dir):
+    return os.path.join(cache_dir, "ffc_ir_%s.ir" % signature)
+
+#--- Encoding ---
+
+# Tuples are used for all tagged data, so ordinary tuples must be
+# tagged as well to avoid ambiguities. Lists are stored as lists.
+
+def _encode(obj):
+    "Encode object as data understood by marshal."
+    if isinstance(obj, numpy.generic):
+        # NumPy scalars may derive from Python scalars but marshal
+        # does not handle them, so convert them first
+        return _encode(obj.item())
+    elif isinstance(obj, _scalar_types):
+        return obj
+    elif isinstance(obj, list):
+        return [_encode(o) for o in obj]
+    elif isinstance(obj, tuple):
+        return ("T", [_encode(o) for o in obj])
+    elif isinstance(obj, dict):
+        return ("D", [(_encode(k), _encode(v)) for (k, v) in six.iteritems(obj)])
+    elif isinstance(obj, frozenset):
+        return ("F", [_encode(o) for o in obj])
+    elif isinstance(obj, set):
+        return ("S", [_encode(o) for o in obj])
+    elif isinstance(obj, numpy.ndarray):
+        if obj.dtype.hasobject:
+            return ("O", obj.shape, [_encode(o) for o in obj.flat])
+        return ("A", obj.dtype.str, obj.shape, obj.tobytes())
+    elif isinstance(obj, (ufl.classes.AbstractCell, ufl.classes.FiniteElementBase)):
+        name = obj.__class__.__name__
+        args, kwargs = _ufl_arguments(obj)
+        return ("U", name, _encode(args), _encode(kwargs), repr(obj))
+
+    # Symbolic expressions of the quadrature representation
+    from ffc.quadrature.symbolics import FloatValue, Symbol, Product, Sum, Fraction
+    from ffc.quadrature.funcall import FunCall
+    if isinstance(obj, FloatValue):
+        return ("E", "float", obj.val)
+    elif isinstance(obj, Symbol):
+        return ("E", "symbol", obj.v, obj.t, _encode(obj.base_expr),
+                obj.base_op, _encode(obj.loop_index), _encode(obj.ide))
+    elif isinstance(obj, Product):
+        return ("E", "product", _encode(obj.vrs))
+    elif isinstance(obj, Sum):
+        return ("E", "sum", _encode(obj.vrs))
+    elif isinstance(obj, Fraction):
+        return ("E", "fraction", _encode(obj.num), _encode(obj.denom))
+    elif isinstance(obj, FunCall):
+        return ("E", "funcall", obj.funname, _encode(obj.vrs))
+
+    # Objects of the tensor representation (old-style classes in
+    # Python 2, so check the class rather than the type)
+    cls = obj.__class__
+    if cls.__name__ in _tensor_classes.get(cls.__module__, ()):
+        return ("C", cls.__module__, cls.__name__, _encode(vars(obj)))
+
+    raise IRCacheError("Unable to encode object of type %s." % cls.__name__)
+
+def _decode(data):
+    "Decode data created by _encode."
+    if isinstance(data, list):
+        return [_decode(d) for d in data]
+    elif not isinstance(data, tuple):
+        return data
+
+    tag = data[0]
+    if tag == "T":
+        return tuple(_decode(d) for d in data[1])
+    elif tag == "D":
+        return dict((_decode(k), _decode(v)) for (k, v) in data[1])
+    elif tag == "F":
+        return frozenset(_decode(d) for d in data[1])
+    elif tag == "S":
+        return set(_decode(d) for d in data[1])
+    elif tag == "A":
+        dtype, shape, buf = data[1:]
+        return numpy.frombuffer(buf, dtype=dtype).reshape(shape).copy()
+    elif tag == "O":
+        shape, items = data[1:]
+        array = numpy.empty(len(items), dtype=object)
+        array[:] = [_decode(d) for d in items]
+        return array.reshape(shape)
+    elif tag == "U":
+        return _decode_ufl(data[1], data[2], data[3], data[4])
+    elif tag == "E":
+        return _decode_symbolic(data[1], data[2:])
+    elif tag == "C":
+        return _decode_tensor(data[1], data[2], data[3])
+
+    raise IRCacheError("Unknown tag in cached IR: %s" % str(tag))
+
+def _ufl_arguments(obj):
+    "Return constructor arguments (list and dict) of UFL cell or element."
+    name = obj.__class__.__name__
+    if name not in _ufl_classes:
+        raise IRCacheError("Unable to encode UFL object %s." % repr(obj))
+
+    if name == "Cell":
+        return [obj.cellname(), obj.geometric_dimension()], {}
+    elif name == "TensorProductCell":
+        return list(obj.sub_cells()), {"geometric_dimension": obj.geometric_dimension()}
+    elif name == "FiniteElement":
+        # The degree is an int subclass on quadrilaterals, which is
+        # recreated by the constructor
+        degree = obj.degree()
+        if isinstance(degree, six.integer_types):
+            degree = int(degree)
+        kwargs = {}
+        if obj.quadrature_scheme() is not None:
+            kwargs["quad_scheme"] = obj.quadrature_scheme()
+        if obj.variant() is not None:
+            kwargs["variant"] = obj.variant()
+        return [obj.family(), obj.cell(), degree], kwargs
+    elif name == "VectorElement":
+        return [obj._sub_element], {"dim": obj.num_sub_elements()}
+    elif name == "TensorElement":
+        return [obj._sub_element], {"shape": obj._shape, "symmetry": obj.symmetry()}
+    elif name == "MixedElement":
+        return list(obj.sub_elements()), {}
+    elif name in ("EnrichedElement", "NodalEnrichedElement"):
+        return list(obj._elements), {}
+    elif name == "RestrictedElement":
+        return [obj.sub_element(), obj.restriction_domain()], {}
+    elif name in ("HDivElement", "HCurlElement", "BrokenElement"):
+        return [obj._element], {}
+    elif name == "TensorProductElement":
+        return list(obj.sub_elements()), {"cell": obj.cell()}
+
+def _decode_ufl(name, args, kwargs, r):
+    "Reconstruct UFL cell or element through its constructor."
+    if name not in _ufl_classes:
+        raise IRCacheError("Unknown UFL class in cached IR: %s" % str(name))
+    cls = getattr(ufl.classes, name)
+    kwargs = dict((str(k), v) for (k, v) in _decode(kwargs).items())
+    obj = cls(*_decode(args), **kwargs)
+
+    # Check that the object is the same as the one stored
+    if repr(obj) != r:
+        raise IRCacheError("Unable to reconstruct UFL object %s." % r)
+    return obj
+
+def _decode_symbolic(kind, args):
+    "Reconstruct symbolic expression through the cached constructors."
+    from ffc.quadrature.symbolics import create_float, create_symbol, \
+        create_product, create_sum, create_fraction, create_funcall
+    if kind == "float":
+        return create_float(args[0])
+    elif kind == "symbol":
+        v, t, base_expr, base_op, loop_index, ide = args
+        return create_symbol(v, t, _decode(base_expr), base_op,
+                             loop_index=_decode(loop_index), iden=_decode(ide))
+    elif kind == "product":
+        return create_product(_decode(args[0]))
+    elif kind == "sum":
+        return create_sum(_decode(args[0]))
+    elif kind == "fraction":
+        num, denom = _decode(args[0]), _decode(args[1])
+        # The denominator is dropped for constant or zero fractions
+        if denom is None:
+            denom = create_float(1)
+        return create_fraction(num, denom)
+    elif kind == "funcall":
+        return create_funcall(args[0], _decode(args[1]))
+
+    raise IRCacheError("Unknown symbolic expression in cached IR: %s" % str(kind))
+
+def _decode_tensor(module, name, attributes):
+    "Reconstruct object of the tensor representation from its attributes."
+    if name not in _tensor_classes.get(module, ()):
+        raise IRCacheError("Unknown class in cached IR: %s.%s" % (module, name))
+    cls = getattr(importlib.import_module(module), name)
+
+    # Create instance without calling the constructor
+    if six.PY2 and isinstance(cls, types.ClassType):
+        obj = types.InstanceType(cls)
+    else:
+        obj = cls.__new__(cls)
+    obj.__dict__.update(_decode(attributes))
+
+    return obj
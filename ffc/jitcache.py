@@ -0,0 +1,221 @@
+"""This module provides tools for managing the cache of modules built
+by the just-in-time compiler, such as populating the cache ahead of
+time from a directory of form files and keeping the size of the cache
+bounded.
+
+For each module built by FFC, metadata (size and build time) is kept
+in a small file in a separate directory of the cache. The last access
+time of a module is the modification time of its metadata file, which
+is updated whenever the module is loaded from the cache, so that the
+least recently used modules can be evicted when the cache grows too
+large."""
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+# Python modules
+import os
+import glob
+import json
+import shutil
+import multiprocessing
+from time import time
+
+# UFL modules
+from ufl.algorithms import load_ufl_file
+
+# FFC modules
+from ffc.log import info, warning, debug
+
+__all__ = ["module_in_cache", "warm_cache", "record_access", "record_build",
+           "cache_stats", "prune_cache"]
+
+# Name of directory (inside the cache directory) holding metadata
+_metadata_dirname = ".ffc_metadata"
+
+def module_in_cache(module_name, cache_dir=None):
+    "Check whether the module with given name is in the Instant cache."
+    import instant
+    cache_dir = instant.validate_cache_dir(cache_dir or None)
+    return os.path.exists(os.path.join(cache_dir, module_name, "finished_copying"))
+
+def warm_cache(directory, parameters=None, num_processes=None):
+    """Build JIT modules for all forms and elements in all .ufl files in
+    the given directory which are not already in the cache.
+
+    The modules are named as jit_form and jit_element would name them
+    for the same parameters. Missing modules are built in parallel
+    using the given number of processes (default: one per CPU).
+
+    Returns a list of (filename, kind, number, module name, status,
+    build time) tuples, where kind is "form" or "element" and status
+    is one of "hit", "built" or "failed"."""
+
+    from ffc.jitcompiler import _check_parameters
+    from ffc.jitcompiler import form_module_name, element_module_name
+
+    # Use the same parameters as jit_form
+    parameters = _check_parameters(None, parameters)
+    cache_dir = parameters["cache_dir"] or None
+
+    # Compute signatures of all forms and elements and look them up in
+    # the cache
+    results = []
+    missing = []
+    for filename in sorted(glob.glob(os.path.join(directory, "*.ufl"))):
+        ufd = load_ufl_file(filename)
+        objects = [("form", i, form_module_name(form, parameters))
+                   for (i, form) in enumerate(ufd.forms)]
+        objects += [("element", i, element_module_name(element, parameters))
+                    for (i, element) in enumerate(ufd.elements)]
+        for (kind, i, module_name) in objects:
+            if module_in_cache(module_name, cache_dir):
+                results.append((filename, kind, i, module_name, "hit", 0.0))
+            else:
+                missing.append((filename, kind, i, module_name, parameters))
+
+    info("Found %d cached and %d missing modules." % (len(results), len(missing)))
+
+    # Build missing modules in parallel
+    if missing:
+        pool = multiprocessing.Pool(num_processes)
+        try:
+            results += pool.map(_build_module, missing)
+        finally:
+            pool.close()
+            pool.join()
+
+    return results
+
+def _build_module(args):
+    "Build module for a form or element in a form file (run in worker process)."
+    from ffc.jitcompiler import _import_or_build_module
+    from ffc.compiler import compile_form, compile_elements
+    filename, kind, i, module_name, parameters = args
+
+    # Forms and elements are loaded again in each worker since they
+    # cannot be passed
+    ufd = load_ufl_file(filename)
+    if kind == "form":
+        ufl_object = ufd.forms[i]
+        compile_function = compile_form
+    else:
+        ufl_object = ufd.elements[i]
+        compile_function = compile_elements
+
+    cpu_time = time()
+    try:
+        _import_or_build_module(ufl_object, module_name, parameters,
+                                compile_function=compile_function)
+        status = "built"
+    except Exception as exception:
+        warning("Failed to build module for %s %d in %s: %s"
+                % (kind, i, filename, str(exception)))
+        status = "failed"
+
+    return (filename, kind, i, module_name, status, time() - cpu_time)
+
+def record_access(module_name, cache_dir=None):
+    "Record that the module has been loaded from the cache."
+    filename = _metadata_filename(module_name, cache_dir)
+    try:
+        os.utime(filename, None)
+    except OSError:
+        # Module not built by FFC (or metadata removed), create metadata
+        record_build(module_name, cache_dir, None)
+
+def record_build(module_name, cache_dir=None, build_time=None):
+    "Record size and build time of a module which has been built."
+    import instant
+    cache_dir = instant.validate_cache_dir(cache_dir or None)
+    metadata = {"size": _directory_size(os.path.join(cache_dir, module_name)),
+                "build_time": build_time}
+    filename = _metadata_filename(module_name, cache_dir)
+    if not os.path.isdir(os.path.dirname(filename)):
+        instant.makedirs(os.path.dirname(filename))
+    with open(filename, "w") as f:
+        json.dump(metadata, f)
+
+def cache_stats(cache_dir=None):
+    """Return list of dictionaries with the name, size (in bytes), last
+    access time and build time (if known) of all modules in the cache,
+    sorted from least to most recently used."""
+    import instant
+    cache_dir = instant.validate_cache_dir(cache_dir or None)
+    entries = []
+    for module_name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, module_name)
+        if module_name == _metadata_dirname or not os.path.isdir(path):
+            continue
+        filename = _metadata_filename(module_name, cache_dir)
+        try:
+            with open(filename) as f:
+                metadata = json.load(f)
+            last_access = os.path.getmtime(filename)
+        except (IOError, OSError, ValueError):
+            # Module not built by FFC, use data from file system
+            metadata = {"size": _directory_size(path), "build_time": None}
+            last_access = os.path.getmtime(path)
+        entries.append({"module_name": module_name,
+                        "size": metadata["size"],
+                        "last_access": last_access,
+                        "build_time": metadata["build_time"]})
+    entries.sort(key=lambda entry: entry["last_access"])
+    return entries
+
+def prune_cache(cache_dir=None, max_size=0):
+    """Remove least recently used modules from the cache until the
+    total size is at most max_size (in megabytes). Returns the list of
+    names of removed modules."""
+    import instant
+    cache_dir = instant.validate_cache_dir(cache_dir or None)
+    entries = cache_stats(cache_dir)
+    total_size = sum(entry["size"] for entry in entries)
+    max_bytes = max_size*1024*1024
+
+    removed = []
+    for entry in entries:
+        if total_size <= max_bytes:
+            break
+        module_name = entry["module_name"]
+
+        # Use the same lock as the JIT compiler to avoid removing a
+        # module while it is being built
+        with instant.file_lock(instant.get_default_cache_dir(), module_name + "_0"):
+            shutil.rmtree(os.path.join(cache_dir, module_name), ignore_errors=True)
+            filename = _metadata_filename(module_name, cache_dir)
+            if os.path.isfile(filename):
+                os.unlink(filename)
+
+        debug("Removed module %s from cache." % module_name)
+        total_size -= entry["size"]
+        removed.append(module_name)
+
+    return removed
+
+def _metadata_filename(module_name, cache_dir):
+    import instant
+    cache_dir = instant.validate_cache_dir(cache_dir or None)
+    return os.path.join(cache_dir, _metadata_dirname, module_name + ".json")
+
+def _directory_size(path):
+    "Return total size (in bytes) of files in directory."
+    size = 0
+    for (dirpath, dirnames, filenames) in os.walk(path):
+        for filename in filenames:
+            filename = os.path.join(dirpath, filename)
+            if not os.path.islink(filename):
+                size += os.path.getsize(filename)
+    return size
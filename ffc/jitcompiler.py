@@ -26,12 +26,16 @@ It uses Instant to wrap the generated code into a Python module."""
 
 # Python modules
 import os, sys
-import instant
+import functools
+import threading
+import multiprocessing
+from time import time
+from hashlib import sha1
 
 # UFL modules
-from ufl import TestFunction, ds, dx
 from ufl.classes import Form, FiniteElementBase
 from ufl.algorithms import extract_elements, extract_sub_elements, compute_form_data
+from ufl.algorithms import sort_elements
 
 # FFC modules
 from ffc.log import log
@@ -43,17 +47,54 @@ from ffc.log import set_level
 from ffc.log import set_prefix
 from ffc.log import INFO
 from ffc.parameters import default_parameters
-from ffc.mixedelement import MixedElement
-from ffc.compiler import compile_form
-from ffc.jitobject import JITObject
-from ffc.quadratureelement import default_quadrature_degree
+from ffc.jitobject import JITObject, _parameters_signature
+from ffc.jitobject import _ffc_signature, _ufc_signature
+from ffc.utils import LRUCache
+from ffc.jitcache import record_access, record_build, prune_cache
 
 # Special Options for JIT-compilation
 FFC_PARAMETERS_JIT = default_parameters()
 FFC_PARAMETERS_JIT["no-evaluate_basis_derivatives"] = True
 
-# Set debug level for Instant
-instant.set_log_level("warning")
+# In-memory caches of compiled modules for jit_form, jit_forms and
+# jit_element, keyed by module name (i.e., by signature)
+_jit_form_cache = LRUCache(maxsize=256)
+_jit_forms_cache = LRUCache(maxsize=256)
+_jit_element_cache = LRUCache(maxsize=256)
+
+# Module names of recently compiled form objects, keyed by id of the
+# form and parameters signature. The form is stored with the name, which
+# keeps the id valid, such that the signature of a form which is
+# compiled again is not recomputed. (UFL forms are not weakly
+# referenceable.)
+_form_module_names = LRUCache(maxsize=256)
+
+# Lock serialising the JIT compiler between threads (see _synchronized)
+_jit_lock = threading.RLock()
+
+def _synchronized(function):
+    """Decorator serialising calls to function between threads, since
+    the JIT compiler sets global log state and Instant changes the
+    working directory."""
+    @functools.wraps(function)
+    def synchronized_function(*args, **kwargs):
+        with _jit_lock:
+            return function(*args, **kwargs)
+    return synchronized_function
+
+# Instant module, imported on first use (see _instant)
+_instant_module = None
+
+def _instant():
+    """Return the Instant module. Instant (and the compiler modules)
+    are imported on first use to keep import ffc fast."""
+    global _instant_module
+    if _instant_module is None:
+        import instant
+        # Set debug level for Instant
+        instant.set_log_level("warning")
+        _instant_module = instant
+    return _instant_module
 
 def jit(ufl_object, parameters=None):
     """Just-in-time compile the given form or element
@@ -80,9 +121,9 @@ def check_swig_version(compiled_module):
               "version: '%s' != '%s' " % \
               (ufc.__swigversion__, compiled_module.swigversion))
 
+@_synchronized
 def jit_form(form, parameters=None):
     "Just-in-time compile the given form."
-    from ffc.backends.ufc import build_ufc_module
 
     # Check that we get a Form
     if not isinstance(form, Form):
@@ -95,90 +136,304 @@ def jit_form(form, parameters=None):
     set_level(parameters["log_level"])
     set_prefix(parameters["log_prefix"])
 
-    # Wrap input
-    jit_object = JITObject(form, parameters)
-
     # Set prefix for generated code
-    module_name = "ffc_form_" + jit_object.signature()
+    module_name = form_module_name(form, parameters)
 
-    # Use Instant cache if possible
-    cache_dir = parameters["cache_dir"] or None
-    module = instant.import_module(module_name, cache_dir=cache_dir)
-    if module:
-        debug("Reusing form from cache.")
-    else:
-        # Take lock to serialise file removal.
-        # Need to add "_0" to lock as instant.import_module acquire
-        # lock with name: module_name
-        with instant.file_lock(instant.get_default_cache_dir(),
-                               module_name + "_0") as lock:
-
-            # Retry Instant cache. The module may have been created while we waited
-            # for the lock, even if it didn't exist before.
-            module = instant.import_module(module_name, cache_dir=cache_dir)
-            if module:
-                debug("Reusing form from cache.")
-            else:
-                # Write a message
-                log(INFO + 5,
-                    "Calling FFC just-in-time (JIT) compiler, this may take some time.")
-
-                # Generate code
-                compile_form(form,
-                             prefix=module_name,
-                             parameters=parameters)
-
-                # Build module using Instant (through UFC)
-                debug("Compiling and linking Python extension module, this may take some time.")
-                hfile   = module_name + ".h"
-                cppfile = module_name + ".cpp"
-
-                if parameters["cpp_optimize"]:
-                    cppargs = parameters["cpp_optimize_flags"].split()
-                else:
-                    cppargs = ["-O0"]
-
-                module = build_ufc_module(
-                    hfile,
-                    source_directory = os.curdir,
-                    signature = module_name,
-                    sources = [cppfile] if parameters["split"] else [],
-                    cppargs = cppargs,
-                    cache_dir = cache_dir)
-
-                # Remove code
-                if os.path.isfile(hfile):
-                    os.unlink(hfile)
-                if parameters["split"] :
-                    if os.path.isfile(cppfile):
-                        os.unlink(cppfile)
+    # Look for form in in-memory cache, or get module from Instant
+    # cache or build it
+    module = _jit_form_cache.get(module_name)
+    if module is None:
+        module = _import_or_build_module(form, module_name, parameters)
+        check_swig_version(module)
+        _jit_form_cache[module_name] = module
 
     # Construct instance of compiled form
-    check_swig_version(module)
     prefix = module_name
     compiled_form = _instantiate_form(module, prefix)
     return compiled_form, module, prefix
 
-def jit_element(element, parameters=None):
-    "Just-in-time compile the given element"
+def form_module_name(form, parameters):
+    "Return name of JIT module for given form and (checked) parameters."
+    key = (id(form), _parameters_signature(parameters))
+    cached = _form_module_names.get(key)
+    if cached is not None:
+        return cached[1]
+    module_name = "ffc_form_" + JITObject(form, parameters).signature()
+    _form_module_names[key] = (form, module_name)
+    return module_name
+
+@_synchronized
+def jit_forms(forms, parameters=None):
+    """Just-in-time compile the given list of forms into a single
+    extension module. Returns the list of compiled forms (in the
+    order of the given forms), the module and the prefix."""
+
+    # Check that we get a list of Forms
+    forms = list(forms)
+    if not forms:
+        error("Expecting a nonempty list of forms.")
+    for form in forms:
+        if not isinstance(form, Form):
+            error("Unable to convert object to a UFL form: %s" % repr(form))
+
+    # Check parameters
+    parameters = _check_parameters(forms[0], parameters)
+
+    # Set log level
+    set_level(parameters["log_level"])
+    set_prefix(parameters["log_prefix"])
 
-    # FIXME: We need a new solution for this.
+    # Combine signatures of all forms, the order matters since form
+    # classes are numbered in the order of the forms
+    signatures = [JITObject(form, parameters).signature() for form in forms]
+    signature = sha1(";".join(signatures).encode('utf-8')).hexdigest()
+
+    # Set prefix for generated code
+    module_name = "ffc_forms_" + signature
+
+    # Look for forms in in-memory cache, or get module from Instant
+    # cache or build it
+    module = _jit_forms_cache.get(module_name)
+    if module is None:
+        module = _import_or_build_module(forms, module_name, parameters)
+        check_swig_version(module)
+        _jit_forms_cache[module_name] = module
+
+    # Construct instances of compiled forms
+    prefix = module_name
+    compiled_forms = [_instantiate_form(module, prefix, form_id)
+                      for form_id in range(len(forms))]
+    return compiled_forms, module, prefix
+
+def jit_form_async(form, parameters=None):
+    """Start just-in-time compilation of the given form in the
+    background and return a future for the result of jit_form.
+
+    Code generation and the C++ build run in a separate process, at
+    most one per CPU at a time. The module is then imported by a
+    thread of this process. Concurrent requests for forms with the
+    same signature share a single future. Requires concurrent.futures
+    (available as the 'futures' package for Python 2).
+
+    The child processes import the main module (Python 3.4 or later),
+    so scripts should guard their main code by if __name__ == "__main__"
+    as for multiprocessing."""
+
+    # Check that we get a Form
+    if not isinstance(form, Form):
+        error("Unable to convert object to a UFL form: %s" % repr(form))
+
+    # Check parameters
+    parameters = _check_parameters(form, parameters)
+
+    # Set prefix for generated code
+    module_name = form_module_name(form, parameters)
+
+    # Share future with concurrent requests for the same signature
+    with _async_lock:
+        future = _async_futures.get(module_name)
+        if future is None:
+            executor = _get_async_executor()
+            future = executor.submit(_jit_form_task, form, module_name, parameters)
+            future.add_done_callback(_discard_future(module_name))
+            _async_futures[module_name] = future
+
+    return future
+
+# Executor and futures (of unfinished compilations) for asynchronous
+# JIT compilation
+_async_executor = None
+_async_futures = {}
+_async_lock = threading.Lock()
+
+def _get_async_executor():
+    "Return executor for asynchronous JIT compilation, creating it if needed."
+    global _async_executor
+    if _async_executor is None:
+        try:
+            from concurrent.futures import ThreadPoolExecutor
+        except ImportError:
+            raise ImportError("jit_form_async depends on concurrent.futures, which is not available.")
+        _async_executor = ThreadPoolExecutor(max_workers=multiprocessing.cpu_count())
+    return _async_executor
+
+def _discard_future(module_name):
+    """Return callback removing a finished future. Later requests then
+    find the module in the in-memory cache, or retry the compilation if
+    it failed or was cancelled."""
+    def callback(future):
+        with _async_lock:
+            if _async_futures.get(module_name) is future:
+                del _async_futures[module_name]
+        if not future.cancelled() and future.exception() is not None:
+            debug("Just-in-time compilation of %s failed: %s"
+                  % (module_name, str(future.exception())))
+    return callback
+
+def _jit_form_task(form, module_name, parameters):
+    "Build module in a child process, then import it in this process."
+
+    # Build in a child process, since both code generation and Instant
+    # (which changes the working directory) rely on global state. The
+    # child is not forked from this thread, which may copy locks held by
+    # other threads, if the start method can be chosen (Python 3.4).
+    if hasattr(multiprocessing, "get_context"):
+        methods = multiprocessing.get_all_start_methods()
+        method = "forkserver" if "forkserver" in methods else "spawn"
+        process_class = multiprocessing.get_context(method).Process
+    else:
+        process_class = multiprocessing.Process
+    process = process_class(target=_build_module_in_child,
+                            args=(form, module_name, parameters))
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        error("Just-in-time compilation of %s failed (exit code %s)."
+              % (module_name, str(process.exitcode)))
+
+    # The module is now in the Instant cache. Import it, waiting for
+    # other threads using the JIT compiler.
+    return jit_form(form, parameters)
+
+def _build_module_in_child(form, module_name, parameters):
+    "Generate code and build module (run in child process)."
+    _import_or_build_module(form, module_name, parameters)
+
+def _import_or_build_module(forms, module_name, parameters,
+                            compile_function=None):
+    """Import module from Instant cache, or generate code (using the
+    given compile function, compile_form by default) and build it."""
+    from ffc.backends.ufc import build_ufc_module
+    instant = _instant()
+
+    # Use Instant cache if possible
+    cache_dir = parameters["cache_dir"] or None
+    module = instant.import_module(module_name, cache_dir=cache_dir)
+    if module:
+        debug("Reusing form from cache.")
+        record_access(module_name, cache_dir)
+        return module
+
+    # Take lock to serialise file removal.
+    # Need to add "_0" to lock as instant.import_module acquire
+    # lock with name: module_name
+    with instant.file_lock(instant.get_default_cache_dir(),
+                           module_name + "_0") as lock:
+
+        # Retry Instant cache. The module may have been created while we waited
+        # for the lock, even if it didn't exist before.
+        module = instant.import_module(module_name, cache_dir=cache_dir)
+        if module:
+            debug("Reusing form from cache.")
+            record_access(module_name, cache_dir)
+            return module
+
+        # Write a message
+        log(INFO + 5,
+            "Calling FFC just-in-time (JIT) compiler, this may take some time.")
+        cpu_time = time()
+
+        # Generate code
+        if compile_function is None:
+            from ffc.compiler import compile_form as compile_function
+        filenames = []
+        compile_function(forms,
+                         prefix=module_name,
+                         parameters=parameters,
+                         filenames=filenames)
+
+        # Build module using Instant (through UFC) from the files just
+        # written to the current directory
+        debug("Compiling and linking Python extension module, this may take some time.")
+        hfile = module_name + ".h"
+        cppfiles = [os.path.basename(filename) for filename in filenames]
+
+        if parameters["cpp_optimize"]:
+            cppargs = parameters["cpp_optimize_flags"].split()
+        else:
+            cppargs = ["-O0"]
+
+        module = build_ufc_module(
+            hfile,
+            source_directory = os.curdir,
+            signature = module_name,
+            sources = cppfiles,
+            cppargs = cppargs,
+            cache_dir = cache_dir,
+            num_processes = int(parameters["cpp_num_processes"]))
+
+        # Remove code
+        for filename in [hfile] + cppfiles:
+            if os.path.isfile(filename):
+                os.unlink(filename)
+
+        # Store metadata used for evicting modules from the cache
+        record_build(module_name, cache_dir, time() - cpu_time)
+
+    # Keep size of cache bounded (outside lock on this module)
+    max_size = float(parameters["cache_max_size"])
+    if max_size > 0:
+        prune_cache(cache_dir, max_size)
+
+    return module
+
+def jit_cache_info():
+    """Return statistics of the in-memory caches of compiled modules of
+    jit_form, jit_forms and jit_element."""
+    return {"form": _jit_form_cache.info(),
+            "forms": _jit_forms_cache.info(),
+            "element": _jit_element_cache.info()}
+
+def clear_jit_cache():
+    "Clear the in-memory caches of compiled modules."
+    _jit_form_cache.clear()
+    _jit_forms_cache.clear()
+    _jit_element_cache.clear()
+    _form_module_names.clear()
+
+@_synchronized
+def jit_element(element, parameters=None):
+    """Just-in-time compile the given element. Only code for the
+    element, its sub elements and their dofmaps is generated. Returns
+    the compiled finite element and dofmap."""
 
     # Check that we get an element
     if not isinstance(element, FiniteElementBase):
         error("Expecting a finite element.")
 
-    # Create simplest possible dummy form
-    v = TestFunction(element)
-    ii = (0,)*len(v.ufl_shape)
-    if element.family() == "Discontinuous Lagrange Trace":
-        form = v[ii]*ds
-    else:
-        form = v[ii]*dx
+    # Check parameters
+    parameters = _check_parameters(element, parameters)
+
+    # Set log level
+    set_level(parameters["log_level"])
+    set_prefix(parameters["log_prefix"])
+
+    # Set prefix for generated code
+    module_name = element_module_name(element, parameters)
+
+    # Look for element in in-memory cache, or get module from Instant
+    # cache or build it
+    module = _jit_element_cache.get(module_name)
+    if module is None:
+        from ffc.compiler import compile_elements
+        module = _import_or_build_module(element, module_name, parameters,
+                                         compile_function=compile_elements)
+        check_swig_version(module)
+        _jit_element_cache[module_name] = module
+    prefix = module_name
+
+    # Elements are numbered as in analyze_elements
+    element_id = sort_elements(set(extract_sub_elements([element]))).index(element)
+    return _instantiate_element_and_dofmap(module, prefix, element_id)
 
-    # Compile form
-    compiled_form, module, prefix = jit_form(form, parameters)
-    return _instantiate_element_and_dofmap(module, prefix)
+def element_module_name(element, parameters):
+    "Return name of JIT module for given element and (checked) parameters."
+    signatures = [repr(element),
+                  _parameters_signature(parameters),
+                  _ffc_signature,
+                  _ufc_signature()]
+    string = ";".join(signatures)
+    return "ffc_element_" + sha1(string.encode('utf-8')).hexdigest()
 
 def _check_parameters(form, parameters):
     "Check parameters and add any missing parameters"
@@ -203,16 +458,15 @@ def _check_parameters(form, parameters):
 
     return parameters
 
-from ffc.cpp import make_classname
-def _instantiate_form(module, prefix):
-    "Extract the form from module with only one form."
-    form_id = 0
+def _instantiate_form(module, prefix, form_id=0):
+    "Extract the form with given number from module."
+    from ffc.cpp import make_classname
     classname = make_classname(prefix, "form", form_id)
     return getattr(module, classname)()
 
-def _instantiate_element_and_dofmap(module, prefix):
-    """Extract element and dofmap from module."""
-    form = _instantiate_form(module, prefix)
-    fe = form.create_finite_element(0)
-    dm = form.create_dofmap(0)
+def _instantiate_element_and_dofmap(module, prefix, element_id=0):
+    """Extract element and dofmap with given number from module."""
+    from ffc.cpp import make_classname
+    fe = getattr(module, make_classname(prefix, "finite_element", element_id))()
+    dm = getattr(module, make_classname(prefix, "dofmap", element_id))()
     return (fe, dm)
@@ -19,6 +19,7 @@
 
 # Python modules.
 from hashlib import sha1
+from time import time
 
 # UFL modules.
 import ufl
@@ -27,6 +28,8 @@ from ufl.utils.sorting import canonicalize_metadata
 # FFC modules.
 from ffc import __version__ as FFC_VERSION
 from ffc.parameters import compilation_relevant_parameters
+from ffc.log import debug
+from ffc.utils import LRUCache
 
 class JITObject:
     """This class is a wrapper for a compiled object in the context of
@@ -44,6 +47,7 @@ class JITObject:
         self.parameters = parameters
         self._hash = None
         self._signature = None
+        self.signature_timings = None
 
     def __hash__(self):
         "Return unique integer for form + parameters"
@@ -65,38 +69,74 @@ class JITObject:
             return self._signature
 
         # Get signature from form
+        t0 = time()
         form_signature = self.form.signature()
+        t1 = time()
 
         # Compute other relevant signatures
         parameters_signature = _parameters_signature(self.parameters)
-        ffc_signature = str(FFC_VERSION)
-
-        # Compute signature of all ufc headers combined
-        from ffc.backends import ufc
-        ufc_signature = sha1(''.join(getattr(ufc, header)
-                                     for header in
-                                     (k for k in sorted(vars(ufc).keys())
-                                      if k.endswith("_header"))).encode('utf-8')
-                                      ).hexdigest()
+        t2 = time()
 
         # Build common signature
         signatures = [form_signature,
                       parameters_signature,
-                      ffc_signature,
-                      ufc_signature]
+                      _ffc_signature,
+                      _ufc_signature()]
         string = ";".join(signatures)
 
         self._signature = sha1(string.encode('utf-8')).hexdigest()
+        t3 = time()
+
+        # Store timings of signature computation
+        self.signature_timings = {"form": t1 - t0,
+                                  "parameters": t2 - t1,
+                                  "total": t3 - t0}
+        debug("Computed JIT signature in %g seconds (form: %g, parameters: %g)."
+              % (t3 - t0, t1 - t0, t2 - t1))
 
         # Uncomment for debugging
         #print "form_signature       =", form_signature
         #print "parameters_signature =", parameters_signature
-        #print "ffc_signature        =", ffc_signature
+        #print "ffc_signature        =", _ffc_signature
         #print "signature            =", self._signature
 
         return self._signature
 
+# Signature of FFC version
+_ffc_signature = str(FFC_VERSION)
+
+# Signature of all ufc headers combined (computed once)
+_ufc_signature_value = None
+
+def _ufc_signature():
+    "Return signature of all ufc headers combined (computed once)."
+    global _ufc_signature_value
+    if _ufc_signature_value is None:
+        from ffc.backends import ufc
+        _ufc_signature_value = sha1(''.join(getattr(ufc, header)
+                                            for header in
+                                            (k for k in sorted(vars(ufc).keys())
+                                             if k.endswith("_header"))).encode('utf-8')
+                                    ).hexdigest()
+    return _ufc_signature_value
+
+# Parameters signatures for recently used parameter values
+_parameters_signatures = LRUCache(maxsize=128)
+
 def _parameters_signature(parameters):
     "Return parameters signature (some parameters must be ignored)."
     parameters = compilation_relevant_parameters(parameters)
-    return str(canonicalize_metadata(parameters))
+
+    # Parameters are usually the same for all forms, so remember the
+    # signature for each distinct set of (hashable) parameter values
+    try:
+        key = frozenset(parameters.items())
+        hash(key)
+    except TypeError:
+        key = None
+    signature = _parameters_signatures.get(key) if key is not None else None
+    if signature is None:
+        signature = str(canonicalize_metadata(parameters))
+        if key is not None:
+            _parameters_signatures[key] = signature
+    return signature
@@ -31,6 +31,7 @@ representation.
 # FFC modules
 from ffc.log import info, begin, end
 from ffc.representation import pick_representation
+from ffc.profiling import profiled
 
 def optimize_ir(ir, parameters):
     "Optimize intermediate form representation."
@@ -53,6 +54,7 @@ def optimize_ir(ir, parameters):
 
     return ir_elements, ir_dofmaps, ir_coordinate_mappings, oir_integrals, ir_forms
 
+@profiled(lambda ir, parameters: ir["classname"])
 def _optimize_integral_ir(ir, parameters):
     "Compute optimized intermediate represention of integral."
 
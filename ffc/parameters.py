@@ -31,16 +31,39 @@ FFC_PARAMETERS = {
                                              # dropping zero terms
   "split":                          False,   # split generated code into .h and
                                              # .cpp file
+  "split_classes":                  False,   # with split, write one .cpp file
+                                             # for each class
   "form_postfix":                   True,    # postfix form name with "Function",
                                              # "LinearForm" or BilinearForm
   "convert_exceptions_to_warnings": False,   # convert all exceptions to warning
                                              # in generated code
   "cache_dir":                      "",      # cache dir used by Instant
+  "cache_max_size":                 0,       # max size of cache dir in MB,
+                                             # evicting least recently used
+                                             # modules (unbounded if 0)
+  "ir_cache_dir":                   "",      # cache dir for intermediate
+                                             # representations (disabled if empty)
+  "tabulation_cache_dir":           "",      # cache dir for tables of basis
+                                             # functions tabulated by FIAT
+                                             # (in memory only if empty)
+  "reference_tensor_cache_dir":     "",      # cache dir for reference tensors
+                                             # of tensor representation (in
+                                             # memory only if empty)
+  "profile_file":                   "",      # file to which a profile of the
+                                             # compilation is written in JSON
+                                             # format (disabled if empty)
   "output_dir":                     ".",     # output directory for generated
                                              # code
   "cpp_optimize":                   True,    # optimization for the JIT compiler
   "cpp_optimize_flags":             "-O2",   # optimization flags for the JIT compiler
+  "cpp_num_processes":              0,       # number of C++ compiler processes
+                                             # run in parallel by the JIT compiler
+                                             # (one per CPU if 0)
   "optimize":                       False,   # optimise the code generation
+  "ir_num_processes":               1,       # number of processes used for
+                                             # computing and optimising
+                                             # intermediate representations
+                                             # (one per CPU if 0)
   "log_level":                      INFO,    # log level, displaying only
                                              # messages with level >= log_level
   "log_prefix":                     "",      # log prefix
@@ -62,7 +85,11 @@ def default_parameters():
 
 def compilation_relevant_parameters(parameters):
     parameters = parameters.copy()
-    ignores = ["log_prefix", "log_level", "cache_dir", "output_dir"]
+    ignores = ["log_prefix", "log_level", "cache_dir", "cache_max_size",
+               "ir_cache_dir", "tabulation_cache_dir",
+               "reference_tensor_cache_dir",
+               "output_dir", "cpp_num_processes", "ir_num_processes",
+               "profile_file"]
     for ignore in ignores:
         assert ignore in FFC_PARAMETERS
         if ignore in parameters:
@@ -0,0 +1,243 @@
+"""This module provides a simple hierarchical profiler for the
+compiler. When a profiler is active, the compiler records the wall
+time, the CPU time and (when available) the peak memory allocated by
+Python for each stage and, within the stages, for each element,
+dofmap and integral and for the most expensive code generators.
+
+Example:
+
+  with Profiler() as profiler:
+      compile_form(forms, parameters=parameters)
+  print(profiler)
+  profiler.dump("profile.json")
+
+Profiling may also be turned on by setting the parameter profile_file
+to the name of a JSON file to which the profile of each compilation
+is written. Sections run in worker processes (see the parameter
+ir_num_processes) are not recorded.
+
+Peak memory is measured using tracemalloc, which requires Python 3.9
+or later (for resetting the peak between sections). Otherwise only
+times are recorded.
+"""
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+# Python modules
+import os
+import json
+import functools
+from time import time
+
+try:
+    import tracemalloc
+    if not hasattr(tracemalloc, "reset_peak"):
+        tracemalloc = None
+except ImportError:
+    tracemalloc = None
+
+__all__ = ["Profiler", "ProfileNode", "profile_section", "profiled",
+           "active_profiler"]
+
+# Currently active profiler (None if profiling is turned off)
+_active_profiler = None
+
+def active_profiler():
+    "Return the active profiler, or None if profiling is turned off."
+    return _active_profiler
+
+def profile_section(name):
+    """Return context manager recording a section with the given name
+    in the active profiler. Does nothing if profiling is turned off."""
+    if _active_profiler is None:
+        return _null_section
+    return _Section(_active_profiler, name)
+
+def profiled(name):
+    """Decorator recording each call of a function as a section in the
+    active profiler. The name of the section is either given as a
+    string or computed from the arguments of the function (if name is
+    callable)."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _active_profiler is None:
+                return function(*args, **kwargs)
+            section = name(*args, **kwargs) if callable(name) else name
+            with _Section(_active_profiler, section):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+class ProfileNode(object):
+    """A profiled section, with wall time and CPU time (in seconds),
+    peak memory (in bytes, None if not measured), number of calls and
+    subsections."""
+
+    def __init__(self, name):
+        self.name = name
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.peak_memory = None
+        self.calls = 0
+        self.children = []
+
+    def child(self, name):
+        "Return subsection with given name, creating it if needed."
+        for child in self.children:
+            if child.name == name:
+                return child
+        child = ProfileNode(name)
+        self.children.append(child)
+        return child
+
+    def find(self, name):
+        "Return list of all sections (including this) with given name."
+        nodes = [self] if self.name == name else []
+        for child in self.children:
+            nodes += child.find(name)
+        return nodes
+
+    def walk(self, path=()):
+        "Iterate over (path, section) for this section and all subsections."
+        path = path + (self.name,)
+        yield path, self
+        for child in self.children:
+            for item in child.walk(path):
+                yield item
+
+    def to_dict(self):
+        "Return profile as a dictionary (for conversion to JSON)."
+        return {"name": self.name,
+                "wall_time": self.wall_time,
+                "cpu_time": self.cpu_time,
+                "peak_memory": self.peak_memory,
+                "calls": self.calls,
+                "children": [child.to_dict() for child in self.children]}
+
+    def __str__(self):
+        lines = []
+        for path, node in self.walk():
+            memory = "" if node.peak_memory is None else \
+                     "%10.1f MB" % (node.peak_memory / (1024.0*1024.0))
+            lines.append("%-60s %10.4f s %10.4f s %s" % \
+                         ("  "*(len(path) - 1) + node.name, node.wall_time,
+                          node.cpu_time, memory))
+        return "\n".join(lines)
+
+class Profiler(object):
+    """Hierarchical profiler, recording the sections entered while it
+    is active (as a context manager)."""
+
+    def __init__(self, name="ffc"):
+        self.root = ProfileNode(name)
+        self._stack = []
+        self._previous = None
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        global _active_profiler
+        self._previous = _active_profiler
+        _active_profiler = self
+        if tracemalloc is not None and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._stack = [_Frame(self.root)]
+        return self
+
+    def __exit__(self, *args):
+        global _active_profiler
+        frame = self._stack.pop()
+        frame.stop()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        _active_profiler = self._previous
+
+    def dump(self, filename):
+        "Write profile to file in JSON format."
+        with open(filename, "w") as f:
+            json.dump(self.root.to_dict(), f, indent=1)
+
+    def __str__(self):
+        return str(self.root)
+
+class _Frame(object):
+    "Measurements for a section which has been entered."
+
+    def __init__(self, node):
+        self.node = node
+        self.wall_time = time()
+        self.cpu_time = _cpu_time()
+        if tracemalloc is not None and tracemalloc.is_tracing():
+            self.memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        else:
+            self.memory = None
+        self.peak = self.memory
+
+    def update_peak(self):
+        "Update peak memory of this section with the current peak."
+        if self.memory is not None and tracemalloc.is_tracing():
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+
+    def stop(self):
+        "Add measurements to the profiled section."
+        node = self.node
+        node.calls += 1
+        node.wall_time += time() - self.wall_time
+        node.cpu_time += _cpu_time() - self.cpu_time
+        self.update_peak()
+        if self.memory is not None:
+            peak = self.peak - self.memory
+            node.peak_memory = peak if node.peak_memory is None else max(node.peak_memory, peak)
+
+class _Section(object):
+    "Context manager for a profiled section."
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        stack = self.profiler._stack
+        parent = stack[-1]
+        # Save peak of parent, since the peak is reset for the section
+        parent.update_peak()
+        stack.append(_Frame(parent.node.child(self.name)))
+
+    def __exit__(self, *args):
+        stack = self.profiler._stack
+        frame = stack.pop()
+        frame.stop()
+        parent = stack[-1]
+        if parent.peak is not None and frame.peak is not None:
+            parent.peak = max(parent.peak, frame.peak)
+            tracemalloc.reset_peak()
+
+class _NullSection(object):
+    "Context manager doing nothing, used when profiling is turned off."
+    def __enter__(self):
+        pass
+    def __exit__(self, *args):
+        pass
+
+_null_section = _NullSection()
+
+def _cpu_time():
+    "Return CPU time (user + system) of this process."
+    t = os.times()
+    return t[0] + t[1]
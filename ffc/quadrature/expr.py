@@ -20,6 +20,9 @@
 # First added:  2009-08-08
 # Last changed: 2010-01-21
 
+# FFC modules.
+from ffc.log import error
+
 # FFC quadrature modules.
 from .symbolics import create_float
 
@@ -31,18 +34,36 @@ class Expr(object):
         val     - float, holds value of object.
         t       - Type (int), one of CONST, GEO, IP, BASIS.
         _prec   - int, precedence which is used for comparison and comparing classes.
-        _repr   - str, string value of __repr__(), we only compute it once.
-        _hash   - int, hash value of __hash__(), we only compute it once.
+        _repr   - str, string value of __repr__(), computed on first use,
+                  i.e., when the expression is printed or sorted.
+        _hash   - int, hash value of __hash__(), computed from the hash
+                  values of the members by the child classes.
 
         The constructor is empty, so initialisation of variables are left to
-        child classes."""
+        child classes.
+
+        The create_* functions of symbolics return one canonical object
+        for equal expressions, such that expressions are usually compared
+        by identity. Expressions created directly are compared by their
+        members."""
         pass
 
     # Representation of the expression.
     def __repr__(self):
         "Representation of the expression for comparison and debugging."
+        if self._repr is None:
+            self._repr = self._compute_repr()
         return self._repr
 
+    def _compute_repr(self):
+        "Compute representation of the expression (overloaded by child classes)."
+        error("This function must be overloaded by child classes.")
+
+    def _key(self):
+        """Return tuple of class and members identifying the expression
+        (overloaded by child classes)."""
+        error("This function must be overloaded by child classes.")
+
     # Hash.
     def __hash__(self):
         "Hash (for lookup in {})."
@@ -50,16 +71,20 @@ class Expr(object):
 
     # Comparison.
     def __eq__(self, other):
-        "==, True if representations are equal."
-        if isinstance(other, Expr):
-            return self._repr == other._repr
-        return False
+        "==, True if expressions are the same object or have equal members."
+        if self is other:
+            return True
+        # Compare hash values first, most expressions differ
+        try:
+            if self._hash != other._hash:
+                return False
+        except AttributeError:
+            return False
+        return isinstance(other, Expr) and self._key() == other._key()
 
     def __ne__(self, other):
-        "!=, True if representations are not equal."
-        if isinstance(other, Expr):
-            return self._repr != other._repr
-        return True
+        "!=, True if expressions are not equal."
+        return not self.__eq__(other)
 
     def __lt__(self, other):
         """<, compare precedence and _repr if two objects have the same precedence."""
@@ -68,7 +93,7 @@ class Expr(object):
         if self._prec < other._prec:
             return True
         elif self._prec == other._prec:
-            return self._repr < other._repr
+            return (self._repr or repr(self)) < (other._repr or repr(other))
         return False
 
     def __gt__(self, other):
@@ -78,7 +103,7 @@ class Expr(object):
         if self._prec > other._prec:
             return True
         elif self._prec == other._prec:
-            return self._repr > other._repr
+            return (self._repr or repr(self)) > (other._repr or repr(other))
         return False
 
     # Public functions (for FloatValue, other classes should overload as needed)
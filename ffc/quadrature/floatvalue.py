@@ -54,13 +54,19 @@ class FloatValue(Expr):
         elif abs(value + 1.0) <  EPS:
             self.val = -1.0
 
-        # Compute the representation now, such that we can use it directly
-        # in the __eq__ and __ne__ methods (improves performance a bit, but
-        # only when objects are cached).
+        # Compute the representation now, since it depends on the float
+        # format at the time of creation.
         self._repr = "FloatValue(%s)" % format["float"](self.val)
+        self._hash = hash(self._key())
 
-        # Use repr as hash value
-        self._hash = hash(self._repr)
+    def _key(self):
+        """Return tuple identifying the float, by its representation such
+        that floats which print the same are equal."""
+        return (0, self._repr)
+
+    def __reduce__(self):
+        "Pickle by value, such that the float is recreated through the cache."
+        return (create_float, (self.val,))
 
     # Print function.
     def __str__(self):
@@ -29,6 +29,7 @@ from .symbolics import create_float
 from .symbolics import create_product
 from .symbolics import create_sum
 from .symbolics import create_fraction
+from .symbolics import memoize_reduce_vartype
 from .expr import Expr
 
 class Fraction(Expr):
@@ -72,16 +73,28 @@ class Fraction(Expr):
             # Remove denominator, such that it will be excluded when printing
             self.denom = None
 
-        # Compute the representation now, such that we can use it directly
-        # in the __eq__ and __ne__ methods (improves performance a bit, but
-        # only when objects are cached).
+        # The representation is computed on first use, the hash value
+        # from the members.
+        self._repr = None
+        self._hash = hash(self._key())
+
+    def _compute_repr(self):
+        "Compute representation of the fraction."
+        return "Fraction(%s, %s)" % (repr(self.num), repr(self._denominator()))
+
+    def _key(self):
+        "Return tuple identifying the fraction."
+        return (4, self.num, self._denominator())
+
+    def _denominator(self):
+        "Return denominator, 1 if it has been removed."
         if self.denom:
-            self._repr = "Fraction(%s, %s)" %(self.num._repr, self.denom._repr)
-        else:
-            self._repr = "Fraction(%s, %s)" %(self.num._repr, create_float(1)._repr)
+            return self.denom
+        return create_float(1)
 
-        # Use repr as hash value.
-        self._hash = hash(self._repr)
+    def __reduce__(self):
+        "Pickle by value, such that the fraction is recreated through the cache."
+        return (create_fraction, (self.num, self._denominator()))
 
 
     # Print functions.
@@ -118,9 +131,9 @@ class Fraction(Expr):
         "Subtract other objects."
         # Return a new sum
         if other._prec == 4 and self.denom == other.denom: # frac
-            num = create_sum([self.num, create_product([FloatValue(-1), other.num])]).expand()
+            num = create_sum([self.num, create_product([create_float(-1), other.num])]).expand()
             return create_fraction(num, self.denom)
-        return create_sum([self, create_product([FloatValue(-1), other])])
+        return create_sum([self, create_product([create_float(-1), other])])
 
 
     def __mul__(self, other):
@@ -242,6 +255,7 @@ class Fraction(Expr):
         # we just need to consider the numerator.
         return create_fraction(self.num/var, self.denom)
 
+    @memoize_reduce_vartype
     def reduce_vartype(self, var_type):
         """Reduce expression with given var_type. It returns a tuple
         (found, remain), where 'found' is an expression that only has variables
@@ -306,7 +320,7 @@ class Fraction(Expr):
                 # better than just skipping.
 #                if len(foo) != 1:
 #                    raise RuntimeError("This case is not handled")
-                if len(foo) != 1 or (denom_found is not None and repr(d_found) != repr(denom_found)):
+                if len(foo) != 1 or (denom_found is not None and d_found != denom_found):
                     # If the denominator of the entire sum has a type which is
                     # lower than or equal to the vartype that we are currently
                     # reducing for, we have to move it outside the expression
@@ -24,6 +24,7 @@ from ffc.log import error
 from ffc.cpp import format
 
 # FFC quadrature modules.
+from .symbolics import create_funcall
 from .expr import Expr
 
 class FunCall(Expr):
@@ -42,13 +43,26 @@ class FunCall(Expr):
         self.vrs = vrs
 
         self._prec = 5
-        self._repr = "FunCall(%s, [%s])" % (funname, ', '.join(v._repr for v in self.vrs))
 
         # The type is equal to the lowest variable type.
         self.t = min([v.t for v in self.vrs])
 
-        # Use repr as hash value.
-        self._hash = hash(self._repr)
+        # The representation is computed on first use, the hash value
+        # from the members.
+        self._repr = None
+        self._hash = hash(self._key())
+
+    def _compute_repr(self):
+        "Compute representation of the function call."
+        return "FunCall(%s, [%s])" % (self.funname, ', '.join(repr(v) for v in self.vrs))
+
+    def _key(self):
+        "Return tuple identifying the function call."
+        return (5, self.funname) + tuple(self.vrs)
+
+    def __reduce__(self):
+        "Pickle by value, such that the function call is recreated through the cache."
+        return (create_funcall, (self.funname, list(self.vrs)))
 
     # Print functions.
     def __str__(self):
@@ -29,6 +29,7 @@ from .symbolics import create_float
 from .symbolics import create_product
 from .symbolics import create_sum
 from .symbolics import create_fraction
+from .symbolics import memoize_reduce_vartype
 from .expr import Expr
 from functools import reduce
 
@@ -138,18 +139,27 @@ class Product(Expr):
         # Sort the variables such that comparisons work.
         self.vrs.sort()
 
-        # Compute the representation now, such that we can use it directly
-        # in the __eq__ and __ne__ methods (improves performance a bit, but
-        # only when objects are cached).
-        self._repr = "Product([%s])" % ", ".join([v._repr for v in self.vrs])
-
-        # Use repr as hash value.
-        self._hash = hash(self._repr)
+        # The representation is computed on first use, the hash value
+        # from the members.
+        self._repr = None
+        self._hash = hash(self._key())
 
         # Store self as expanded value, if we did not encounter any sums or fractions.
         if self._expanded:
             self._expanded = self
 
+    def _compute_repr(self):
+        "Compute representation of the product."
+        return "Product([%s])" % ", ".join([repr(v) for v in self.vrs])
+
+    def _key(self):
+        "Return tuple identifying the product."
+        return (2,) + tuple(self.vrs)
+
+    def __reduce__(self):
+        "Pickle by value, such that the product is recreated through the cache."
+        return (create_product, (self.vrs,))
+
     # Print functions.
     def __str__(self):
         "Simple string representation which will appear in the generated code."
@@ -186,7 +196,7 @@ class Product(Expr):
                 # Return expanded product, to get rid of -x + x -> 0, not product(0).
                 return create_product([create_float(self.val - 1.0), other]).expand()
         # Return sum
-        return create_sum([self, create_product([FloatValue(-1), other])])
+        return create_sum([self, create_product([create_float(-1), other])])
 
     def __mul__(self, other):
         "Multiplication by other objects."
@@ -370,6 +380,7 @@ class Product(Expr):
         # TODO: This should crash if it goes wrong (the above is more correct but slower).
         return self._expanded
 
+    @memoize_reduce_vartype
     def reduce_vartype(self, var_type):
         """Reduce expression with given var_type. It returns a tuple
         (found, remain), where 'found' is an expression that only has variables
@@ -34,6 +34,7 @@ from ffc.log import info, debug, ffc_assert, error, warning
 from ffc.cpp import format, remove_unused
 
 from ffc.representationutils import initialize_integral_code
+from ffc.profiling import profiled
 
 # Utility and optimization functions for quadraturegenerator
 from ffc.quadrature.symbolics import generate_aux_constants
@@ -52,6 +53,7 @@ def generate_integral_code(ir, prefix, parameters):
 
     return code
 
+@profiled("tabulate_tensor")
 def _tabulate_tensor(ir, prefix, parameters):
     "Generate code for a single integral (tabulate_tensor())."
 
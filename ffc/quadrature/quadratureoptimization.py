@@ -18,6 +18,7 @@
 # Modified by Marie E. Rognes, 2013
 # Modified by Martin Alnaes, 2013-2014
 
+from itertools import chain
 from ufl.utils.sorting import sorted_by_key
 
 # FFC modules
@@ -25,6 +26,8 @@ from ffc.log import info, error, warning
 from ffc.cpp import format
 from ffc.quadrature.symbolics import optimise_code, BASIS, IP, GEO, CONST
 from ffc.quadrature.symbolics import create_product, create_sum, create_symbol, create_fraction
+from ffc.quadrature.symbolics import create_funcall
+from ffc.utils import parallel_map
 
 def optimize_integral_ir(ir, parameters):
     "Compute optimized intermediate representation of integral."
@@ -32,6 +35,9 @@ def optimize_integral_ir(ir, parameters):
     # FIXME: input argument "parameters" has been added to optimize_integral_ir
     # FIXME: which shadows a local parameter
 
+    # Get number of processes used for simplifying expressions
+    num_processes = int(parameters.get("ir_num_processes", 1))
+
     # Get integral type and optimization parameters
     integral_type = ir["integral_type"]
     parameters = ir["optimise_parameters"]
@@ -47,38 +53,37 @@ def optimize_integral_ir(ir, parameters):
         geo_consts     = ir["geo_consts"]
         psi_tables_map = ir["psi_tables_map"]
 
-        # Optimize based on integral type
+        # Collect integrals for each facet (vertex) of the integral type
         if integral_type == "cell":
-            info("Optimising expressions for cell integral")
-            if parameters["optimisation"] in ("precompute_ip_const", "precompute_basis_const"):
-                _precompute_expressions(integrals, geo_consts, parameters["optimisation"])
-            else:
-                _simplify_expression(integrals, geo_consts, psi_tables_map)
+            parts = [("cell integral", integrals)]
         elif integral_type == "exterior_facet":
-            for i in range(num_facets):
-                info("Optimising expressions for facet integral %d" % i)
-                if parameters["optimisation"] in ("precompute_ip_const", "precompute_basis_const"):
-                    _precompute_expressions(integrals[i], geo_consts, parameters["optimisation"])
-                else:
-                    _simplify_expression(integrals[i], geo_consts, psi_tables_map)
+            parts = [("facet integral %d" % i, integrals[i])
+                     for i in range(num_facets)]
         elif integral_type == "interior_facet":
-            for i in range(num_facets):
-                for j in range(num_facets):
-                    info("Optimising expressions for facet integral (%d, %d)" % (i, j))
-                    if parameters["optimisation"] in ("precompute_ip_const", "precompute_basis_const"):
-                        _precompute_expressions(integrals[i][j], geo_consts,parameters["optimisation"])
-                    else:
-                        _simplify_expression(integrals[i][j], geo_consts, psi_tables_map)
+            parts = [("facet integral (%d, %d)" % (i, j), integrals[i][j])
+                     for i in range(num_facets) for j in range(num_facets)]
         elif integral_type == "vertex":
-            for i in range(num_vertices):
-                info("Optimising expressions for poin integral %d" % i)
-                if parameters["optimisation"] in ("precompute_ip_const", "precompute_basis_const"):
-                    _precompute_expressions(integrals[i], geo_consts, parameters["optimisation"])
-                else:
-                    _simplify_expression(integrals[i], geo_consts, psi_tables_map)
+            parts = [("poin integral %d" % i, integrals[i])
+                     for i in range(num_vertices)]
         else:
             error("Unhandled domain type: " + str(integral_type))
 
+        # Optimize
+        if parameters["optimisation"] in ("precompute_ip_const", "precompute_basis_const"):
+            for (name, integral) in parts:
+                info("Optimising expressions for %s" % name)
+                _precompute_expressions(integral, geo_consts, parameters["optimisation"])
+        elif num_processes != 1:
+            # Optimise the entries of all facets with a single pool
+            for (name, integral) in parts:
+                info("Optimising expressions for %s" % name)
+            _simplify_expression_parallel([integral for (name, integral) in parts],
+                                          geo_consts, psi_tables_map, num_processes)
+        else:
+            for (name, integral) in parts:
+                info("Optimising expressions for %s" % name)
+                _simplify_expression(integral, geo_consts, psi_tables_map)
+
     return ir
 
 def _simplify_expression(integral, geo_consts, psi_tables_map):
@@ -105,6 +110,93 @@ def _simplify_expression(integral, geo_consts, psi_tables_map):
             terms[loop][0][2] = psi_tables
             terms[loop][1] = new_entry_vals
 
+def _simplify_expression_parallel(integrals, geo_consts, psi_tables_map, num_processes):
+    """Same as calling _simplify_expression for each of the given
+    integrals (of the facets of an integral), but optimise the entries
+    of all integrals in parallel. Each entry is optimised with empty
+    dictionaries of constants, which are then merged in the same order
+    as the entries are optimised by _simplify_expression, such that the
+    constants are numbered as in serial."""
+
+    # Collect entries in the order used by _simplify_expression
+    args = []
+    for integral in integrals:
+        for points, terms, functions, ip_consts, coordinate, conditionals in integral:
+            for loop, (data, entry_vals) in sorted_by_key(terms):
+                args += [(val,) for entry, val, ops in sorted(entry_vals)]
+
+    # Optimise entries
+    results = iter(parallel_map(_optimise_entry, args, num_processes))
+
+    # Merge constants and update terms
+    for points, terms, functions, ip_consts, coordinate, conditionals in chain(*integrals):
+        for loop, (data, entry_vals) in sorted_by_key(terms):
+            t_set, u_weights, u_psi_tables, u_nzcs, basis_consts = data
+            new_entry_vals = []
+            psi_tables = set()
+            for entry, val, ops in sorted(entry_vals):
+                value, entry_ip_consts, entry_geo_consts, entry_t_set = next(results)
+                value = _merge_constants(value, entry_ip_consts, entry_geo_consts,
+                                         ip_consts, geo_consts)
+                t_set.update(entry_t_set)
+                # Check if value is zero
+                if value.val:
+                    new_entry_vals.append((entry, value, value.ops()))
+                    psi_tables.update(set([psi_tables_map[b] for b in value.get_unique_vars(BASIS)]))
+
+            terms[loop][0][2] = psi_tables
+            terms[loop][1] = new_entry_vals
+
+def _optimise_entry(val):
+    "Optimise entry with empty dictionaries of constants (in worker process)."
+    ip_consts, geo_consts, t_set = {}, {}, set()
+    value = optimise_code(val, ip_consts, geo_consts, t_set)
+    return value, ip_consts, geo_consts, t_set
+
+def _merge_constants(value, entry_ip_consts, entry_geo_consts, ip_consts, geo_consts):
+    """Add constants declared when optimising an entry to the
+    dictionaries of constants and rename the constants in the value
+    accordingly."""
+    f_G = format["geometry constant"]
+    f_I = format["ip constant"]
+    names = {}
+
+    # Geometry constants first, since ip constants may refer to them
+    for geo, i in sorted(entry_geo_consts.items(), key=lambda item: item[1]):
+        if not geo in geo_consts:
+            geo_consts[geo] = len(geo_consts)
+        names[f_G(i)] = f_G(geo_consts[geo])
+    for ip, i in sorted(entry_ip_consts.items(), key=lambda item: item[1]):
+        ip = _rename_symbols(ip, names)
+        if not ip in ip_consts:
+            ip_consts[ip] = len(ip_consts)
+        names[f_I(i)] = f_I(ip_consts[ip])
+
+    return _rename_symbols(value, names)
+
+def _rename_symbols(val, names):
+    "Rename symbols in expression according to the given dictionary."
+    if val._prec == 1:
+        if val.v in names:
+            return create_symbol(names[val.v], val.t)
+        return val
+    elif val._prec in (2, 3, 5):
+        new_vars = [_rename_symbols(v, names) for v in val.vrs]
+        if all(v is w for (v, w) in zip(val.vrs, new_vars)):
+            return val
+        if val._prec == 2:
+            return create_product(new_vars)
+        elif val._prec == 3:
+            return create_sum(new_vars)
+        return create_funcall(val.funname, new_vars)
+    elif val._prec == 4 and val.denom is not None:
+        num = _rename_symbols(val.num, names)
+        denom = _rename_symbols(val.denom, names)
+        if num is val.num and denom is val.denom:
+            return val
+        return create_fraction(num, denom)
+    return val
+
 def _precompute_expressions(integral, geo_consts, optimisation):
     for points, terms, functions, ip_consts, coordinate, conditionals in integral:
         for loop, (data, entry_vals) in sorted_by_key(terms):
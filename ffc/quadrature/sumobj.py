@@ -28,6 +28,7 @@ from .symbolics import create_float
 from .symbolics import create_product
 from .symbolics import create_sum
 from .symbolics import create_fraction
+from .symbolics import memoize_reduce_vartype
 from .expr import Expr
 import six
 
@@ -101,13 +102,22 @@ class Sum(Expr):
         # Sort variables, (for representation).
         self.vrs.sort()
 
-        # Compute the representation now, such that we can use it directly
-        # in the __eq__ and __ne__ methods (improves performance a bit, but
-        # only when objects are cached).
-        self._repr = "Sum([%s])" % ", ".join([v._repr for v in self.vrs])
+        # The representation is computed on first use, the hash value
+        # from the members.
+        self._repr = None
+        self._hash = hash(self._key())
 
-        # Use repr as hash value.
-        self._hash = hash(self._repr)
+    def _compute_repr(self):
+        "Compute representation of the sum."
+        return "Sum([%s])" % ", ".join([repr(v) for v in self.vrs])
+
+    def _key(self):
+        "Return tuple identifying the sum."
+        return (3,) + tuple(self.vrs)
+
+    def __reduce__(self):
+        "Pickle by value, such that the sum is recreated through the cache."
+        return (create_sum, (self.vrs,))
 
     # Print functions.
     def __str__(self):
@@ -130,7 +140,7 @@ class Sum(Expr):
     def __sub__(self, other):
         "Subtract other objects."
         # Return a new sum
-        return create_sum([self, create_product([FloatValue(-1), other])])
+        return create_sum([self, create_product([create_float(-1), other])])
 
     def __mul__(self, other):
         "Multiplication by other objects."
@@ -511,6 +521,7 @@ class Sum(Expr):
         self._reduced = self
         return self._reduced
 
+    @memoize_reduce_vartype
     def reduce_vartype(self, var_type):
         """Reduce expression with given var_type. It returns a list of tuples
         [(found, remain)], where 'found' is an expression that only has variables
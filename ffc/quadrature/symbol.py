@@ -27,6 +27,7 @@ from ffc.cpp import format
 # FFC quadrature modules.
 from .symbolics import type_to_string
 from .symbolics import create_float
+from .symbolics import create_symbol
 from .symbolics import create_product
 from .symbolics import create_sum
 from .symbolics import create_fraction
@@ -70,17 +71,28 @@ class Symbol(Expr):
         if base_expr and base_expr.t < self.t:
             self.t = base_expr.t
 
-        # Compute the representation now, such that we can use it directly
-        # in the __eq__ and __ne__ methods (improves performance a bit, but
-        # only when objects are cached).
+        # The representation is computed on first use, the hash value
+        # from the members.
+        self._repr = None
+        self._hash = hash(self._key())
+
+    def _compute_repr(self):
+        "Compute representation of the symbol."
         if self.base_expr:# and self.exp is None:
-            self._repr = "Symbol('%s', %s, %s, %d)" % (self.v, type_to_string[self.t],\
-                         self.base_expr._repr, self.base_op)
-        else:
-            self._repr = "Symbol('%s', %s)" % (self.v, type_to_string[self.t])
+            return "Symbol('%s', %s, %s, %d)" % (self.v, type_to_string[self.t],\
+                   repr(self.base_expr), self.base_op)
+        return "Symbol('%s', %s)" % (self.v, type_to_string[self.t])
+
+    def _key(self):
+        "Return tuple identifying the symbol."
+        if self.base_expr:
+            return (1, self.v, self.t, self.base_expr, self.base_op)
+        return (1, self.v, self.t)
 
-        # Use repr as hash value.
-        self._hash = hash(self._repr)
+    def __reduce__(self):
+        "Pickle by value, such that the symbol is recreated through the cache."
+        return (create_symbol, (self.v, self.t, self.base_expr, self.base_op,
+                                None, (), self.loop_index, self.ide))
 
     # Print functions.
     def __str__(self):
@@ -96,7 +108,7 @@ class Symbol(Expr):
         # NOTE: We expect expanded objects
         # symbols, if other is a product, try to let product handle the addition.
         # Returns x + x -> 2*x, x + 2*x -> 3*x.
-        if self._repr == other._repr:
+        if self == other:
             return create_product([create_float(2), self])
         elif other._prec == 2: # prod
             return other.__add__(self)
@@ -106,7 +118,7 @@ class Symbol(Expr):
         "Subtract other objects."
         # NOTE: We expect expanded objects
         # symbols, if other is a product, try to let product handle the addition.
-        if self._repr == other._repr:
+        if self == other:
             return create_float(0)
         elif other._prec == 2: # prod
             if other.get_vrs() == (self,):
@@ -139,7 +151,7 @@ class Symbol(Expr):
             error("Division by zero.")
 
         # Return 1 if the two symbols are equal.
-        if self._repr == other._repr:
+        if self == other:
             return create_float(1)
 
         # If other is a Sum we can only return a fraction.
@@ -17,6 +17,8 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with FFC. If not, see <http://www.gnu.org/licenses/>.
 
+from contextlib import contextmanager
+
 from ufl.utils.sorting import sorted_by_key
 
 # FFC modules
@@ -33,6 +35,32 @@ GEO = 2
 CONST = 3
 type_to_string = {BASIS:"BASIS", IP:"IP",GEO:"GEO", CONST:"CONST"}
 
+# Canonical expressions (hash-consing). Expressions created by the
+# create_* functions below from the same members are represented by the
+# same object, such that they are usually compared by identity. The
+# members are keyed by identity, since floats which print the same
+# compare equal but keep their own value.
+_expr_cache = {}
+def _intern(expr):
+    "Return canonical expression with the same members as expr."
+    key = tuple(id(m) if isinstance(m, Expr) else m for m in expr._key())
+    canonical = _expr_cache.get(key)
+    if canonical is None:
+        _store(_expr_cache, key, expr)
+        canonical = expr
+    return canonical
+
+# Maximum number of items in each of the caches below. A full cache is
+# emptied, which is safe since expressions are compared by their members
+# if they are not the same object.
+_max_cache_size = 100000
+
+def _store(cache, key, expr):
+    "Store expression in cache, emptying the cache first if it is full."
+    if len(cache) >= _max_cache_size:
+        cache.clear()
+    cache[key] = expr
+
 # Functions and dictionaries for cache implementation.
 # Increases speed and should also reduce memory consumption.
 _float_cache = {}
@@ -40,8 +68,10 @@ def create_float(val):
     if val in _float_cache:
 #        print "found %f in cache" %val
         return _float_cache[val]
+    # Floats are not interned, since floats which print the same are
+    # equal but keep their own value
     float_val = FloatValue(val)
-    _float_cache[val] = float_val
+    _store(_float_cache, val, float_val)
     return float_val
 
 class Expression(object):
@@ -81,9 +111,9 @@ def create_symbol(variable, symbol_type, base_expr=None, base_op=0, expo=None,\
     if key in _symbol_cache:
 #        print "found %s in cache" %variable
         return _symbol_cache[key]
-    symbol = Symbol(variable, symbol_type, base_expr, base_op, \
-                    expo, cond, loop_index, iden)
-    _symbol_cache[key] = symbol
+    symbol = _intern(Symbol(variable, symbol_type, base_expr, base_op, \
+                            expo, cond, loop_index, iden))
+    _store(_symbol_cache, key, symbol)
     return symbol
 
 _product_cache = {}
@@ -98,8 +128,8 @@ def create_product(variables):
 #        print "found %s in cache" %str(key)
 #        print "found product in cache"
         return _product_cache[key]
-    product = Product(key)
-    _product_cache[key] = product
+    product = _intern(Product(key))
+    _store(_product_cache, key, product)
     return product
 
 _funcall_cache = {}
@@ -114,8 +144,8 @@ def create_funcall(funname, arguments):
 #        print "found %s in cache" %str(key)
 #        print "found funcall in cache"
         return _funcall_cache[key]
-    funcall = FunCall(funname, arguments)
-    _funcall_cache[key] = funcall
+    funcall = _intern(FunCall(funname, arguments))
+    _store(_funcall_cache, key, funcall)
     return funcall
 
 _sum_cache = {}
@@ -130,8 +160,8 @@ def create_sum(variables):
 #        print "found %s in cache" %str(key)
 #        print "found sum in cache"
         return _sum_cache[key]
-    s = Sum(key)
-    _sum_cache[key] = s
+    s = _intern(Sum(key))
+    _store(_sum_cache, key, s)
     return s
 
 _fraction_cache = {}
@@ -141,10 +171,63 @@ def create_fraction(num, denom):
 #        print "found %s in cache" %str(key)
 #        print "found fraction in cache"
         return _fraction_cache[key]
-    fraction = Fraction(num, denom)
-    _fraction_cache[key] = fraction
+    fraction = _intern(Fraction(num, denom))
+    _store(_fraction_cache, key, fraction)
     return fraction
 
+# Results of reduce_vartype, keyed by expression and variable type.
+# Expressions are immutable, so a reduction is computed only once.
+_reduce_vartype_cache = {}
+def memoize_reduce_vartype(reduce_vartype):
+    "Decorator memoizing reduce_vartype of expressions."
+    def memoized_reduce_vartype(self, var_type):
+        # Keyed by identity, the cached expression keeps the id valid
+        key = (id(self), var_type)
+        cached = _reduce_vartype_cache.get(key)
+        if cached is None:
+            reduced = reduce_vartype(self, var_type)
+            _store(_reduce_vartype_cache, key, (self, reduced))
+        else:
+            reduced = cached[1]
+        # Return a new list, such that the cached one is not modified
+        return list(reduced)
+    memoized_reduce_vartype.__doc__ = reduce_vartype.__doc__
+    memoized_reduce_vartype.__wrapped__ = reduce_vartype
+    return memoized_reduce_vartype
+
+_caches = {"float": _float_cache, "symbol": _symbol_cache,
+           "product": _product_cache, "sum": _sum_cache,
+           "fraction": _fraction_cache, "funcall": _funcall_cache,
+           "canonical": _expr_cache, "reduce_vartype": _reduce_vartype_cache}
+
+def symbolics_cache_info():
+    "Return dictionary of the number of items in each of the caches."
+    info = dict((name, len(cache)) for (name, cache) in _caches.items())
+    info["maxsize"] = _max_cache_size
+    return info
+
+def clear_symbolics_cache():
+    """Remove all expressions from the caches. Expressions created
+    before are still equal to equal expressions created afterwards,
+    but they are no longer the same object."""
+    for cache in _caches.values():
+        cache.clear()
+
+_scope_depth = 0
+@contextmanager
+def symbolics_cache_scope():
+    """Context (e.g., a compilation) in which expressions are cached.
+    The caches are cleared when the outermost context is left, such
+    that they do not grow with every form compiled by a process."""
+    global _scope_depth
+    _scope_depth += 1
+    try:
+        yield
+    finally:
+        _scope_depth -= 1
+        if not _scope_depth:
+            clear_symbolics_cache()
+
 # NOTE: We use commented print for debug, since debug will make the code run slower.
 def generate_aux_constants(constant_decl, name, var_type, print_ops=False):
     "A helper tool to generate code for constant declarations."
@@ -362,6 +445,7 @@ def optimise_code(expr, ip_consts, geo_consts, trans_set):
     # Where did the values go?
     error("Values disappeared.")
 
+from .expr       import Expr
 from .floatvalue import FloatValue
 from .symbol     import Symbol
 from .product    import Product
@@ -31,10 +31,11 @@ from ufl.algorithms import extract_unique_elements, extract_type, extract_elemen
 # FFC modules
 from ffc.log import ffc_assert, info, error, warning
 from ffc.utils import product
-from ffc.fiatinterface import create_element, reference_cell, reference_cell_vertices
-from ffc.quadrature_schemes import create_quadrature
+from ffc.fiatinterface import create_element, reference_cell_vertices
+from ffc.quadrature_schemes import create_quadrature, map_facet_points
 from ffc.representationutils import create_quadrature_points_and_weights
 from ffc.mixedelement import MixedElement
+from ffc.tabulationcache import tabulate
 from FIAT.enriched import EnrichedElement
 
 
@@ -84,16 +85,8 @@ def _map_entity_points(cell, points, entity_dim, entity, integral_type):
         if len(points[0]) == 0:
             return [[(0.0,), (1.0,)][entity]]
 
-        # Get mapping from facet to cell coordinates
-        if integral_type in ("exterior_facet_top", "exterior_facet_bottom", "interior_facet_horiz"):
-            t = reference_cell(cell).get_horiz_facet_transform(entity)
-        elif integral_type in ("exterior_facet_vert", "interior_facet_vert"):
-            t = reference_cell(cell).get_vert_facet_transform(entity)
-        else:
-            t = reference_cell(cell).get_facet_transform(entity)
-
-        # Apply mapping for all points
-        return numpy.asarray(map(t, points))
+        # Map points from facet to cell coordinates (memoized)
+        return map_facet_points(cell, points, entity, integral_type)
 
     elif entity_dim == 0:
         return (reference_cell_vertices(cell.cellname())[entity],)
@@ -118,7 +111,7 @@ def _tabulate_empty_psi_table(tdim, deriv_order, element):
 
     return {None: table}
 
-def _tabulate_psi_table(integral_type, cell, element, deriv_order, points):
+def _tabulate_psi_table(integral_type, cell, element, deriv_order, points, ufl_element):
     "Tabulate psi table for different integral types."
     # MSA: I attempted to generalize this function, could this way of
     # handling domain types generically extend to other parts of the code?
@@ -126,7 +119,7 @@ def _tabulate_psi_table(integral_type, cell, element, deriv_order, points):
     # Handle case when list of points is empty
     if points is None:
         return _tabulate_empty_psi_table(tdim, deriv_order, element)
-    # Otherwise, call FIAT to tabulate
+    # Otherwise, call FIAT to tabulate (through the tabulation cache)
     entity_dim = domain_to_entity_dim(integral_type, cell)
     if integral_type in ("exterior_facet_top", "exterior_facet_bottom", "interior_facet_horiz"):
         num_entities = 2  # top and bottom
@@ -143,7 +136,7 @@ def _tabulate_psi_table(integral_type, cell, element, deriv_order, points):
         entity_points = _map_entity_points(cell, points, entity_dim, entity, integral_type)
         # TODO: Use 0 as key for cell and we may be able to generalize other places:
         key = None if integral_type == "cell" else entity
-        psi_table[key] = element.tabulate(deriv_order, entity_points)
+        psi_table[key] = tabulate(ufl_element, element, deriv_order, entity_points)
 
     return psi_table
 
@@ -260,7 +253,8 @@ def tabulate_basis(sorted_integrals, form_data, itg_data):
 
             # Tabulate table of basis functions and derivatives in points
             psi_table = _tabulate_psi_table(integral_type, cell, fiat_element,
-                                            num_derivatives[ufl_element], points)
+                                            num_derivatives[ufl_element], points,
+                                            ufl_element)
 
             # Insert table into dictionary based on UFL elements. (None=not averaged)
             psi_tables[len_weights][ufl_element] = { None: psi_table }
@@ -283,7 +277,8 @@ def tabulate_basis(sorted_integrals, form_data, itg_data):
             wsum = sum(weights)
 
             # Tabulate table of basis functions and derivatives in points
-            entity_psi_tables = _tabulate_psi_table(avg_integral_type, cell, fiat_element, 0, points)
+            entity_psi_tables = _tabulate_psi_table(avg_integral_type, cell, fiat_element, 0, points,
+                                                    element)
             rank = len(element.value_shape())
 
             # Hack, duplicating table with per-cell values for each facet in the case of cell_avg(f) in a facet integral
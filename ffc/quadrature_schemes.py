@@ -10,6 +10,10 @@ Scheme options are:
 
   scheme="canonical" (collapsed Gauss scheme supplied by FIAT)
 
+Quadrature rules and points mapped to facets are memoized, since the
+same rules are requested for every integral, facet and monomial. The
+points and weights returned are read-only NumPy arrays.
+
 Background on the schemes:
 
   Keast rules for tetrahedra:
@@ -39,7 +43,7 @@ Background on the schemes:
 # Last changed: 2011-04-19
 
 # NumPy
-from numpy import array, arange, float64
+from numpy import array, arange, float64, ascontiguousarray
 
 # UFL
 import ufl
@@ -48,6 +52,11 @@ import ufl
 from ffc.log import debug, error
 from ffc.fiatinterface import reference_cell
 from ffc.fiatinterface import create_quadrature as fiat_create_quadrature
+from ffc.utils import LRUCache
+
+# Memoized quadrature rules and points mapped to facets
+_rules = LRUCache(maxsize=1024)
+_facet_points = LRUCache(maxsize=1024)
 
 def create_quadrature(cell, degree, scheme="default"):
     """
@@ -55,6 +64,59 @@ def create_quadrature(cell, degree, scheme="default"):
     that will integrate an polynomial of order 'degree' exactly.
     """
 
+    key = (cell if isinstance(cell, str) else repr(cell), degree, scheme)
+    rule = _rules.get(key)
+    if rule is None:
+        (points, weights) = _create_quadrature(cell, degree, scheme)
+        rule = (_read_only_array(points), _read_only_array(weights))
+        _rules[key] = rule
+    return rule
+
+def map_facet_points(cell, points, facet, integral_type="exterior_facet"):
+    """
+    Map quadrature points on the reference facet to the given facet of
+    the reference cell, for the given type of facet integral.
+    """
+
+    points = _read_only_array(points)
+    key = (repr(cell), integral_type, facet, points.shape, points.tobytes())
+    mapped_points = _facet_points.get(key)
+    if mapped_points is None:
+        if points.ndim == 2 and points.shape[1] == 0:
+            # Facets of intervals are vertices, points have no coordinates
+            vertex = reference_cell(cell).get_vertices()[facet]
+            t = lambda p: vertex
+        elif integral_type in ("exterior_facet_top", "exterior_facet_bottom", "interior_facet_horiz"):
+            t = reference_cell(cell).get_horiz_facet_transform(facet)
+        elif integral_type in ("exterior_facet_vert", "interior_facet_vert"):
+            t = reference_cell(cell).get_vert_facet_transform(facet)
+        else:
+            t = reference_cell(cell).get_facet_transform(facet)
+        mapped_points = _read_only_array([t(p) for p in points])
+        _facet_points[key] = mapped_points
+    return mapped_points
+
+def quadrature_cache_info():
+    """
+    Return dictionary of statistics of the memoized quadrature rules
+    and facet points.
+    """
+    return {"rules": _rules.info(), "facet_points": _facet_points.info()}
+
+def clear_quadrature_cache():
+    "Remove all memoized quadrature rules and facet points."
+    _rules.clear()
+    _facet_points.clear()
+
+def _read_only_array(values):
+    "Return values as a (contiguous) array which may not be modified."
+    values = ascontiguousarray(values, dtype=float64)
+    values.flags.writeable = False
+    return values
+
+def _create_quadrature(cell, degree, scheme):
+    "Generate quadrature rule (points, weights) for given shape."
+
     if isinstance(cell, str):
         cellname = cell
     else:
@@ -42,7 +42,7 @@ import numpy
 import ufl
 
 # FFC modules
-from ffc.utils import compute_permutations, product
+from ffc.utils import compute_permutations, product, parallel_map
 from ffc.log import info, error, begin, end, debug_ir, ffc_assert, warning
 from ffc.fiatinterface import create_element, reference_cell
 from ffc.mixedelement import MixedElement
@@ -50,6 +50,8 @@ from ffc.enrichedelement import SpaceOfReals
 from ffc.fiatinterface import DiscontinuousLagrangeTrace
 from ffc.quadratureelement import QuadratureElement
 from ffc.cpp import set_float_formatting, make_classname, make_integral_classname
+from ffc.profiling import profiled
+from ffc.tabulationcache import set_tabulation_cache_dir
 
 # List of supported integral types
 ufc_integral_types = ["cell", "exterior_facet", "interior_facet", "vertex", "custom"]
@@ -77,23 +79,29 @@ def compute_ir(analysis, prefix, parameters, object_names=None):
 
     # Set code generation parameters
     set_float_formatting(int(parameters["precision"]))
+    set_tabulation_cache_dir(parameters.get("tabulation_cache_dir"))
 
     # Extract data from analysis
     form_datas, elements, element_numbers, coordinate_elements = analysis
 
+    # Number of processes used for computing representations
+    num_processes = int(parameters.get("ir_num_processes", 1))
+
     # Compute representation of elements
     if not parameters["format"] == "pyop2":
         info("Computing representation of %d elements" % len(elements))
-        ir_elements = [_compute_element_ir(e, prefix, element_numbers)
-                       for e in elements]
+        ir_elements = parallel_map(_compute_element_ir,
+                                   [(e, prefix, element_numbers) for e in elements],
+                                   num_processes)
     else:
         ir_elements = [None]
 
     # Compute representation of dofmaps
     if not parameters["format"] == "pyop2":
         info("Computing representation of %d dofmaps" % len(elements))
-        ir_dofmaps = [_compute_dofmap_ir(e, prefix, element_numbers)
-                      for e in elements]
+        ir_dofmaps = parallel_map(_compute_dofmap_ir,
+                                  [(e, prefix, element_numbers) for e in elements],
+                                  num_processes)
         # Compute representation of coordinate mappings
         info("Computing representation of %d coordinate mappings" % len(coordinate_elements))
         ir_compute_coordinate_mappings = [_compute_coordinate_mapping_ir(e, prefix, element_numbers)
@@ -104,9 +112,17 @@ def compute_ir(analysis, prefix, parameters, object_names=None):
 
     # Compute and flatten representation of integrals
     info("Computing representation of integrals")
-    irs = [_compute_integral_ir(fd, i, prefix, element_numbers, parameters, object_names=object_names)
-           for (i, fd) in enumerate(form_datas)]
-    ir_integrals = [ir for ir in chain(*irs) if not ir is None]
+    if num_processes == 1:
+        irs = [_compute_integral_ir(fd, i, prefix, element_numbers, parameters, object_names=object_names)
+               for (i, fd) in enumerate(form_datas)]
+        ir_integrals = [ir for ir in chain(*irs) if not ir is None]
+    else:
+        # Compute representation of each integral separately
+        args = [(itg_data, fd, i, prefix, element_numbers, parameters, object_names)
+                for (i, fd) in enumerate(form_datas)
+                for itg_data in fd.integral_data]
+        irs = parallel_map(_compute_single_integral_ir, args, num_processes)
+        ir_integrals = [ir for ir in irs if not ir is None]
 
     # Compute representation of forms
     if not parameters["format"] == "pyop2":
@@ -121,6 +137,7 @@ def compute_ir(analysis, prefix, parameters, object_names=None):
     return ir_elements, ir_dofmaps, ir_compute_coordinate_mappings, ir_integrals, ir_forms
 
 
+@profiled(lambda ufl_element, *args: "finite_element %s" % str(ufl_element))
 def _compute_element_ir(ufl_element, prefix, element_numbers):
     "Compute intermediate representation of element."
 
@@ -162,6 +179,7 @@ def _compute_element_ir(ufl_element, prefix, element_numbers):
     return ir
 
 
+@profiled(lambda ufl_element, *args: "dofmap %s" % str(ufl_element))
 def _compute_dofmap_ir(ufl_element, prefix, element_numbers):
     "Compute intermediate representation of dofmap."
 
@@ -331,37 +349,41 @@ def _needs_mesh_entities(fiat_element):
 def _compute_integral_ir(form_data, form_id, prefix, element_numbers, parameters, object_names=None):
     "Compute intermediate represention for form integrals."
 
-    irs = []
+    # Iterate over integrals
+    return [_compute_single_integral_ir(itg_data, form_data, form_id, prefix,
+                                        element_numbers, parameters, object_names)
+            for itg_data in form_data.integral_data]
+
+
+@profiled(lambda itg_data, form_data, form_id, prefix, *args:
+          make_integral_classname(prefix, itg_data.integral_type, form_id, itg_data.subdomain_id))
+def _compute_single_integral_ir(itg_data, form_data, form_id, prefix, element_numbers, parameters, object_names=None):
+    "Compute intermediate represention for a single integral."
 
     if object_names is None:
         object_names = {}
-    # Iterate over integrals
-    for itg_data in form_data.integral_data:
-
-        # Select representation
-        # TODO: Is it possible to detach this metadata from
-        # IntegralData? It's a bit strange from the ufl side.
-        r = pick_representation("quadrature" if parameters["format"] == "pyop2" else itg_data.metadata["representation"])
 
-        # Compute representation
-        ir = r.compute_integral_ir(itg_data,
-                                   form_data,
-                                   form_id,
-                                   element_numbers,
-                                   parameters)
-        ir['coefficient_names'] = [object_names.get(id(obj), "w%d" % j) for j, obj in enumerate(form_data.reduced_coefficients)]
-        ir['coefficient_elements'] = form_data.coefficient_elements
+    # Select representation
+    # TODO: Is it possible to detach this metadata from
+    # IntegralData? It's a bit strange from the ufl side.
+    r = pick_representation("quadrature" if parameters["format"] == "pyop2" else itg_data.metadata["representation"])
 
-        # Build classname
-        ir["classname"] = make_integral_classname(prefix, itg_data.integral_type, form_id, itg_data.subdomain_id)
+    # Compute representation
+    ir = r.compute_integral_ir(itg_data,
+                               form_data,
+                               form_id,
+                               element_numbers,
+                               parameters)
+    ir['coefficient_names'] = [object_names.get(id(obj), "w%d" % j) for j, obj in enumerate(form_data.reduced_coefficients)]
+    ir['coefficient_elements'] = form_data.coefficient_elements
 
-        # Storing prefix here for reconstruction of classnames on code generation side
-        ir["prefix"] = prefix
+    # Build classname
+    ir["classname"] = make_integral_classname(prefix, itg_data.integral_type, form_id, itg_data.subdomain_id)
 
-        # Append representation
-        irs.append(ir)
+    # Storing prefix here for reconstruction of classnames on code generation side
+    ir["prefix"] = prefix
 
-    return irs
+    return ir
 
 
 def _compute_form_ir(form_data, form_id, prefix, element_numbers):
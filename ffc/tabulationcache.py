@@ -0,0 +1,156 @@
+"""This module provides a cache of tables of basis functions and
+their derivatives tabulated by FIAT, such that each element is
+tabulated only once for the same derivative order and points, also
+across integrals and forms.
+
+Tables are addressed by the repr of the UFL element, the derivative
+order and a hash of the points (which are mapped to the entity being
+tabulated, so the entity is part of the key). They are kept in memory
+for the duration of the process and, if a cache directory is set (see
+the parameter tabulation_cache_dir), stored on disk as .npy files
+which are memory-mapped when loaded by other processes. The file of
+the table of each derivative is named by the derivative counts, for
+example d1_0.npy, or d.npy for the empty derivative of a vertex.
+"""
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+# Python modules
+import os
+import shutil
+import tempfile
+from hashlib import sha1
+
+import numpy
+
+# FFC modules
+from ffc import __version__ as FFC_VERSION
+from ffc.log import debug
+from ffc.utils import LRUCache
+
+__all__ = ["tabulate", "set_tabulation_cache_dir", "tabulation_cache_info",
+           "clear_tabulation_cache"]
+
+# Version of the cache format, bump when the file layout changes
+TABULATION_CACHE_VERSION = 2
+
+# Tables tabulated or loaded by this process
+_tables = LRUCache(maxsize=1024)
+
+# Directory in which tables are stored (disabled if None)
+_cache_dir = None
+
+def set_tabulation_cache_dir(cache_dir):
+    "Set directory in which tables are stored (disabled if empty)."
+    global _cache_dir
+    _cache_dir = cache_dir or None
+
+def tabulate(ufl_element, fiat_element, order, points):
+    """Tabulate the basis functions of the FIAT element corresponding
+    to the UFL element and their derivatives up to given order at the
+    given points, as FIAT tabulate does. The tables returned are
+    copies which may be modified by the caller."""
+
+    key = _table_key(ufl_element, order, points)
+    table = _tables.get(key)
+    if table is None:
+        table = _load_table(key) if _cache_dir else None
+        if table is None:
+            table = dict((derivative, numpy.asarray(values))
+                         for (derivative, values) in fiat_element.tabulate(order, points).items())
+            if _cache_dir:
+                _store_table(key, table)
+        _tables[key] = table
+
+    return dict((derivative, numpy.array(values)) for (derivative, values) in table.items())
+
+def tabulation_cache_info():
+    "Return dictionary of statistics of the in-memory cache."
+    info = _tables.info()
+    info["cache_dir"] = _cache_dir
+    return info
+
+def clear_tabulation_cache():
+    "Remove all tables from the in-memory cache."
+    _tables.clear()
+
+def _table_key(ufl_element, order, points):
+    "Return hash identifying table."
+    points = numpy.ascontiguousarray(points, dtype=numpy.float64)
+    h = sha1()
+    h.update(";".join((repr(ufl_element), str(order), str(points.shape),
+                       FFC_VERSION, _fiat_version(),
+                       str(TABULATION_CACHE_VERSION))).encode("utf-8"))
+    h.update(points.tobytes())
+    return h.hexdigest()
+
+def _fiat_version():
+    import FIAT
+    return getattr(FIAT, "__version__", "")
+
+def _load_table(key):
+    "Load table from cache directory, return None if not found."
+    directory = os.path.join(_cache_dir, key)
+    if not os.path.isdir(directory):
+        return None
+    table = {}
+    try:
+        for filename in os.listdir(directory):
+            name, ext = os.path.splitext(filename)
+            if ext != ".npy":
+                continue
+            derivative = _parse_filename(name)
+            table[derivative] = numpy.load(os.path.join(directory, filename), mmap_mode="r")
+    except (IOError, OSError, ValueError) as e:
+        debug("Ignoring unreadable cached table %s (%s)." % (directory, str(e)))
+        return None
+    debug("Loaded table %s from cache." % key)
+    return table
+
+def _store_table(key, table):
+    "Store table in cache directory."
+    if not os.path.isdir(_cache_dir):
+        try:
+            os.makedirs(_cache_dir)
+        except OSError:
+            # May have been created by another process
+            pass
+
+    # Write to a temporary directory and rename, such that concurrent
+    # readers never see a partially written entry
+    tmpdir = tempfile.mkdtemp(dir=_cache_dir, suffix=".tmp")
+    try:
+        for (derivative, values) in table.items():
+            filename = _table_filename(derivative) + ".npy"
+            numpy.save(os.path.join(tmpdir, filename), values)
+        try:
+            os.rename(tmpdir, os.path.join(_cache_dir, key))
+        except OSError:
+            # Stored by another process in the meantime
+            pass
+    finally:
+        # Remove temporary directory if not renamed
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+def _table_filename(derivative):
+    "Return name of file of table of given derivative (without extension)."
+    return "d" + "_".join(str(i) for i in derivative)
+
+def _parse_filename(name):
+    "Return derivative of file with given name (without extension)."
+    if not name.startswith("d"):
+        raise ValueError("Unexpected file %s in table." % name)
+    return tuple(int(i) for i in name[1:].split("_") if i)
@@ -31,14 +31,16 @@ import time
 # FFC modules
 from ffc.log import info, debug, error
 from ffc.fiatinterface import create_element
-from ffc.fiatinterface import map_facet_points
-from ffc.quadrature_schemes import create_quadrature
+from ffc.quadrature_schemes import create_quadrature, map_facet_points
 from ffc.representationutils import create_quadrature_points_and_weights
+from ffc.tabulationcache import tabulate
 
 # FFC tensor representation modules
 from .multiindex import build_indices
 from .monomialextraction import MonomialException
 from .monomialtransformation import MonomialIndex
+from .referencetensorcache import reference_tensor_signature
+from .referencetensorcache import load_reference_tensor, store_reference_tensor
 
 def integrate(monomial,
               integral_type,
@@ -49,6 +51,13 @@ def integrate(monomial,
     """Compute the reference tensor for a given monomial term of a
     multilinear form"""
 
+    # Reuse reference tensor if computed before
+    signature = reference_tensor_signature(monomial, integral_type, facet0, facet1,
+                                           quadrature_degree, quadrature_rule, cell)
+    A0 = load_reference_tensor(signature)
+    if A0 is not None:
+        return A0
+
     info("Precomputing integrals on reference element")
 
     # Start timing
@@ -61,7 +70,8 @@ def integrate(monomial,
     table = _init_table(monomial.arguments,
                         integral_type,
                         points,
-                        facet0, facet1)
+                        facet0, facet1,
+                        cell)
 
     # Compute table Psi for each factor
     psis = [_compute_psi(v, table, len(points)) \
@@ -76,9 +86,12 @@ def integrate(monomial,
     debug("%d entries computed in %.3g seconds" % (num_entries, toc))
     debug("Shape of reference tensor: " + str(numpy.shape(A0)))
 
+    # Store reference tensor for reuse
+    store_reference_tensor(signature, A0)
+
     return A0
 
-def _init_table(arguments, integral_type, points, facet0, facet1):
+def _init_table(arguments, integral_type, points, facet0, facet1, cell):
     """Initialize table of basis functions and their derivatives at
     the given quadrature points for each element."""
 
@@ -93,19 +106,20 @@ def _init_table(arguments, integral_type, points, facet0, facet1):
             num_derivatives[ufl_element] = order
 
     # Call FIAT to tabulate the basis functions for each element
+    # (through the tabulation cache)
     table = {}
     for (ufl_element, order) in num_derivatives.items():
         fiat_element = create_element(ufl_element)
         if integral_type == "cell":
-            table[(ufl_element, None)] = fiat_element.tabulate(order, points)
+            table[(ufl_element, None)] = tabulate(ufl_element, fiat_element, order, points)
         elif integral_type == "exterior_facet":
-            x = map_facet_points(points, facet0, "facet")
-            table[(ufl_element, None)] = fiat_element.tabulate(order, x)
+            x = map_facet_points(cell, points, facet0, integral_type)
+            table[(ufl_element, None)] = tabulate(ufl_element, fiat_element, order, x)
         elif integral_type == "interior_facet":
-            x0 = map_facet_points(points, facet0, "facet")
-            x1 = map_facet_points(points, facet1, "facet")
-            table[(ufl_element, "+")] = fiat_element.tabulate(order, x0)
-            table[(ufl_element, "-")] = fiat_element.tabulate(order, x1)
+            x0 = map_facet_points(cell, points, facet0, integral_type)
+            x1 = map_facet_points(cell, points, facet1, integral_type)
+            table[(ufl_element, "+")] = tabulate(ufl_element, fiat_element, order, x0)
+            table[(ufl_element, "-")] = tabulate(ufl_element, fiat_element, order, x1)
 
     return table
 
@@ -201,26 +215,22 @@ def _compute_product(psis, weights):
     # with the first dimension (corresponding to quadrature points)
     # and all internal dimensions removed.
 
-    # Initialize zero reference tensor (will be rearranged later)
+    # The sum is computed as a single contraction by einsum, labelling
+    # the dimensions of the Psis by 0 for quadrature points, 1 + i for
+    # internal Index i and consecutive numbers for the remaining
+    # dimensions, which make up the (not yet rearranged) reference tensor.
     (shape, indices) = _compute_shape(psis)
-    A0 = numpy.zeros(shape, dtype= numpy.float)
-
-    # Initialize list of internal multiindices
     bshape = _compute_internal_shape(psis)
-    bindices = build_indices([list(range(b)) for b in bshape]) or [[]]
-
-    # Sum over quadrature points and internal indices
-    num_points = len(weights)
-    for q in range(num_points):
-        for b in bindices:
-
-            # Compute outer products of subtables for current (q, b)
-            B = weights[q]
-            for (Psi, index, bpart) in psis:
-                B = numpy.multiply.outer(B, Psi[ tuple([q] + [b[i] for i in bpart])])
-
-            # Add product to reference tensor
-            numpy.add(A0, B, A0)
+    operands = [numpy.asarray(weights, dtype=numpy.float64), [0]]
+    labels = []
+    next_label = 1 + len(bshape)
+    for (Psi, index, bpart) in psis:
+        num_external = numpy.ndim(Psi) - 1 - len(bpart)
+        external = list(range(next_label, next_label + num_external))
+        next_label += num_external
+        operands += [Psi, [0] + [1 + i for i in bpart] + external]
+        labels += external
+    A0 = _einsum(operands + [labels])
 
     # Rearrange Indices as (primary, secondary)
     (rearrangement, num_indices) = _compute_rearrangement(indices)
@@ -228,6 +238,14 @@ def _compute_product(psis, weights):
 
     return A0
 
+def _einsum(args):
+    "Call einsum (with sublists of labels), optimizing the contraction order if supported."
+    try:
+        return numpy.einsum(*args, optimize=True)
+    except TypeError:
+        # NumPy < 1.12
+        return numpy.einsum(*args)
+
 def _compute_rearrangement(indices):
     """
     Compute rearrangement tuple for given list of Indices, so that the
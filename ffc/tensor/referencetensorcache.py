@@ -0,0 +1,125 @@
+"""This module provides a cache of reference tensors computed by
+integrate, such that the reference tensor of a monomial is computed
+only once, also across forms and (if a cache directory is set, see the
+parameter reference_tensor_cache_dir) across processes.
+
+Reference tensors are addressed by a signature of the monomial
+(elements, components, derivatives, restrictions and indices of the
+arguments and the float value), the integral type, the facets and the
+quadrature degree, rule and cell. On disk, they are stored as .npy
+files which are memory-mapped when loaded.
+"""
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+# Python modules
+import os
+import tempfile
+from hashlib import sha1
+
+import numpy
+
+# FFC modules
+from ffc import __version__ as FFC_VERSION
+from ffc.log import debug
+from ffc.utils import LRUCache
+
+__all__ = ["reference_tensor_signature", "load_reference_tensor",
+           "store_reference_tensor", "set_reference_tensor_cache_dir",
+           "reference_tensor_cache_info", "clear_reference_tensor_cache"]
+
+# Reference tensors computed or loaded by this process
+_tensors = LRUCache(maxsize=1024)
+
+# Directory in which reference tensors are stored (disabled if None)
+_cache_dir = None
+
+def set_reference_tensor_cache_dir(cache_dir):
+    "Set directory in which reference tensors are stored (disabled if empty)."
+    global _cache_dir
+    _cache_dir = cache_dir or None
+
+def reference_tensor_signature(monomial, integral_type, facet0, facet1,
+                               quadrature_degree, quadrature_rule, cell):
+    "Compute signature of reference tensor for given monomial and integral."
+    import FIAT
+    arguments = [(repr(v.element), v.restriction,
+                  [_index_signature(c) for c in v.components],
+                  [_index_signature(d) for d in v.derivatives],
+                  _index_signature(v.index))
+                 for v in monomial.arguments]
+    data = (FFC_VERSION, getattr(FIAT, "__version__", ""), repr(monomial.float_value),
+            arguments, integral_type, facet0, facet1, repr(quadrature_degree),
+            quadrature_rule, repr(cell))
+    return sha1(repr(data).encode("utf-8")).hexdigest()
+
+def load_reference_tensor(signature):
+    "Return copy of reference tensor with given signature, None if not found."
+    A0 = _tensors.get(signature)
+    if A0 is None and _cache_dir:
+        filename = _tensor_filename(signature)
+        if os.path.isfile(filename):
+            try:
+                A0 = numpy.load(filename, mmap_mode="r")
+            except (IOError, OSError, ValueError) as e:
+                debug("Ignoring unreadable cached reference tensor %s (%s)." % (filename, str(e)))
+                return None
+            _tensors[signature] = A0
+    if A0 is None:
+        return None
+    debug("Reusing reference tensor from cache.")
+    return numpy.array(A0)
+
+def store_reference_tensor(signature, A0):
+    "Store reference tensor with given signature."
+    A0 = numpy.array(A0, dtype=numpy.float64)
+    _tensors[signature] = A0
+    if not _cache_dir:
+        return
+    if not os.path.isdir(_cache_dir):
+        try:
+            os.makedirs(_cache_dir)
+        except OSError:
+            # May have been created by another process
+            pass
+
+    # Write to a temporary file and rename, such that concurrent
+    # readers never see a partially written entry
+    fd, tmpname = tempfile.mkstemp(dir=_cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            numpy.save(f, A0)
+        os.rename(tmpname, _tensor_filename(signature))
+    finally:
+        # Remove temporary file if not renamed
+        if os.path.exists(tmpname):
+            os.remove(tmpname)
+
+def reference_tensor_cache_info():
+    "Return dictionary of statistics of the in-memory cache."
+    info = _tensors.info()
+    info["cache_dir"] = _cache_dir
+    return info
+
+def clear_reference_tensor_cache():
+    "Remove all reference tensors from the in-memory cache."
+    _tensors.clear()
+
+def _index_signature(index):
+    return (index.index_type, tuple(index.index_range), index.index_id)
+
+def _tensor_filename(signature):
+    return os.path.join(_cache_dir, "ffc_A0_%s.npy" % signature)
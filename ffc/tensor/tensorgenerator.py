@@ -33,6 +33,7 @@ from ffc.cpp import format, remove_unused, count_ops
 # FFC tensor representation modules
 from ffc.tensor.monomialtransformation import MonomialIndex
 from ffc.representationutils import initialize_integral_code
+from ffc.profiling import profiled
 
 def generate_integral_code(ir, prefix, parameters):
     "Generate code for integral from intermediate representation."
@@ -41,6 +42,7 @@ def generate_integral_code(ir, prefix, parameters):
     return code
 
 
+@profiled("tabulate_tensor")
 def _tabulate_tensor(ir, parameters):
     "Generate code for tabulate_tensor."
 
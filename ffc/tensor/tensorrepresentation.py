@@ -35,6 +35,7 @@ from ffc.representationutils import initialize_integral_ir
 from ffc.tensor.monomialextraction import extract_monomial_form
 from ffc.tensor.monomialtransformation import transform_monomial_form
 from ffc.tensor.referencetensor import ReferenceTensor
+from ffc.tensor.referencetensorcache import set_reference_tensor_cache_dir
 from ffc.tensor.geometrytensor import GeometryTensor
 from ffc.tensor.tensorreordering import reorder_entries
 
@@ -47,6 +48,9 @@ def compute_integral_ir(itg_data,
 
     info("Computing tensor representation")
 
+    # Set directory for storing reference tensors
+    set_reference_tensor_cache_dir(parameters.get("reference_tensor_cache_dir"))
+
     # Extract monomial representation
     integrands = [itg.integrand() for itg in itg_data.integrals]
     monomial_form = extract_monomial_form(integrands, form_data.function_replace_map)
@@ -19,12 +19,17 @@
 # Modified by Martin Alnaes 2014
 
 # Python modules.
+import os
 import operator
 import functools
 import itertools
+import collections
+import threading
+import multiprocessing
+import multiprocessing.pool
 
 # FFC modules.
-from .log import error
+from .log import error, warning
 
 from ufl.utils.sequences import product
 
@@ -66,3 +71,93 @@ class Bunch(object):
 
     def __init__(self, **kwargs):
         self.__dict__.update(**kwargs)
+
+class LRUCache(object):
+    """A dictionary-like cache holding at most maxsize items. When full,
+    the least recently used item is discarded. The number of lookups
+    hitting and missing the cache is recorded. The cache may be used
+    from several threads."""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        "Return value for key (and mark it as recently used) or default."
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data[key] = value
+            self.hits += 1
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        "Remove all items and reset statistics."
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        "Return dictionary of cache statistics."
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "size": len(self._data), "maxsize": self.maxsize}
+
+# Function and arguments of tasks run by parallel_map, inherited by
+# the forked worker processes such that only results need to be pickled
+_tasks = None
+
+def parallel_map(function, args, num_processes):
+    """Apply function to each tuple of arguments and return the list of
+    results (in the order of the arguments). If num_processes is not 1,
+    the function is applied in parallel in up to num_processes forked
+    processes (one per CPU if 0). Falls back to serial computation if
+    the results cannot be transferred between processes."""
+    global _tasks
+
+    if num_processes == 1 or len(args) < 2 or not hasattr(os, "fork"):
+        return [function(*a) for a in args]
+
+    # Fork workers, such that they inherit the tasks
+    if hasattr(multiprocessing, "get_context"):
+        pool_class = multiprocessing.get_context("fork").Pool
+    else:
+        pool_class = multiprocessing.Pool
+    num_processes = min(num_processes or multiprocessing.cpu_count(), len(args))
+    _tasks = (function, args)
+    pool = pool_class(num_processes)
+    try:
+        return pool.map(_run_task, range(len(args)))
+    except multiprocessing.pool.MaybeEncodingError as e:
+        warning("Unable to run %s in parallel, falling back to serial "\
+                "computation (%s)." % (function.__name__, str(e)))
+        return [function(*a) for a in args]
+    finally:
+        pool.terminate()
+        pool.join()
+        _tasks = None
+
+def _run_task(i):
+    "Run task with given number (in worker process)."
+    function, args = _tasks
+    return function(*args[i])
@@ -17,7 +17,7 @@ if sys.version_info < (2, 7):
 VERSION = re.findall('__version__ = "(.*)"',
                      open('ffc/__init__.py', 'r').read())[0]
 
-SCRIPTS = [os.path.join("scripts", "ffc")]
+SCRIPTS = [os.path.join("scripts", "ffc"), os.path.join("scripts", "ffc-cache")]
 
 AUTHORS = """\
 Anders Logg, Kristian Oelgaard, Marie Rognes, Garth N. Wells,
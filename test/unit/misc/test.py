@@ -36,6 +36,20 @@ from ufl import *
 from ffc.fiatinterface import create_element as create
 from ffc import jit
 
+# Import tests
+from .testjitcache import JITCacheTests
+from .testsplitclasses import SplitClassesTests
+from .testircache import IRCacheTests
+from .testparallelsimplify import ParallelSimplifyTests
+from .testtabulationcache import TabulationCacheTests
+from .testreferencetensorcache import ReferenceTensorCacheTests
+from .testparallelmap import ParallelMapTests
+from .testprofiling import ProfilerTests
+from .testelementcache import ElementCacheTests
+from .testquadratureschemes import QuadratureSchemesTests
+from .testreferencetensorproduct import ReferenceTensorProductTests
+from .testremoveunused import RemoveUnusedTests
+
 interval = [(0,), (1,)]
 triangle = [(0, 0), (1, 0), (0, 1)]
 tetrahedron = [(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1)]
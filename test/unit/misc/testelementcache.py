@@ -0,0 +1,72 @@
+"Unit tests for the cache of FIAT elements"
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from ufl import *
+from ffc.utils import LRUCache
+from ffc.fiatinterface import create_element, element_cache_info, clear_element_cache
+
+class ElementCacheTests(unittest.TestCase):
+
+    def testLRUCache(self):
+        "Test that the least recently used item is discarded."
+        cache = LRUCache(maxsize=2)
+        cache["a"] = 1
+        cache["b"] = 2
+        self.assertEqual(cache.get("a"), 1)
+        cache["c"] = 3
+        self.assertEqual(len(cache), 2)
+        self.assertTrue("a" in cache)
+        self.assertFalse("b" in cache)
+        self.assertEqual(cache.get("b"), None)
+        self.assertEqual(cache.get("b", 0), 0)
+
+        # Replacing an item marks it as recently used
+        cache["a"] = 4
+        cache["d"] = 5
+        self.assertEqual(cache.get("a"), 4)
+        self.assertFalse("c" in cache)
+
+        self.assertEqual(cache.info(), {"hits": 2, "misses": 2, "size": 2, "maxsize": 2})
+        cache.clear()
+        self.assertEqual(cache.info(), {"hits": 0, "misses": 0, "size": 0, "maxsize": 2})
+
+    def testElementCache(self):
+        "Test that equal UFL elements share the FIAT element."
+        clear_element_cache()
+        element0 = FiniteElement("Lagrange", triangle, 2)
+        element1 = FiniteElement("Lagrange", triangle, 2)
+        self.assertFalse(element0 is element1)
+        fiat_element = create_element(element0)
+        self.assertTrue(create_element(element1) is fiat_element)
+        info = element_cache_info()
+        self.assertEqual(info["size"], 1)
+        self.assertEqual(info["misses"], 1)
+        self.assertEqual(info["hits"], 1)
+
+        # Different elements
+        create_element(FiniteElement("Lagrange", triangle, 1))
+        create_element(VectorElement("Lagrange", triangle, 2))
+        self.assertEqual(element_cache_info()["size"], 3)
+
+        clear_element_cache()
+        self.assertEqual(element_cache_info()["size"], 0)
+        self.assertFalse(create_element(element0) is fiat_element)
+
+if __name__ == "__main__":
+    unittest.main()
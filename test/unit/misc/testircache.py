@@ -0,0 +1,93 @@
+"Unit tests for the persistent cache of intermediate representations"
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import glob
+import marshal
+import shutil
+import tempfile
+import unittest
+
+from ufl import *
+from ffc import compile_form, default_parameters
+from ffc.ircache import _encode, _decode, IRCacheError
+
+class IRCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.output_dir, "ir")
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def _compile(self, representation, ir_cache_dir):
+        "Compile Stokes forms with facet integrals, return generated code without comments."
+        P2 = VectorElement("Lagrange", triangle, 2)
+        P1 = FiniteElement("Lagrange", triangle, 1)
+        f = Coefficient(P1)
+        (u, p) = TrialFunctions(P2*P1)
+        (v, q) = TestFunctions(P2*P1)
+        a = f*inner(grad(u), grad(v))*dx - div(v)*p*dx + q*div(u)*dx \
+            + inner(avg(u), avg(v))*dS
+        L = f*v[0]*dx + f*q*ds
+        parameters = default_parameters()
+        parameters["format"] = "dolfin"
+        parameters["representation"] = representation
+        parameters["output_dir"] = self.output_dir
+        parameters["ir_cache_dir"] = ir_cache_dir
+        compile_form([a, L], prefix="IRCache", parameters=parameters)
+        with open(os.path.join(self.output_dir, "IRCache.h")) as f:
+            lines = [l for l in f.read().split("\n") if not l.startswith("//")]
+        return "\n".join(lines)
+
+    def testIRCache(self):
+        "Test that the generated code is the same with and without the cache."
+        for representation in ("quadrature", "tensor"):
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            code = self._compile(representation, "")
+
+            # Generate code and store IR
+            self.assertEqual(self._compile(representation, self.cache_dir), code)
+            entries = glob.glob(os.path.join(self.cache_dir, "ffc_ir_*.ir"))
+            self.assertEqual(len(entries), 1)
+
+            # Generate code from the cached IR
+            self.assertEqual(self._compile(representation, self.cache_dir), code)
+
+    def testUFLObjects(self):
+        "Test that UFL cells and elements are recreated by their constructors."
+        P1 = FiniteElement("Lagrange", triangle, 1)
+        Q = TensorProductElement(FiniteElement("Lagrange", interval, 1),
+                                 FiniteElement("Discontinuous Lagrange", interval, 0))
+        objects = [triangle, TensorProductCell(interval, interval),
+                   FiniteElement("Q", quadrilateral, 2),
+                   VectorElement("Lagrange", triangle, 2, dim=3),
+                   TensorElement("Discontinuous Lagrange", tetrahedron, 0, symmetry=True),
+                   VectorElement("Lagrange", triangle, 2)*P1,
+                   EnrichedElement(P1, FiniteElement("Bubble", triangle, 3)),
+                   P1["facet"], BrokenElement(P1), HDivElement(Q)]
+        for obj in objects:
+            decoded = _decode(marshal.loads(marshal.dumps(_encode(obj))))
+            self.assertEqual(repr(decoded), repr(obj))
+            self.assertEqual(decoded, obj)
+
+        # Only known classes are constructed
+        self.assertRaises(IRCacheError, _decode, ("U", "system", [], ("D", []), ""))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"Unit tests for the in-memory caches of the JIT compiler"
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from ufl import *
+from ffc.jitcompiler import jit_form, jit_forms, jit_element
+from ffc.jitcompiler import jit_cache_info, clear_jit_cache
+from ffc.jitobject import JITObject
+
+class JITCacheTests(unittest.TestCase):
+
+    def testJITCache(self):
+        "Test that compiled modules are cached by signature."
+        clear_jit_cache()
+        parameters = {"log_level": WARNING}
+
+        # Equal forms, but different objects
+        element = FiniteElement("Lagrange", triangle, 1)
+        a0 = inner(grad(TestFunction(element)), grad(TrialFunction(element)))*dx
+        a1 = inner(grad(TestFunction(element)), grad(TrialFunction(element)))*dx
+        self.assertFalse(a0 is a1)
+
+        form0, module0, prefix0 = jit_form(a0, parameters)
+        form1, module1, prefix1 = jit_form(a1, parameters)
+        self.assertTrue(module1 is module0)
+        self.assertEqual(prefix1, prefix0)
+        info = jit_cache_info()
+        self.assertEqual(info["form"]["size"], 1)
+        self.assertEqual(info["form"]["misses"], 1)
+        self.assertEqual(info["form"]["hits"], 1)
+
+        # Compiling a list of forms or an element does not use the
+        # cache of jit_form
+        forms, module, prefix = jit_forms([a0, a1], parameters)
+        self.assertEqual(len(forms), 2)
+        self.assertFalse(module is module0)
+        jit_forms([a1, a0], parameters)
+        jit_element(element, parameters)
+        jit_element(FiniteElement("Lagrange", triangle, 1), parameters)
+        info = jit_cache_info()
+        self.assertEqual(info["form"]["size"], 1)
+        self.assertEqual(info["forms"]["size"], 1)
+        self.assertEqual(info["forms"]["hits"], 1)
+        self.assertEqual(info["element"]["size"], 1)
+        self.assertEqual(info["element"]["hits"], 1)
+
+        # Different parameters give a different module
+        parameters = {"log_level": WARNING, "cpp_optimize": False}
+        form2, module2, prefix2 = jit_form(a0, parameters)
+        self.assertNotEqual(prefix2, prefix0)
+        self.assertEqual(jit_cache_info()["form"]["size"], 2)
+
+        clear_jit_cache()
+        info = jit_cache_info()
+        self.assertEqual(sum(i["size"] for i in info.values()), 0)
+
+    def testJITSignature(self):
+        "Test that the signature of a form is not recomputed."
+        clear_jit_cache()
+        parameters = {"log_level": WARNING}
+        element = FiniteElement("Lagrange", triangle, 1)
+        a = TestFunction(element)*TrialFunction(element)*dx
+
+        # Count signature computations
+        signature = JITObject.signature
+        calls = []
+        def counted_signature(self):
+            calls.append(self)
+            return signature(self)
+        JITObject.signature = counted_signature
+        try:
+            form0, module0, prefix0 = jit_form(a, parameters)
+            form1, module1, prefix1 = jit_form(a, parameters)
+        finally:
+            JITObject.signature = signature
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(module1 is module0)
+        self.assertEqual(prefix1, prefix0)
+
+        # Different parameters give a different module name
+        parameters = {"log_level": WARNING, "cpp_optimize": False}
+        self.assertNotEqual(jit_form(a, parameters)[2], prefix0)
+        clear_jit_cache()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"Unit tests for computing representations in parallel"
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ufl import *
+from ffc import compile_form, default_parameters
+from ffc.log import push_level, pop_level, ERROR
+from ffc.utils import parallel_map
+
+def power(x, n):
+    return (os.getpid(), x**n)
+
+def make_function(x):
+    return lambda: x
+
+class ParallelMapTests(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def testParallelMap(self):
+        "Test that results are returned in the order of the arguments."
+        args = [(x, 2) for x in range(20)]
+        squares = [x**2 for x in range(20)]
+        for num_processes in (1, 2, 0):
+            results = parallel_map(power, args, num_processes)
+            self.assertEqual([r for (pid, r) in results], squares)
+            if num_processes == 1:
+                self.assertEqual(set(pid for (pid, r) in results), set([os.getpid()]))
+        self.assertEqual(parallel_map(power, [], 2), [])
+
+    def testFallback(self):
+        "Test that results which cannot be pickled are computed in serial."
+        push_level(ERROR)
+        try:
+            results = parallel_map(make_function, [(x,) for x in range(4)], 2)
+        finally:
+            pop_level()
+        self.assertEqual([f() for f in results], list(range(4)))
+
+    def _compile(self, num_processes):
+        "Compile forms, return generated code without comments."
+        element = VectorElement("Lagrange", triangle, 2)
+        f = Coefficient(FiniteElement("Lagrange", triangle, 1))
+        u = TrialFunction(element)
+        v = TestFunction(element)
+        a = f*inner(grad(u), grad(v))*dx + inner(avg(u), avg(v))*dS
+        L = f*v[0]*ds
+        parameters = default_parameters()
+        parameters["format"] = "ufc"
+        parameters["representation"] = "quadrature"
+        parameters["ir_num_processes"] = num_processes
+        parameters["output_dir"] = self.output_dir
+        compile_form([a, L], prefix="ParallelMap", parameters=parameters)
+        with open(os.path.join(self.output_dir, "ParallelMap.h")) as f:
+            lines = [l for l in f.read().split("\n") if not l.startswith("//")]
+        return "\n".join(lines)
+
+    def testParallelRepresentation(self):
+        "Test that the generated code does not depend on the number of processes."
+        code = self._compile(1)
+        self.assertEqual(self._compile(2), code)
+        self.assertEqual(self._compile(0), code)
+
+if __name__ == "__main__":
+    unittest.main()
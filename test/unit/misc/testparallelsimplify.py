@@ -0,0 +1,62 @@
+"Unit tests for optimising quadrature representations in parallel"
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ufl import *
+from ffc import compile_form, default_parameters
+
+class ParallelSimplifyTests(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def _compile(self, num_processes):
+        "Compile forms with -O, return generated code without comments."
+        element = VectorElement("Lagrange", triangle, 2)
+        f = Coefficient(FiniteElement("Lagrange", triangle, 1))
+        g = Coefficient(element)
+        u = TrialFunction(element)
+        v = TestFunction(element)
+        a = f*inner(grad(u), grad(v))*dx + f*inner(u, v)*ds \
+            + inner(avg(f)*jump(u), jump(v))*dS
+        L = f*inner(g, v)*ds + inner(avg(g), avg(v))*dS
+        parameters = default_parameters()
+        parameters["format"] = "ufc"
+        parameters["representation"] = "quadrature"
+        parameters["optimize"] = True
+        parameters["ir_num_processes"] = num_processes
+        parameters["output_dir"] = self.output_dir
+        compile_form([a, L], prefix="Parallel", parameters=parameters)
+        with open(os.path.join(self.output_dir, "Parallel.h")) as f:
+            lines = [l for l in f.read().split("\n") if not l.startswith("//")]
+        return "\n".join(lines)
+
+    def testParallelSimplify(self):
+        "Test that the generated code does not depend on the number of processes."
+        code = self._compile(1)
+        self.assertEqual(self._compile(2), code)
+        self.assertEqual(self._compile(4), code)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"Unit tests for the profiler of the compiler"
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from ufl import *
+from ffc import compile_form, default_parameters
+from ffc.profiling import Profiler, profile_section, profiled, active_profiler
+
+@profiled(lambda n: "sum %d" % n)
+def sum_range(n):
+    return sum(range(n))
+
+class ProfilerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def testProfiler(self):
+        "Test that nested sections are recorded."
+        # Nothing is recorded without a profiler
+        self.assertTrue(active_profiler() is None)
+        with profile_section("unused"):
+            self.assertEqual(sum_range(10), 45)
+
+        with Profiler("test") as profiler:
+            self.assertTrue(active_profiler() is profiler)
+            for i in range(3):
+                with profile_section("outer"):
+                    with profile_section("inner"):
+                        sum_range(1000)
+                    sum_range(10)
+
+            # Profilers may be nested
+            with Profiler("nested") as nested:
+                with profile_section("other"):
+                    pass
+            self.assertTrue(active_profiler() is profiler)
+        self.assertTrue(active_profiler() is None)
+
+        root = profiler.root
+        self.assertEqual(root.name, "test")
+        self.assertEqual(root.calls, 1)
+        self.assertEqual([c.name for c in root.children], ["outer"])
+        outer = root.children[0]
+        self.assertEqual(outer.calls, 3)
+        self.assertEqual([c.name for c in outer.children], ["inner", "sum 10"])
+        self.assertEqual(outer.children[0].children[0].name, "sum 1000")
+        self.assertEqual(outer.children[0].children[0].calls, 3)
+        self.assertTrue(root.wall_time >= outer.wall_time >= outer.children[0].wall_time)
+        self.assertEqual(len(root.find("sum 1000")), 1)
+        self.assertEqual([c.name for c in nested.root.children], ["other"])
+
+        # Dump to JSON
+        filename = os.path.join(self.output_dir, "profile.json")
+        profiler.dump(filename)
+        with open(filename) as f:
+            data = json.load(f)
+        self.assertEqual(data, json.loads(json.dumps(root.to_dict())))
+        self.assertEqual(data["children"][0]["name"], "outer")
+
+    def testProfileFile(self):
+        "Test that the compiler writes a profile of the stages."
+        element = FiniteElement("Lagrange", triangle, 1)
+        a = inner(grad(TestFunction(element)), grad(TrialFunction(element)))*dx
+        filename = os.path.join(self.output_dir, "profile.json")
+        parameters = default_parameters()
+        parameters["format"] = "ufc"
+        parameters["output_dir"] = self.output_dir
+        parameters["profile_file"] = filename
+        compile_form(a, prefix="Profile", parameters=parameters)
+        with open(filename) as f:
+            data = json.load(f)
+        self.assertEqual(data["name"], "Profile")
+        stages = [c["name"] for c in data["children"]]
+        for stage in ("stage 1: analysis", "stage 2: intermediate representation",
+                      "stage 3: optimization", "stage 4: code generation",
+                      "stage 5: formatting"):
+            self.assertTrue(stage in stages)
+        self.assertTrue(active_profiler() is None)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"Unit tests for the memoized quadrature rules and facet points"
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from ufl import *
+from ffc import compile_form, default_parameters
+from ffc.fiatinterface import reference_cell
+from ffc.quadrature_schemes import create_quadrature, map_facet_points, quadrature_cache_info
+from ffc.quadrature_schemes import clear_quadrature_cache
+
+class QuadratureSchemesTests(unittest.TestCase):
+
+    def testQuadratureRules(self):
+        "Test that quadrature rules are memoized and read-only."
+        for cell in ("triangle", "tetrahedron", "quadrilateral"):
+            points, weights = create_quadrature(cell, 4)
+            hits = quadrature_cache_info()["rules"]["hits"]
+            self.assertTrue(create_quadrature(cell, 4)[0] is points)
+            self.assertEqual(quadrature_cache_info()["rules"]["hits"], hits + 1)
+            self.assertEqual(len(points), len(weights))
+            self.assertRaises(ValueError, points.__setitem__, 0, 0.0)
+            self.assertRaises(ValueError, weights.__setitem__, 0, 0.0)
+
+        # The rule of a vertex has one point with no coordinates
+        points, weights = create_quadrature("vertex", 2)
+        self.assertEqual(points.shape, (1, 0))
+        self.assertEqual(list(weights), [1.0])
+
+        # Rules are created again after clearing the cache
+        clear_quadrature_cache()
+        self.assertEqual(quadrature_cache_info()["rules"]["size"], 0)
+        self.assertFalse(create_quadrature("vertex", 2)[0] is points)
+
+    def testMapFacetPoints(self):
+        "Test that points are mapped to facets as by FIAT."
+        for (cell, facet_cell) in ((triangle, "interval"), (tetrahedron, "triangle")):
+            points, weights = create_quadrature(facet_cell, 3)
+            for facet in range(cell.num_facets()):
+                t = reference_cell(cell).get_facet_transform(facet)
+                mapped_points = map_facet_points(cell, points, facet, "exterior_facet")
+                self.assertEqual(mapped_points.shape, (len(points), cell.topological_dimension()))
+                self.assertTrue(numpy.allclose(mapped_points, [t(p) for p in points]))
+                self.assertRaises(ValueError, mapped_points.__setitem__, 0, 0.0)
+
+                # Equal points give the memoized points
+                hits = quadrature_cache_info()["facet_points"]["hits"]
+                self.assertTrue(map_facet_points(cell, [tuple(p) for p in points],
+                                                 facet, "exterior_facet") is mapped_points)
+                self.assertEqual(quadrature_cache_info()["facet_points"]["hits"], hits + 1)
+
+        # Facets of intervals are vertices
+        points, weights = create_quadrature("vertex", 2)
+        for facet in range(2):
+            self.assertEqual(map_facet_points(interval, points, facet).tolist(), [[float(facet)]])
+
+    def testFacetIntegrals(self):
+        "Test that facet integrals, using mapped facet points, are compiled."
+        output_dir = tempfile.mkdtemp()
+        try:
+            for cell in (interval, triangle):
+                element = FiniteElement("Lagrange", cell, 2)
+                u = TrialFunction(element)
+                v = TestFunction(element)
+                a = u*v*ds + avg(u)*avg(v)*dS + inner(grad(u), grad(v))*dx
+                for representation in ("quadrature", "tensor"):
+                    parameters = default_parameters()
+                    parameters["format"] = "ufc"
+                    parameters["representation"] = representation
+                    parameters["output_dir"] = output_dir
+                    code = compile_form(a, prefix="Facet", parameters=parameters)
+                    self.assertTrue(code)
+        finally:
+            shutil.rmtree(output_dir)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"Unit tests for the cache of reference tensors"
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import glob
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from ufl import *
+from ffc import compile_form, default_parameters
+from ffc.tensor import referencetensorcache
+from ffc.tensor.referencetensorcache import clear_reference_tensor_cache
+
+class ReferenceTensorCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.output_dir, "A0")
+        clear_reference_tensor_cache()
+
+    def tearDown(self):
+        referencetensorcache.set_reference_tensor_cache_dir(None)
+        clear_reference_tensor_cache()
+        shutil.rmtree(self.output_dir)
+
+    def _compile(self, reference_tensor_cache_dir):
+        "Compile forms with tensor representation, return code without comments."
+        element = VectorElement("Lagrange", triangle, 2)
+        f = Coefficient(FiniteElement("Lagrange", triangle, 1))
+        u = TrialFunction(element)
+        v = TestFunction(element)
+        a = f*inner(grad(u), grad(v))*dx + inner(avg(u), avg(v))*dS
+        L = f*v[1]*ds
+        parameters = default_parameters()
+        parameters["format"] = "ufc"
+        parameters["representation"] = "tensor"
+        parameters["output_dir"] = self.output_dir
+        parameters["reference_tensor_cache_dir"] = reference_tensor_cache_dir
+        compile_form([a, L], prefix="ReferenceTensor", parameters=parameters)
+        with open(os.path.join(self.output_dir, "ReferenceTensor.h")) as f:
+            lines = [l for l in f.read().split("\n") if not l.startswith("//")]
+        return "\n".join(lines)
+
+    def testReferenceTensorCache(self):
+        "Test that cached reference tensors equal freshly computed ones."
+        code = self._compile("")
+
+        # Compute and store reference tensors
+        clear_reference_tensor_cache()
+        self.assertEqual(self._compile(self.cache_dir), code)
+        self.assertTrue(glob.glob(os.path.join(self.cache_dir, "ffc_A0_*.npy")))
+
+        # Load reference tensors from the cache directory
+        clear_reference_tensor_cache()
+        self.assertEqual(self._compile(self.cache_dir), code)
+
+    def testStoreFailure(self):
+        "Test that no temporary file is left if a reference tensor cannot be stored."
+        referencetensorcache.set_reference_tensor_cache_dir(self.cache_dir)
+        save = numpy.save
+        def failing_save(f, A0):
+            raise IOError("No space left on device")
+        numpy.save = failing_save
+        try:
+            self.assertRaises(IOError, referencetensorcache.store_reference_tensor,
+                              "signature", numpy.ones((3, 3)))
+        finally:
+            numpy.save = save
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"Unit tests for the product of tables of the tensor representation"
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+import numpy
+
+from ffc.tensor.multiindex import build_indices
+from ffc.tensor.monomialtransformation import MonomialIndex
+from ffc.tensor.monomialintegration import _compute_product, _compute_shape, \
+     _compute_internal_shape, _compute_rearrangement
+
+def index(index_type, index_id):
+    return MonomialIndex(index_type=index_type, index_range=[], index_id=index_id)
+
+def naive_product(psis, weights):
+    "Compute product of Psis by summing over points and internal indices."
+    (shape, indices) = _compute_shape(psis)
+    bshape = _compute_internal_shape(psis)
+    A0 = numpy.zeros(shape)
+    bindices = build_indices([list(range(b)) for b in bshape]) or [[]]
+    for q in range(len(weights)):
+        for b in bindices:
+            B = weights[q]
+            for (Psi, index, bpart) in psis:
+                B = numpy.multiply.outer(B, Psi[tuple([q] + [b[i] for i in bpart])])
+            A0 += B
+    (rearrangement, num_indices) = _compute_rearrangement(indices)
+    return numpy.transpose(A0, rearrangement)
+
+class ReferenceTensorProductTests(unittest.TestCase):
+
+    def testProduct(self):
+        "Test that the product equals the sum over points and internal indices."
+        numpy.random.seed(0)
+        num_points = 6
+        weights = numpy.random.rand(num_points)
+        I, P, S = MonomialIndex.INTERNAL, MonomialIndex.PRIMARY, MonomialIndex.SECONDARY
+
+        # Psis of mass matrix, stiffness matrix (contracted derivatives)
+        # and a weighted vector Laplacian with coefficient (secondary
+        # index) and two internal indices
+        cases = [[(numpy.random.rand(num_points, 3), [index(P, 0)], []),
+                  (numpy.random.rand(num_points, 3), [index(P, 1)], [])],
+                 [(numpy.random.rand(num_points, 2, 3), [index(I, 0), index(P, 0)], [0]),
+                  (numpy.random.rand(num_points, 2, 4), [index(I, 0), index(P, 1)], [0])],
+                 [(numpy.random.rand(num_points, 2, 3, 5), [index(I, 0), index(I, 1), index(P, 1)], [0, 1]),
+                  (numpy.random.rand(num_points, 2, 3, 4), [index(I, 0), index(I, 1), index(P, 0)], [0, 1]),
+                  (numpy.random.rand(num_points, 3), [index(S, 0)], [])]]
+        for psis in cases:
+            A0 = _compute_product(psis, weights)
+            B0 = naive_product(psis, weights)
+            self.assertEqual(A0.shape, B0.shape)
+            self.assertTrue(numpy.allclose(A0, B0, rtol=1e-14, atol=1e-14))
+
+if __name__ == "__main__":
+    unittest.main()
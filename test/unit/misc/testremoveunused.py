@@ -0,0 +1,73 @@
+"Unit tests for the removal of unused variables from generated code"
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from ffc.cpp import remove_unused
+
+class RemoveUnusedTests(unittest.TestCase):
+
+    def _check(self, code, expected, used_set=set()):
+        self.assertEqual(remove_unused("\n".join(code), used_set), "\n".join(expected))
+
+    def testUnused(self):
+        "Test that declarations of unused variables are removed."
+        self._check(["double a = 1.0;",
+                     "double b = 2.0;",
+                     "A[0] = b;"],
+                    ["double b = 2.0;",
+                     "A[0] = b;"])
+
+        # Variables used only by removed variables are removed
+        self._check(["double a = 1.0;",
+                     "const double b = 2.0*a;",
+                     "A[0] = 0.0;"],
+                    ["A[0] = 0.0;"])
+
+        # Variables known to be used are kept
+        self._check(["double a = 1.0;"], ["double a = 1.0;"], set(["a"]))
+
+        # Uses in comments or before the declaration do not count
+        self._check(["A[0] = x;",
+                     "double x = 1.0;",
+                     "// A[0] = x;"],
+                    ["A[0] = x;",
+                     "// A[0] = x;"])
+
+    def testUsed(self):
+        "Test that variables used in expressions, arrays and calls are kept."
+        code = ["double y[2];",
+                "unsigned int n = 2;",
+                "double x_0 = 1.0;",
+                "const double w0 = std::sqrt(x_0);",
+                "int i = 0;",
+                "bool b = true;",
+                "for (unsigned int r = 0; r < n; r++)",
+                "  y[r] = w0;",
+                "if (!b)",
+                "  A[i] = y[0] + f(x_0,w0);"]
+        self._check(code, code)
+
+        # Names which are prefixes of used names
+        self._check(["double w = 1.0;",
+                     "double w0 = 2.0;",
+                     "A[0] = w0;"],
+                    ["double w0 = 2.0;",
+                     "A[0] = w0;"])
+
+if __name__ == "__main__":
+    unittest.main()
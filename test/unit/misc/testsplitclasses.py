@@ -0,0 +1,95 @@
+"Unit tests for writing one implementation file per class"
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import glob
+import shutil
+import tempfile
+import unittest
+
+from ufl import *
+from ffc import compile_form, default_parameters
+
+class SplitClassesTests(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def _compile(self, prefix, split_classes):
+        """Compile Poisson form with split, return names of files in the
+        output directory and of the implementation files reported."""
+        element = FiniteElement("Lagrange", triangle, 1)
+        f = Coefficient(element)
+        a = f*inner(grad(TestFunction(element)), grad(TrialFunction(element)))*dx
+        L = f*TestFunction(element)*ds
+        parameters = default_parameters()
+        parameters["format"] = "ufc"
+        parameters["representation"] = "quadrature"
+        parameters["split"] = True
+        parameters["split_classes"] = split_classes
+        parameters["output_dir"] = self.output_dir
+        filenames = []
+        compile_form([a, L], prefix=prefix, parameters=parameters,
+                     filenames=filenames)
+        return (sorted(os.path.basename(f) for f in
+                       glob.glob(os.path.join(self.output_dir, prefix + "*"))),
+                [os.path.basename(f) for f in filenames])
+
+    def _read(self, filename):
+        "Read code without comments, naming classes as with prefix Split1."
+        with open(os.path.join(self.output_dir, filename)) as f:
+            lines = [l for l in f.read().split("\n") if not l.startswith("//")]
+        code = "\n".join(lines)
+        for (old, new) in (("Split0", "Split1"), ("split0", "split1"),
+                           ("SPLIT0", "SPLIT1")):
+            code = code.replace(old, new)
+        return code
+
+    def testSplitClasses(self):
+        "Test that split_classes writes the classes of split to separate files."
+        split0, written0 = self._compile("Split0", False)
+        split1, written1 = self._compile("Split1", True)
+        self.assertEqual(split0, ["Split0.cpp", "Split0.h"])
+        self.assertEqual(written0, ["Split0.cpp"])
+
+        # Same header
+        self.assertTrue("Split1.h" in split1)
+        self.assertEqual(self._read("Split1.h"), self._read("Split0.h"))
+
+        # One file for each class
+        sources = ["Split1_%d.cpp" % i for i in range(len(split1) - 1)]
+        self.assertTrue(len(sources) > 1)
+        self.assertEqual(sorted(sources + ["Split1.h"]), split1)
+        self.assertEqual(written1, sources)
+        codes = [self._read(f) for f in sources]
+        for code in codes:
+            self.assertEqual(code.count("::~"), 1)
+
+        # Each file includes the header, followed by the classes in the
+        # same order as in the single implementation file
+        include = '#include "Split1.h"\n'
+        head = codes[0][:codes[0].index(include) + len(include)]
+        for code in codes:
+            self.assertTrue(code.startswith(head))
+        self.assertEqual(self._read("Split0.cpp"),
+                         head + "".join(c[len(head):] for c in codes))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"Unit tests for the cache of tables tabulated by FIAT"
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from ufl import *
+from ffc.tabulationcache import tabulate, set_tabulation_cache_dir, clear_tabulation_cache
+
+class CountingElement:
+    "Element returning given tables, counting calls to tabulate."
+
+    def __init__(self, table):
+        self.table = table
+        self.num_calls = 0
+
+    def tabulate(self, order, points):
+        self.num_calls += 1
+        return self.table
+
+class TabulationCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        set_tabulation_cache_dir(self.cache_dir)
+        clear_tabulation_cache()
+
+    def tearDown(self):
+        set_tabulation_cache_dir(None)
+        clear_tabulation_cache()
+        shutil.rmtree(self.cache_dir)
+
+    def testTabulationCache(self):
+        "Test that tables are loaded from the cache directory."
+        element = FiniteElement("Lagrange", triangle, 1)
+        points = numpy.array([[0.25, 0.25], [0.5, 0.25]])
+
+        # Tables of derivatives of a triangle and of a vertex (empty
+        # derivative)
+        for table in ({(0, 0): numpy.ones((3, 2)), (1, 0): numpy.zeros((3, 2)),
+                       (0, 1): numpy.arange(6.0).reshape(3, 2)},
+                      {(): numpy.ones((3, 2))}):
+            fiat_element = CountingElement(table)
+            tabulate(element, fiat_element, len(table), points)
+            clear_tabulation_cache()
+            result = tabulate(element, fiat_element, len(table), points)
+            self.assertEqual(fiat_element.num_calls, 1)
+            self.assertEqual(sorted(result), sorted(table))
+            for derivative in table:
+                self.assertTrue((result[derivative] == table[derivative]).all())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -40,6 +40,7 @@ from .testfractionoperators import TestFractionOperators
 from .testmixedsymbols import TestMixedSymbols
 from .testexpandoperations import TestExpandOperations
 from .testreducevartype import TestReduceVarType
+from .testmemoizereducevartype import TestMemoizeReduceVarType
 from .testreduceoperations import TestReduceOperations
 from .testnotfinished import TestNotFinished
 from .testdgelastodyn import TestDGElastoDyn
@@ -50,6 +51,7 @@ from .testelasticityterm import TestElasticityTerm
 from .testelasweighted import TestElasWeighted
 from .testelasweighted2 import TestElasWeighted2
 from .testrealexamples import TestRealExamples
+from .testcachescope import TestCacheScope
 
 class TestSingle(unittest.TestCase):
 
@@ -107,6 +109,7 @@ def suite():
     suite.addTest(TestMixedSymbols('testMixedSymbols'))
     suite.addTest(TestExpandOperations('testExpandOperations'))
     suite.addTest(TestReduceVarType('testReduceVarType'))
+    suite.addTest(TestMemoizeReduceVarType('testMemoizeReduceVarType'))
     suite.addTest(TestReduceOperations('testReduceOperations'))
 
     # Misc.
@@ -126,6 +129,9 @@ def suite():
     # Various bug encounters
     suite.addTest(TestRealExamples('testRealExamples'))
 
+    # Caches of expressions
+    suite.addTest(TestCacheScope('testCacheScope'))
+
     return suite
 
 if __name__ == "__main__":
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"Tests of the caches of symbolic expressions."
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+# Pyhton modules
+import unittest
+
+# FFC modules
+from ffc.quadrature.symbolics import *
+from ffc.quadrature.symbolics import symbolics_cache_info, \
+     clear_symbolics_cache, symbolics_cache_scope
+from ffc.cpp import format, set_float_formatting
+from ffc.parameters import FFC_PARAMETERS
+set_float_formatting(FFC_PARAMETERS["precision"])
+
+class TestCacheScope(unittest.TestCase):
+
+    def testCacheScope(self):
+        "Test caches of expressions in (nested) scopes."
+        clear_symbolics_cache()
+
+        with symbolics_cache_scope():
+            x0 = create_symbol("x", GEO)
+            with symbolics_cache_scope():
+                p0 = create_product([create_float(2), x0])
+            # Caches are kept until the outermost scope is left
+            self.assertTrue(create_symbol("x", GEO) is x0)
+            self.assertTrue(create_product([create_float(2), x0]) is p0)
+            self.assertTrue(symbolics_cache_info()["canonical"] > 0)
+
+        info = symbolics_cache_info()
+        self.assertEqual(sum(n for k, n in info.items() if k != "maxsize"), 0)
+
+        # New expressions are equal to the old ones, but not the same object
+        x1 = create_symbol("x", GEO)
+        p1 = create_product([create_float(2), x1])
+        self.assertFalse(x1 is x0)
+        self.assertEqual(x1, x0)
+        self.assertEqual(p1, p0)
+        self.assertEqual(hash(p1), hash(p0))
+
+        # Directly created expressions are equal to cached ones
+        self.assertEqual(Symbol("x", GEO), x1)
+        self.assertEqual(Product([FloatValue(2), Symbol("x", GEO)]), p1)
+
+        # Caches are also cleared if an exception leaves the scope
+        try:
+            with symbolics_cache_scope():
+                create_symbol("y", GEO)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(symbolics_cache_info()["symbol"], 0)
+
+if __name__ == "__main__":
+
+    # Run all returned tests
+    runner = unittest.TextTestRunner()
+    runner.run(TestCacheScope('testCacheScope'))
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"Tests of the memoization of reduce_vartype."
+
+# This file is part of FFC.
+#
+# FFC is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# FFC is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with FFC. If not, see <http://www.gnu.org/licenses/>.
+
+# Pyhton modules
+import unittest
+
+# FFC modules
+from ffc.quadrature.symbolics import *
+from ffc.quadrature.symbolics import symbolics_cache_scope
+from ffc.cpp import format, set_float_formatting
+from ffc.parameters import FFC_PARAMETERS
+set_float_formatting(FFC_PARAMETERS['precision'])
+
+class TestMemoizeReduceVarType(unittest.TestCase):
+
+    def testMemoizeReduceVarType(self):
+        "Test that memoized and plain reduce_vartype give the same results."
+        B0 = Symbol("B0", BASIS)
+        B1 = Symbol("B1", BASIS)
+        I0 = Symbol("I0", IP)
+        I1 = Symbol("I1", IP)
+        G0 = Symbol("G0", GEO)
+        G1 = Symbol("G1", GEO)
+        C0 = Symbol("C0", CONST)
+        f2 = FloatValue(2)
+
+        p0 = Product([B0, I0, G0])
+        p1 = Product([f2, B1, I1, C0])
+        S0 = Sum([p0, p1, Product([B0, I1, G1])])
+        F0 = Fraction(Sum([I0, I1]), Sum([G0, G1]))
+        expressions = [p0, p1, S0,
+                       Product([B0, F0]),
+                       Sum([Product([B1, F0]), Product([B1, G0, I0])]),
+                       Fraction(S0, Sum([G0, C0])),
+                       Product([S0, Sum([G0, Product([f2, G1])])]).expand()]
+
+        classes = (Sum, Product, Fraction)
+        memoized = dict((cls, cls.__dict__["reduce_vartype"]) for cls in classes)
+
+        def reduce_all():
+            return [(expr.reduce_vartype(t), expr.expand().reduce_vartype(t))
+                    for expr in expressions for t in (BASIS, IP, GEO, CONST)]
+
+        # Plain reduce_vartype
+        for cls in classes:
+            cls.reduce_vartype = memoized[cls].__wrapped__
+        try:
+            plain = reduce_all()
+        finally:
+            for cls in classes:
+                cls.reduce_vartype = memoized[cls]
+
+        with symbolics_cache_scope():
+            # Twice, such that the second results are found in the cache
+            self.assertEqual(reduce_all(), plain)
+            self.assertEqual(reduce_all(), plain)
+
+            # Modifying a result does not modify the cached one
+            reduced = S0.reduce_vartype(BASIS)
+            reduced.append(None)
+            self.assertEqual(S0.reduce_vartype(BASIS), plain[8][0])
+
+if __name__ == "__main__":
+
+    # Run all returned tests
+    runner = unittest.TextTestRunner()
+    runner.run(TestMemoizeReduceVarType('testMemoizeReduceVarType'))
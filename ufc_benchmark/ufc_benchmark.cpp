@@ -3,370 +3,531 @@
 //
 // The FEniCS Project (http://www.fenicsproject.org/) 2006-2015.
 
-#include <iostream>
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <functional>
+#include <random>
+#include <sstream>
+#include <stdexcept>
 #include <vector>
-using std::cout;
-using std::endl;
 using std::vector;
 
-#include <ctime>
-#define TMIN 3.0
-#define MMIN 1000
-
-#include "ufc_data.h"
-#include "ufc_reference_cell.h"
 #include "ufc_benchmark.h"
 
-clock_t __tic_time;
-
-void tic()
-{
-  __tic_time = clock();
-}
-
-double toc()
-{
-  clock_t __toc_time = clock();
-  double elapsed_time = ((double) (__toc_time - __tic_time)) / CLOCKS_PER_SEC;
-  return elapsed_time;
-}
-
-// Adaptive timing: make sure we run for at least TMIN to get reliable results
-double time_tabulate_tensor(ufc::cell_integral& integral, double *A, const double * const * w, const ufc::cell & c)
+namespace
 {
-  std::size_t M = MMIN;
-  while ( true )
+  // Vertices of reference cells
+  vector<vector<double> > reference_vertices(ufc::shape shape)
   {
-    tic();
-    for (std::size_t i = 0; i < M; i++)
+    switch (shape)
     {
-      integral.tabulate_tensor(A, w, c);
+    case ufc::interval:
+      return {{0.0}, {1.0}};
+    case ufc::triangle:
+      return {{0.0, 0.0}, {1.0, 0.0}, {0.0, 1.0}};
+    case ufc::quadrilateral:
+      return {{0.0, 0.0}, {0.0, 1.0}, {1.0, 0.0}, {1.0, 1.0}};
+    case ufc::tetrahedron:
+      return {{0.0, 0.0, 0.0}, {1.0, 0.0, 0.0}, {0.0, 1.0, 0.0}, {0.0, 0.0, 1.0}};
+    case ufc::hexahedron:
+      return {{0.0, 0.0, 0.0}, {0.0, 0.0, 1.0}, {0.0, 1.0, 0.0}, {0.0, 1.0, 1.0},
+              {1.0, 0.0, 0.0}, {1.0, 0.0, 1.0}, {1.0, 1.0, 0.0}, {1.0, 1.0, 1.0}};
+    default:
+      throw std::runtime_error("Invalid shape.");
     }
-    double t = toc();
-    if ( t >= TMIN )
-      return t / static_cast<double>(M);
-    M *= 10;
-    cout << "Elapsed time too short, increasing number of iterations to" << M << endl;
   }
 
-  return 0.0;
-}
-
-// Adaptive timing: make sure we run for at least TMIN to get reliable results
-double time_tabulate_tensor(ufc::exterior_facet_integral& integral, double *A, const double * const * w, const ufc::cell & c, std::size_t facet)
-{
-  std::size_t M = MMIN;
-  while ( true )
+  // Number of facets of reference cells
+  std::size_t num_facets(ufc::shape shape)
   {
-    tic();
-    for (std::size_t i = 0; i < M; i++)
+    switch (shape)
     {
-      integral.tabulate_tensor(A, w, c, facet);
+    case ufc::interval:      return 2;
+    case ufc::triangle:      return 3;
+    case ufc::quadrilateral: return 4;
+    case ufc::tetrahedron:   return 4;
+    case ufc::hexahedron:    return 6;
+    default:
+      throw std::runtime_error("Invalid shape.");
     }
-    double t = toc();
-    if ( t >= TMIN )
-      return t / static_cast<double>(M);
-    M *= 10;
-    cout << "Elapsed time too short, increasing number of iterations to" << M << endl;
   }
 
-  return 0.0;
-}
+  // Determinant of small square matrix (row major)
+  double determinant(const vector<double>& A, std::size_t n)
+  {
+    switch (n)
+    {
+    case 1:
+      return A[0];
+    case 2:
+      return A[0]*A[3] - A[1]*A[2];
+    case 3:
+      return A[0]*(A[4]*A[8] - A[5]*A[7])
+        - A[1]*(A[3]*A[8] - A[5]*A[6])
+        + A[2]*(A[3]*A[7] - A[4]*A[6]);
+    default:
+      throw std::runtime_error("Unsupported geometric dimension.");
+    }
+  }
 
-// Benchmark all integrals of a form.
-vector< vector<double> > benchmark(const ufc::form & form, bool print_tensor)
-{
-    // construct and allocate some stuff
-    ufc::ufc_data data(form);
+  // Generator of randomly perturbed cells, given by the coordinate
+  // dofs of the coordinate element of a form
+  class cell_generator
+  {
+  public:
 
-    // create a reference cell geometry
-    ufc::reference_cell c(data.elements[0]->cell_shape());
+    cell_generator(const ufc::form& form, std::mt19937& rng, bool affine)
+      : rng(rng), affine(affine), uniform(-1.0, 1.0)
+    {
+      std::unique_ptr<ufc::finite_element> element(form.create_coordinate_finite_element());
+      shape = element->cell_shape();
+      gdim = element->geometric_dimension();
+
+      // Coordinates of nodes of (scalar) coordinate element on the
+      // reference cell, embedded in the geometric dimension
+      std::unique_ptr<ufc::finite_element> scalar_element;
+      if (element->num_sub_elements() > 0)
+        scalar_element.reset(element->create_sub_element(0));
+      else
+        scalar_element.reset(element->create());
+      num_nodes = scalar_element->space_dimension();
+
+      const vector<vector<double> > vertices = reference_vertices(shape);
+      tdim = vertices[0].size();
+      vector<double> vertex_coordinates(vertices.size()*gdim, 0.0);
+      for (std::size_t i = 0; i < vertices.size(); i++)
+        for (std::size_t j = 0; j < vertices[i].size() && j < gdim; j++)
+          vertex_coordinates[i*gdim + j] = vertices[i][j];
+      reference_nodes.resize(num_nodes*gdim);
+      scalar_element->tabulate_dof_coordinates(reference_nodes.data(),
+                                               vertex_coordinates.data());
+    }
 
-    // data structures for times
-    vector<double> cell_times(form.num_cell_domains());
-    vector<double> exterior_facet_times(form.num_exterior_facet_domains());
-    vector<double> interior_facet_times(form.num_interior_facet_domains());
+    // Size of coordinate dofs of one cell
+    std::size_t size() const
+    { return num_nodes*gdim; }
 
-    // benchmark all cell integrals
-    for(unsigned i = 0; i < form.num_cell_domains(); i++)
+    // Generate coordinate dofs of a random cell
+    void generate(double* coordinate_dofs)
     {
-        cell_times[i] = time_tabulate_tensor(*data.cell_domains[i], data.A, data.w, c);
-
-        if(print_tensor)
-        {
-          cout << "Cell element tensor " << i << ":" << endl;
-          data.print_tensor();
-          cout << endl;
-        }
+      vector<double> A, b;
+      random_map(A, b);
+      for (std::size_t n = 0; n < num_nodes; n++)
+        for (std::size_t i = 0; i < gdim; i++)
+          coordinate_dofs[n*gdim + i] = map(A, b, &reference_nodes[n*gdim], i)
+            + perturbation();
     }
 
-    // benchmark all exterior facet integrals
-    for(unsigned i = 0; i < form.num_exterior_facet_domains(); i++)
+    // Generate coordinate dofs of a random cell and of its neighbour
+    // across the given facet. The neighbour is the image of the
+    // reference cell reflected across the facet, such that the facet
+    // has the same local number in both cells and the nodes on the
+    // facet coincide.
+    void generate_pair(double* coordinate_dofs_0, double* coordinate_dofs_1,
+                       std::size_t facet)
     {
-        std::size_t facet = 0; // TODO: would it be interesting to time all facets?
-        exterior_facet_times[i] = time_tabulate_tensor(*data.exterior_facet_domains[i], data.A, data.w, c, facet);
+      vector<double> A, b;
+      random_map(A, b);
 
-        if(print_tensor)
+      // Plane normal.X = d of the facet of the reference cell
+      vector<double> normal(gdim, 0.0);
+      double d = 0.0;
+      if (shape == ufc::triangle || shape == ufc::tetrahedron)
+      {
+        // Facet i is opposite vertex i
+        if (facet == 0)
         {
-          cout << "Exterior facet element tensor " << i << ":" << endl;
-          data.print_tensor();
-          cout << endl;
+          for (std::size_t j = 0; j < tdim; j++)
+            normal[j] = 1.0;
+          d = 1.0;
         }
-    }
-
-    // benchmark all interior facet integrals
-    /* // TODO: If somebody needs this, please implement it! Need two cells, and larger A.
-    for(unsigned i = 0; i < form.num_interior_facet_domains(); i++)
-    {
-        std::size_t facet = 0; // TODO: would it be interesting to time all facets?
-        interior_facet_times[i] = time_tabulate_tensor(*data.interior_facet_domains[i], data.A, data.w, c, facet);
+        else
+          normal[facet - 1] = 1.0;
+      }
+      else
+      {
+        // Facets 2j and 2j + 1 are at X_j = 0 and X_j = 1
+        normal[facet / 2] = 1.0;
+        d = facet % 2;
+      }
+      double nn = 0.0;
+      for (std::size_t j = 0; j < gdim; j++)
+        nn += normal[j]*normal[j];
 
-        if(print_tensor)
+      vector<double> X(gdim);
+      for (std::size_t n = 0; n < num_nodes; n++)
+      {
+        const double* X0 = &reference_nodes[n*gdim];
+        double s = -d;
+        for (std::size_t j = 0; j < gdim; j++)
+          s += normal[j]*X0[j];
+        const bool on_facet = std::abs(s) < 1e-12;
+        for (std::size_t j = 0; j < gdim; j++)
+          X[j] = X0[j] - 2.0*s/nn*normal[j];
+
+        for (std::size_t i = 0; i < gdim; i++)
         {
-          cout << "Interior facet element tensor " << i << ":" << endl;
-          data.print_tensor();
-          cout << endl;
+          const double p0 = perturbation();
+          const double p1 = on_facet ? p0 : perturbation();
+          coordinate_dofs_0[n*gdim + i] = map(A, b, X0, i) + p0;
+          coordinate_dofs_1[n*gdim + i] = map(A, b, X.data(), i) + p1;
         }
+      }
     }
-    */
-
-    vector< vector<double> > result(3);
-    result[0] = cell_times;
-    result[1] = exterior_facet_times;
-    result[2] = interior_facet_times;
-
-    return result;
-}
-
-
-vector< vector<double> > tabulate_cell_tensor(const ufc::form & form, vector< vector<double> > w, int domain)
-{
-  ufc::ufc_data data(form);
 
-  // copy w to the appropriate array
-  if(data.num_coefficients != w.size())
-      throw std::runtime_error("Wrong number of coefficients");
-  for(unsigned i=0; i<data.num_coefficients; i++)
-  {
-    if(data.dimensions[data.rank+i] != w[i].size())
-        throw std::runtime_error("Wrong coefficient dimension.");
-    for(unsigned j=0; j<data.dimensions[data.rank+i]; j++)
+    // Generate random point in reference cell
+    void generate_point(double* x, std::size_t tdim)
     {
-      data.w[i][j] = w[i][j];
+      const bool simplex = (shape == ufc::interval || shape == ufc::triangle
+                            || shape == ufc::tetrahedron);
+      while (true)
+      {
+        double sum = 0.0;
+        for (std::size_t i = 0; i < tdim; i++)
+        {
+          x[i] = 0.5*(uniform(rng) + 1.0);
+          sum += x[i];
+        }
+        if (!simplex || sum <= 1.0)
+          return;
+      }
     }
-  }
 
-  // create a reference cell geometry
-  ufc::reference_cell c(data.elements[0]->cell_shape());
+    ufc::shape shape;
+    std::size_t gdim;
 
-  // tabulate the tensor
-  data.cell_integrals[domain]->tabulate_tensor(data.A, data.w, c);
+  private:
 
-  // copy element tensor to stl-structure for easy returning to python (should perhaps rather use numpy and some typemaps, but I'm lazy)
-  vector< vector<double> > A;
-  if(data.rank == 2)
-  {
-    A.resize(data.dimensions[0]);
-    for(unsigned i=0; i<data.dimensions[0]; i++)
+    // Random affine map x = A X + b with positive determinant
+    void random_map(vector<double>& A, vector<double>& b)
     {
-      A[i].resize(data.dimensions[1]);
-      for(unsigned j=0; j<data.dimensions[1]; j++)
+      A.resize(gdim*gdim);
+      do
       {
-        A[i][j] = data.A[i*data.dimensions[1] + j];
+        for (std::size_t i = 0; i < gdim; i++)
+          for (std::size_t j = 0; j < gdim; j++)
+            A[i*gdim + j] = (i == j ? 1.0 : 0.0) + 0.25*uniform(rng);
       }
+      while (determinant(A, gdim) < 0.1);
+
+      b.resize(gdim);
+      for (std::size_t i = 0; i < gdim; i++)
+        b[i] = uniform(rng);
     }
-  }
-  else if(data.rank == 1)
-  {
-    A.resize(data.dimensions[0]);
-    for(unsigned i=0; i<data.dimensions[0]; i++)
+
+    // Component i of the image of reference point X
+    double map(const vector<double>& A, const vector<double>& b,
+               const double* X, std::size_t i) const
     {
-      A[i].resize(1);
-      A[i][0] = data.A[i];
+      double x = b[i];
+      for (std::size_t j = 0; j < gdim; j++)
+        x += A[i*gdim + j]*X[j];
+      return x;
     }
-  }
-  else if(data.rank == 0)
-  {
-    A.resize(1);
-    A[0].resize(1);
-    A[0][0] = data.A[0];
-  }
-  else
-  {
-    throw std::runtime_error("rank != 0,1,2 not implemented");
-  }
 
-  return A;
-}
-
-std::vector< std::vector<double> > tabulate_cell_integral(const std::shared_ptr<ufc::form> form, std::vector< std::vector<double> > w, ufc::cell cell, int domain)
-{
-  ufc::ufc_data data(*form);
+    // Perturbation of a node coordinate (nodes are perturbed
+    // independently for non-affine cells)
+    double perturbation()
+    { return affine ? 0.0 : 0.05*uniform(rng); }
 
-  // copy w to the appropriate array
-  if(data.num_coefficients != w.size())
-      throw std::runtime_error("Wrong number of coefficients");
-  for(unsigned i=0; i<data.num_coefficients; i++)
-  {
-    if(data.dimensions[data.rank+i] != w[i].size())
-        throw std::runtime_error("Wrong coefficient dimension.");
-    for(unsigned j=0; j<data.dimensions[data.rank+i]; j++)
-    {
-      data.w[i][j] = w[i][j];
-    }
-  }
+    std::mt19937& rng;
+    bool affine;
+    std::uniform_real_distribution<double> uniform;
+    std::size_t tdim;
+    std::size_t num_nodes;
+    vector<double> reference_nodes;
 
-  // tabulate the tensor
-  data.cell_integrals[domain]->tabulate_tensor(data.A, data.w, cell);
+  };
 
-  // copy element tensor to stl-structure for easy returning to python (should perhaps rather use numpy and some typemaps, but I'm lazy)
-  vector< vector<double> > A;
-  if(data.rank == 2)
+  // Random coefficients for all coefficients of a form (for a single
+  // cell or for two cells sharing a facet)
+  class coefficients
   {
-    A.resize(data.dimensions[0]);
-    for(unsigned i=0; i<data.dimensions[0]; i++)
+  public:
+
+    coefficients(const ufc::form& form, std::mt19937& rng, std::size_t num_cells)
     {
-      A[i].resize(data.dimensions[1]);
-      for(unsigned j=0; j<data.dimensions[1]; j++)
+      std::uniform_real_distribution<double> uniform(-1.0, 1.0);
+      const std::size_t r = form.rank();
+      for (std::size_t i = 0; i < form.num_coefficients(); i++)
       {
-        A[i][j] = data.A[i*data.dimensions[1] + j];
+        std::unique_ptr<ufc::finite_element> element(form.create_finite_element(r + i));
+        vector<double> values(num_cells*element->space_dimension());
+        for (std::size_t j = 0; j < values.size(); j++)
+          values[j] = uniform(rng);
+        data.push_back(values);
       }
+      for (std::size_t i = 0; i < data.size(); i++)
+        pointers.push_back(data[i].data());
     }
-  }
-  else if(data.rank == 1)
-  {
-    A.resize(data.dimensions[0]);
-    for(unsigned i=0; i<data.dimensions[0]; i++)
-    {
-      A[i].resize(1);
-      A[i][0] = data.A[i];
-    }
-  }
-  else if(data.rank == 0)
-  {
-    A.resize(1);
-    A[0].resize(1);
-    A[0][0] = data.A[0];
-  }
-  else
-  {
-    throw std::runtime_error("rank != 0,1,2 not implemented");
-  }
 
-  return A;
-}
+    const double * const * w() const
+    { return pointers.empty() ? 0 : pointers.data(); }
 
-std::vector< std::vector<double> > tabulate_exterior_facet_integral(const std::shared_ptr<ufc::form> form, std::vector< std::vector<double> > w, ufc::cell& cell, int facet, int domain)
-{
-  ufc::ufc_data data(*form);
+  private:
 
-  // copy w to the appropriate array
-  if(data.num_coefficients != w.size())
-      throw std::runtime_error("Wrong number of coefficients");
-  for(unsigned i=0; i<data.num_coefficients; i++)
-  {
-    if(data.dimensions[data.rank+i] != w[i].size())
-        throw std::runtime_error("Wrong coefficient dimension.");
-    for(unsigned j=0; j<data.dimensions[data.rank+i]; j++)
-    {
-      data.w[i][j] = w[i][j];
-    }
-  }
+    vector<vector<double> > data;
+    vector<const double*> pointers;
 
-  // tabulate the tensor
-  data.exterior_facet_integrals[domain]->tabulate_tensor(data.A, data.w, cell, facet);
+  };
 
-  // copy element tensor to stl-structure for easy returning to python (should perhaps rather use numpy and some typemaps, but I'm lazy)
-  vector< vector<double> > A;
-  if(data.rank == 2)
+  // Size of element tensor (for a single cell or two cells sharing a facet)
+  std::size_t tensor_size(const ufc::form& form, std::size_t num_cells)
   {
-    A.resize(data.dimensions[0]);
-    for(unsigned i=0; i<data.dimensions[0]; i++)
+    std::size_t size = 1;
+    for (std::size_t i = 0; i < form.rank(); i++)
     {
-      A[i].resize(data.dimensions[1]);
-      for(unsigned j=0; j<data.dimensions[1]; j++)
-      {
-        A[i][j] = data.A[i*data.dimensions[1] + j];
-      }
+      std::unique_ptr<ufc::finite_element> element(form.create_finite_element(i));
+      size *= num_cells*element->space_dimension();
     }
+    return size;
   }
-  else if(data.rank == 1)
-  {
-    A.resize(data.dimensions[0]);
-    for(unsigned i=0; i<data.dimensions[0]; i++)
-    {
-      A[i].resize(1);
-      A[i][0] = data.A[i];
-    }
-  }
-  else if(data.rank == 0)
+
+  // Value of percentile p (0 <= p <= 1) of sorted values
+  double percentile(const vector<double>& values, double p)
   {
-    A.resize(1);
-    A[0].resize(1);
-    A[0][0] = data.A[0];
+    const double x = p*(values.size() - 1);
+    const std::size_t i = static_cast<std::size_t>(x);
+    if (i + 1 >= values.size())
+      return values.back();
+    return values[i] + (x - i)*(values[i + 1] - values[i]);
   }
-  else
+
+  // Time calls to tabulate for cells 0, ..., num_cells - 1
+  integral_timing time_integral(const std::string& integral_type,
+                                int subdomain_id,
+                                const benchmark_options& options,
+                                vector<double>& A,
+                                std::function<void(std::size_t)> tabulate)
   {
-    throw std::runtime_error("rank != 0,1,2 not implemented");
-  }
+    typedef std::chrono::steady_clock clock;
 
-  return A;
-}
+    // Warm up caches and branch predictors
+    for (std::size_t r = 0; r < options.warmup; r++)
+      for (std::size_t c = 0; c < options.num_cells; c++)
+        tabulate(c);
 
-std::vector< std::vector<double> > tabulate_interior_facet_integral(const std::shared_ptr<ufc::form> form, std::vector< std::vector<double> > macro_w,\
-                                                                    ufc::cell& cell0, ufc::cell& cell1, int facet_0, int facet_1, int domain)
-{
-  ufc::ufc_data data(*form);
-
-  // copy w to the appropriate array
-  if(data.num_coefficients != macro_w.size())
-      throw std::runtime_error("Wrong number of coefficients");
-  for(unsigned i=0; i<data.num_coefficients; i++)
-  {
-    if(2*data.dimensions[data.rank+i] != macro_w[i].size())
-        throw std::runtime_error("Wrong coefficient dimension.");
-    for(unsigned j=0; j<2*data.dimensions[data.rank+i]; j++)
+    // Timed repetitions
+    vector<double> times;
+    for (std::size_t r = 0; r < options.repetitions; r++)
     {
-      data.macro_w[i][j] = macro_w[i][j];
+      const clock::time_point t0 = clock::now();
+      for (std::size_t c = 0; c < options.num_cells; c++)
+        tabulate(c);
+      const clock::time_point t1 = clock::now();
+      const double ns = std::chrono::duration<double, std::nano>(t1 - t0).count();
+      times.push_back(ns/options.num_cells);
     }
-  }
 
-  // tabulate the tensor
-  data.interior_facet_integrals[domain]->tabulate_tensor(data.macro_A, data.macro_w, cell0, cell1, facet_0, facet_1);
+    // Compute checksum (not timed)
+    double checksum = 0.0;
+    for (std::size_t c = 0; c < options.num_cells; c++)
+    {
+      std::fill(A.begin(), A.end(), 0.0);
+      tabulate(c);
+      for (std::size_t i = 0; i < A.size(); i++)
+        checksum += A[i];
+    }
 
-  // copy element tensor to stl-structure for easy returning to python (should perhaps rather use numpy and some typemaps, but I'm lazy)
-  vector< vector<double> > A;
-  if(data.rank == 2)
-  {
-    A.resize(2*data.dimensions[0]);
-    for(unsigned i=0; i<2*data.dimensions[0]; i++)
+    // Compute statistics
+    integral_timing timing;
+    timing.integral_type = integral_type;
+    timing.subdomain_id = subdomain_id;
+    timing.num_cells = options.num_cells;
+    timing.repetitions = options.repetitions;
+    timing.checksum = checksum;
+    if (times.empty())
     {
-      A[i].resize(2*data.dimensions[1]);
-      for(unsigned j=0; j<2*data.dimensions[1]; j++)
-      {
-        A[i][j] = data.macro_A[i*2*data.dimensions[1] + j];
-      }
+      timing.min = timing.median = timing.mean = timing.p10 = timing.p90 = timing.max = 0.0;
+      return timing;
     }
+    std::sort(times.begin(), times.end());
+    timing.min = times.front();
+    timing.max = times.back();
+    timing.median = percentile(times, 0.5);
+    timing.p10 = percentile(times, 0.1);
+    timing.p90 = percentile(times, 0.9);
+    double sum = 0.0;
+    for (std::size_t i = 0; i < times.size(); i++)
+      sum += times[i];
+    timing.mean = sum/times.size();
+
+    return timing;
   }
-  else if(data.rank == 1)
+
+  // Call function for each integral of given type (with subdomain id,
+  // -1 for the default integral)
+  template<typename T>
+  void for_each_integral(bool has_integrals,
+                         std::size_t max_subdomain_id,
+                         std::function<T*(std::size_t)> create,
+                         std::function<T*()> create_default,
+                         std::function<void(T&, int)> f)
   {
-    A.resize(2*data.dimensions[0]);
-    for(unsigned i=0; i<2*data.dimensions[0]; i++)
+    if (!has_integrals)
+      return;
+    for (std::size_t i = 0; i < max_subdomain_id; i++)
     {
-      A[i].resize(1);
-      A[i][0] = data.macro_A[i];
+      std::unique_ptr<T> integral(create(i));
+      if (integral)
+        f(*integral, static_cast<int>(i));
     }
+    std::unique_ptr<T> integral(create_default());
+    if (integral)
+      f(*integral, -1);
   }
-  else if(data.rank == 0)
-  {
-    A.resize(1);
-    A[0].resize(1);
-    A[0][0] = data.macro_A[0];
-  }
-  else
+}
+
+//-----------------------------------------------------------------------------
+std::vector<integral_timing> benchmark(const ufc::form & form,
+                                       const benchmark_options & options)
+{
+  std::mt19937 rng(options.seed);
+  cell_generator generator(form, rng, options.affine);
+  const std::size_t n = generator.size();
+  const std::size_t num_cells = options.num_cells;
+  const std::size_t facets = num_facets(generator.shape);
+  const std::size_t num_vertices = reference_vertices(generator.shape).size();
+  const std::size_t tdim = reference_vertices(generator.shape)[0].size();
+  const int orientation = 0;
+
+  // Generate random cells, and pairs of neighbouring cells for
+  // interior facets (sharing facet c % facets for pair c)
+  vector<double> coordinate_dofs(num_cells*n);
+  for (std::size_t c = 0; c < num_cells; c++)
+    generator.generate(coordinate_dofs.data() + c*n);
+  vector<double> macro_coordinate_dofs(2*num_cells*n);
+  for (std::size_t c = 0; c < num_cells; c++)
+    generator.generate_pair(macro_coordinate_dofs.data() + 2*c*n,
+                            macro_coordinate_dofs.data() + (2*c + 1)*n,
+                            c % facets);
+
+  // Generate random coefficients
+  const coefficients w(form, rng, 1);
+  const coefficients macro_w(form, rng, 2);
+
+  // Element tensors
+  vector<double> A(tensor_size(form, 1));
+  vector<double> macro_A(tensor_size(form, 2));
+
+  vector<integral_timing> timings;
+
+  // Cell integrals
+  for_each_integral<ufc::cell_integral>
+    (form.has_cell_integrals(), form.max_cell_subdomain_id(),
+     [&](std::size_t i) { return form.create_cell_integral(i); },
+     [&]() { return form.create_default_cell_integral(); },
+     [&](ufc::cell_integral& integral, int subdomain_id)
+     {
+       timings.push_back(time_integral
+         ("cell", subdomain_id, options, A, [&](std::size_t c)
+          { integral.tabulate_tensor(A.data(), w.w(), coordinate_dofs.data() + c*n,
+                                     orientation); }));
+     });
+
+  // Exterior facet integrals
+  for_each_integral<ufc::exterior_facet_integral>
+    (form.has_exterior_facet_integrals(), form.max_exterior_facet_subdomain_id(),
+     [&](std::size_t i) { return form.create_exterior_facet_integral(i); },
+     [&]() { return form.create_default_exterior_facet_integral(); },
+     [&](ufc::exterior_facet_integral& integral, int subdomain_id)
+     {
+       timings.push_back(time_integral
+         ("exterior_facet", subdomain_id, options, A, [&](std::size_t c)
+          { integral.tabulate_tensor(A.data(), w.w(), coordinate_dofs.data() + c*n,
+                                     c % facets, orientation); }));
+     });
+
+  // Interior facet integrals
+  for_each_integral<ufc::interior_facet_integral>
+    (form.has_interior_facet_integrals(), form.max_interior_facet_subdomain_id(),
+     [&](std::size_t i) { return form.create_interior_facet_integral(i); },
+     [&]() { return form.create_default_interior_facet_integral(); },
+     [&](ufc::interior_facet_integral& integral, int subdomain_id)
+     {
+       timings.push_back(time_integral
+         ("interior_facet", subdomain_id, options, macro_A, [&](std::size_t c)
+          { integral.tabulate_tensor(macro_A.data(), macro_w.w(),
+                                     macro_coordinate_dofs.data() + 2*c*n,
+                                     macro_coordinate_dofs.data() + (2*c + 1)*n,
+                                     c % facets, c % facets,
+                                     orientation, orientation); }));
+     });
+
+  // Vertex integrals
+  for_each_integral<ufc::vertex_integral>
+    (form.has_vertex_integrals(), form.max_vertex_subdomain_id(),
+     [&](std::size_t i) { return form.create_vertex_integral(i); },
+     [&]() { return form.create_default_vertex_integral(); },
+     [&](ufc::vertex_integral& integral, int subdomain_id)
+     {
+       timings.push_back(time_integral
+         ("vertex", subdomain_id, options, A, [&](std::size_t c)
+          { integral.tabulate_tensor(A.data(), w.w(), coordinate_dofs.data() + c*n,
+                                     c % num_vertices, orientation); }));
+     });
+
+  // Custom integrals, using random quadrature points (and cells for
+  // integrals involving more than one cell)
+  for_each_integral<ufc::custom_integral>
+    (form.has_custom_integrals(), form.max_custom_subdomain_id(),
+     [&](std::size_t i) { return form.create_custom_integral(i); },
+     [&]() { return form.create_default_custom_integral(); },
+     [&](ufc::custom_integral& integral, int subdomain_id)
+     {
+       const std::size_t num_points = options.num_quadrature_points;
+       const std::size_t num_integral_cells = integral.num_cells();
+       const std::size_t m = num_integral_cells*n;
+       vector<double> custom_dofs(num_cells*m);
+       for (std::size_t c = 0; c < num_cells*num_integral_cells; c++)
+         generator.generate(custom_dofs.data() + c*n);
+       vector<double> points(num_points*tdim);
+       for (std::size_t p = 0; p < num_points; p++)
+         generator.generate_point(points.data() + p*tdim, tdim);
+       vector<double> weights(num_points, 1.0/num_points);
+       vector<double> normals(num_points*generator.gdim, 0.0);
+       for (std::size_t p = 0; p < num_points; p++)
+         normals[p*generator.gdim] = 1.0;
+       const coefficients custom_w(form, rng, num_integral_cells);
+       vector<double> custom_A(tensor_size(form, num_integral_cells));
+       timings.push_back(time_integral
+         ("custom", subdomain_id, options, custom_A, [&](std::size_t c)
+          { integral.tabulate_tensor(custom_A.data(), custom_w.w(), custom_dofs.data() + c*m,
+                                     num_points, points.data(), weights.data(),
+                                     normals.data(), orientation); }));
+     });
+
+  return timings;
+}
+//-----------------------------------------------------------------------------
+std::vector<integral_timing> benchmark(const ufc::form & form)
+{
+  return benchmark(form, benchmark_options());
+}
+//-----------------------------------------------------------------------------
+std::string timings_to_json(const std::vector<integral_timing> & timings)
+{
+  std::ostringstream s;
+  s.precision(12);
+  s << "[";
+  for (std::size_t i = 0; i < timings.size(); i++)
   {
-    throw std::runtime_error("rank != 0,1,2 not implemented");
+    const integral_timing& t = timings[i];
+    s << (i == 0 ? "" : ",") << "\n {"
+      << "\"integral_type\": \"" << t.integral_type << "\", "
+      << "\"subdomain_id\": " << t.subdomain_id << ", "
+      << "\"num_cells\": " << t.num_cells << ", "
+      << "\"repetitions\": " << t.repetitions << ", "
+      << "\"min\": " << t.min << ", "
+      << "\"median\": " << t.median << ", "
+      << "\"mean\": " << t.mean << ", "
+      << "\"p10\": " << t.p10 << ", "
+      << "\"p90\": " << t.p90 << ", "
+      << "\"max\": " << t.max << ", "
+      << "\"checksum\": " << t.checksum << "}";
   }
-
-  return A;
+  s << "\n]";
+  return s.str();
 }
+//-----------------------------------------------------------------------------
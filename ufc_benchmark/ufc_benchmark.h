@@ -8,38 +8,53 @@
 
 #include "ufc.h"
 #include <memory>
+#include <string>
 #include <vector>
 
-/* Benchmark time to run tabulate_tensor for all integrals in a form. *
- * Uses a reference cell and one-cell mesh, and sets all w_ij = 1.0.  */
-std::vector< std::vector<double> > benchmark(const ufc::form & form,
-                                             bool print_tensors);
-
-/* Compute one element tensor on the reference cell with the given coefficients. */
-std::vector< std::vector<double> > tabulate_cell_tensor(const ufc::form & form,
-                                                        std::vector< std::vector<double> > w,
-                                                        int domain);
-
-/* Compute one cell integral. */
-std::vector< std::vector<double> > tabulate_cell_integral(const std::shared_ptr<ufc::form> form,
-                                                          std::vector< std::vector<double> > w,
-                                                          ufc::cell cell,
-                                                          int domain);
-
-/* Compute one exterior facet integral. */
-std::vector< std::vector<double> > tabulate_exterior_facet_integral(const std::shared_ptr<ufc::form> form,
-                                                                    std::vector< std::vector<double> > w,
-                                                                    ufc::cell& cell,
-                                                                    int facet,
-                                                                    int domain);
-
-/* Compute one interior facet integral. */
-std::vector< std::vector<double> > tabulate_interior_facet_integral(const std::shared_ptr<ufc::form> form,
-                                                                    std::vector< std::vector<double> > macro_w,
-                                                                    ufc::cell& cell0,
-                                                                    ufc::cell& cell1,
-                                                                    int facet_0,
-                                                                    int facet_1,
-                                                                    int domain);
+/* Timings of tabulate_tensor for one integral of a form. All times *
+ * are in nanoseconds per cell (or facet, vertex, custom domain),   *
+ * computed over the repetitions.                                   */
+struct integral_timing
+{
+  std::string integral_type;   // cell, exterior_facet, interior_facet, vertex or custom
+  int subdomain_id;            // -1 for the default integral
+  std::size_t num_cells;       // number of cells per repetition
+  std::size_t repetitions;     // number of timed repetitions
+  double min;
+  double median;
+  double mean;
+  double p10;                  // 10th percentile
+  double p90;                  // 90th percentile
+  double max;
+  double checksum;             // sum of all tensor entries (to check results)
+};
+
+/* Options for benchmark. */
+struct benchmark_options
+{
+  benchmark_options():
+    repetitions(20), warmup(2), num_cells(1000), affine(true), seed(0),
+    num_quadrature_points(10) {}
+
+  std::size_t repetitions;           // number of timed repetitions
+  std::size_t warmup;                // number of untimed repetitions before timing
+  std::size_t num_cells;             // number of random cells in each repetition
+  bool affine;                       // use affinely mapped cells only
+  unsigned int seed;                 // seed for random cells and coefficients
+  std::size_t num_quadrature_points; // number of points for custom integrals
+};
+
+/* Benchmark time to run tabulate_tensor for all integrals of all    *
+ * types in a form, on randomly perturbed cells and with random      *
+ * coefficients. With affine = false, the nodes of higher order      *
+ * coordinate elements are perturbed independently.                  */
+std::vector<integral_timing> benchmark(const ufc::form & form,
+                                       const benchmark_options & options);
+
+/* Benchmark with default options. */
+std::vector<integral_timing> benchmark(const ufc::form & form);
+
+/* Format timings as JSON. */
+std::string timings_to_json(const std::vector<integral_timing> & timings);
 
 #endif
@@ -3,10 +3,12 @@
 // ------------------------ STL stuff
 
 %{
+#include <string>
 #include <vector>
 %}
 
 %include stl.i
+%include std_string.i
 %include std_vector.i
 %include std_carray.i
 
@@ -29,12 +31,12 @@
 %{
 #include "ufc.h"
 #include "ufc_benchmark.h"
-#include "ufc_reference_cell.h"
 %}
 
 %include "ufc.h"
 %include "ufc_benchmark.h"
-%include "ufc_reference_cell.h"
+
+%template(vector_integral_timing) std::vector<integral_timing>;
 
 // ----------------------- Reference to shared pointer utility
 
@@ -49,14 +51,44 @@ std::shared_ptr<ufc::form> form_ptr(ufc::form * form) { return std::shared_ptr<u
 
 %pythoncode{
 
-def benchmark_forms(forms, print_tensors):
-    import gc
-    gc.collect()
+def benchmark_forms(forms, num_operations=None, output=None, **options):
+    """Benchmark tabulate_tensor for all integrals of the given forms.
 
-    times = []
-    for f in forms:
-        res = benchmark(f, print_tensors)
-        times.append(tuple(res))
-    return times
+    Options (repetitions, warmup, num_cells, affine, seed and
+    num_quadrature_points) are passed on to benchmark_options. If
+    num_operations is given, it should be a list of dictionaries (one
+    for each form) mapping (integral_type, subdomain_id) to the number
+    of floating point operations of tabulate_tensor, which is used to
+    estimate the FLOP rate. If output is given, the results are written
+    to this file in JSON format.
+
+    Returns a list (one for each form) of lists of dictionaries with
+    the timings (in ns per cell) of each integral."""
+    import gc
+    import json
+
+    opts = benchmark_options()
+    for key, value in options.items():
+        if not hasattr(opts, key):
+            raise TypeError("Unknown benchmark option: %s" % key)
+        setattr(opts, key, value)
+
+    results = []
+    for (i, form) in enumerate(forms):
+        gc.collect()
+        timings = json.loads(timings_to_json(benchmark(form, opts)))
+        ops = num_operations[i] if num_operations else {}
+        for t in timings:
+            n = ops.get((t["integral_type"], t["subdomain_id"]))
+            if n is not None and t["median"] > 0.0:
+                t["num_operations"] = n
+                t["gflops"] = n / t["median"]
+        results.append(timings)
+
+    if output is not None:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=1)
+
+    return results
 
 }